@@ -0,0 +1,212 @@
+"""Headless frame-time benchmark for the Game loop.
+
+Runs each game state for a fixed number of uncapped frames on SDL's dummy
+video/audio drivers, driven by a scripted input trace, and prints p50/p95/p99
+frame times plus surface allocations per frame as JSON:
+
+    python benchmark.py --frames 300 --size 1920x1080 --out bench.json
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Ctrl-Alt-Defeat frame benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="measured frames per state")
+    parser.add_argument("--warmup", type=int, default=30, help="unmeasured frames per state")
+    parser.add_argument("--size", default="1920x1080", help="screen size as WIDTHxHEIGHT")
+    parser.add_argument("--states", default=None, help="comma-separated subset of states to run")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dirty-rects", action="store_true", help="enable the dirty-rect compositor")
+    parser.add_argument("--out", default=None, help="write JSON here instead of stdout")
+    return parser.parse_args(argv)
+
+
+# Must be set before pygame (and src.constants) is imported
+ARGS = parse_args()
+os.environ["SDL_VIDEODRIVER"] = "dummy"
+os.environ["SDL_AUDIODRIVER"] = "dummy"
+os.environ["CAD_SCREEN_SIZE"] = ARGS.size
+os.environ["CAD_VSYNC"] = "0"
+if ARGS.dirty_rects:
+    os.environ["CAD_DIRTY_RECTS"] = "1"
+
+import pygame
+
+from main import Game
+from src.alloc_counter import SurfaceAllocCounter
+from src.constants import *
+
+
+class ScriptedKeys:
+    """Stands in for pygame.key.get_pressed() with a fixed set of held keys."""
+
+    def __init__(self, pressed=()):
+        self.pressed = set(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+
+NO_KEYS = ScriptedKeys()
+
+
+def click(pos):
+    return pygame.event.Event(pygame.MOUSEBUTTONDOWN, button=1, pos=pos)
+
+
+def sweep(frame):
+    # Mouse drifts across the middle of the screen so hover states get exercised
+    return (frame * 37) % SCREEN_WIDTH, SCREEN_HEIGHT // 2
+
+
+def setup_menu(game):
+    game.state = MENU
+
+
+def setup_select(game):
+    game.state = SELECT
+
+
+def setup_hallway(game):
+    game.player = game.roster[0]
+    game.player_world_x = int(SCREEN_WIDTH * 0.2)
+    game.state = HALLWAY
+
+
+def setup_door_view(game):
+    game.player = game.roster[0]
+    game.selected_door = game.door_locations[0]
+    game.state = DOOR_VIEW
+
+
+def setup_battle(game):
+    setup_door_view(game)
+    game.combat.transition_to_battle(game)
+    game.state = BATTLE
+    game.fading = False
+    game.battle_start_time = -10_000
+
+
+def setup_win(game):
+    setup_battle(game)
+    game.state = WIN
+
+
+def setup_loss(game):
+    setup_battle(game)
+    game.state = LOSS
+
+
+def setup_total_win(game):
+    game.state = TOTAL_WIN
+
+
+def script_idle(game, frame):
+    return [], sweep(frame), NO_KEYS
+
+
+def script_hallway(game, frame):
+    key = pygame.K_d if frame % 120 < 60 else pygame.K_a
+    return [], sweep(frame), ScriptedKeys([key])
+
+
+def script_battle(game, frame):
+    # Keep the fight going forever so every frame measures the same screen
+    game.player.hp = max(game.player.hp, game.player.max_hp // 2)
+    game.boss.hp = max(game.boss.hp, game.boss.max_hp // 2)
+    game.victory_stage = 0
+
+    events = []
+    pos = sweep(frame)
+    if frame % 40 == 0 and not game.boss_entering:
+        if game.show_question and game.answer_btns:
+            pos = game.answer_btns[0].rect.center
+        elif game.btn_atk:
+            pos = game.btn_atk.rect.center
+        events.append(click(pos))
+    return events, pos, NO_KEYS
+
+
+SCENARIOS = {
+    MENU: (setup_menu, script_idle),
+    SELECT: (setup_select, script_idle),
+    HALLWAY: (setup_hallway, script_hallway),
+    DOOR_VIEW: (setup_door_view, script_idle),
+    BATTLE: (setup_battle, script_battle),
+    WIN: (setup_win, script_idle),
+    LOSS: (setup_loss, script_idle),
+    TOTAL_WIN: (setup_total_win, script_idle),
+}
+
+
+def percentiles(samples):
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": cuts[49], "p95_ms": cuts[94], "p99_ms": cuts[98]}
+
+
+def run_state(game, counter, name, frames, warmup, seed):
+    setup, script = SCENARIOS[name]
+    random.seed(seed)
+    game._reset_game()
+    game.fading = False
+    setup(game)
+
+    times = []
+    allocs = []
+    for frame in range(warmup + frames):
+        events, pos, keys = script(game, frame)
+        counter.reset()
+        start = time.perf_counter()
+        game.step(events, pos, keys)
+        game.compositor.present()
+        elapsed = (time.perf_counter() - start) * 1000
+        if frame >= warmup:
+            times.append(elapsed)
+            allocs.append(counter.reset())
+
+    result = percentiles(times)
+    result["mean_ms"] = statistics.fmean(times)
+    result["max_ms"] = max(times)
+    result["surface_allocs_per_frame"] = statistics.fmean(allocs)
+    result["surface_allocs_total"] = sum(allocs)
+    return result
+
+
+def main():
+    game = Game()
+    game.finish_loading()
+    counter = SurfaceAllocCounter()
+    counter.install()
+
+    names = ARGS.states.split(",") if ARGS.states else list(SCENARIOS)
+    report = {
+        "resolution": [SCREEN_WIDTH, SCREEN_HEIGHT],
+        "frames": ARGS.frames,
+        "warmup": ARGS.warmup,
+        "seed": ARGS.seed,
+        "dirty_rects": ARGS.dirty_rects,
+        "states": {},
+    }
+    try:
+        for name in names:
+            report["states"][name] = run_state(game, counter, name, ARGS.frames, ARGS.warmup, ARGS.seed)
+    finally:
+        counter.uninstall()
+        pygame.quit()
+
+    output = json.dumps(report, indent=2)
+    if ARGS.out:
+        with open(ARGS.out, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
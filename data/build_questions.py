@@ -0,0 +1,160 @@
+"""Compiles questions.json into the binary question bank the game loads.
+
+    python data/build_questions.py                      # questions.json -> questions.qbank
+    python data/build_questions.py --legacy questions.dat
+    python data/build_questions.py --decompile out.json # qbank -> editable JSON
+
+Layout (little-endian), read by src/dataGen.QuestionBank:
+
+    header   magic "CADQ", u16 version, u16 boss count, u32 question count,
+             u32 string count, u32 string table offset, u32 string data offset
+    bosses   per boss: i32 boss id, u32 record offset, u32 record count
+    records  per question: u32 id, u32 text string, u8 correct, u8 choice count,
+             2 pad bytes, then one u32 string index per choice
+    strings  per string: u32 offset into string data, u32 byte length
+    data     UTF-8 bytes of every distinct string, stored once
+"""
+import argparse
+import base64
+import json
+import os
+import sys
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from src.dataGen import (BANK_MAGIC, BANK_VERSION, HEADER, BOSS_ENTRY, RECORD, CHOICE,
+                         STRING_ENTRY, QuestionBank)
+
+# Ranges of the packed fields: RECORD's u32 id and BOSS_ENTRY's i32 boss id
+MAX_ID = 2**32 - 1
+BOSS_ID_RANGE = (-2**31, 2**31 - 1)
+
+
+def load_source(path, legacy=False):
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read()
+    if legacy:
+        raw = base64.b64decode(raw).decode("utf-8")
+    return json.loads(raw)["questions"]
+
+
+def validate(questions):
+    errors = []
+    seen_ids = set()
+    for n, q in enumerate(questions):
+        where = f"question #{n} (id {q.get('id')!r})"
+        qid = q.get("id")
+        if not isinstance(qid, int) or not 0 <= qid <= MAX_ID:
+            errors.append(f"{where}: id must be an integer from 0 to {MAX_ID}")
+        elif qid in seen_ids:
+            errors.append(f"{where}: duplicate id")
+        seen_ids.add(qid)
+
+        boss_id = q.get("bossId")
+        if not isinstance(boss_id, int) or not BOSS_ID_RANGE[0] <= boss_id <= BOSS_ID_RANGE[1]:
+            errors.append(f"{where}: bossId must be an integer from {BOSS_ID_RANGE[0]} to {BOSS_ID_RANGE[1]}")
+        if not isinstance(q.get("text"), str) or not q["text"].strip():
+            errors.append(f"{where}: text must be a non-empty string")
+
+        choices = q.get("choices")
+        if not isinstance(choices, list) or not 1 <= len(choices) <= 255:
+            errors.append(f"{where}: choices must be a list of 1-255 strings")
+            continue
+        if not all(isinstance(c, str) for c in choices):
+            errors.append(f"{where}: every choice must be a string")
+        elif len(set(choices)) != len(choices):
+            # Answers are matched by button text, so duplicates would be ambiguous
+            errors.append(f"{where}: duplicate choices")
+
+        correct = q.get("correct")
+        if not isinstance(correct, int) or not 0 <= correct < len(choices):
+            errors.append(f"{where}: correct index {correct!r} out of range for {len(choices)} choices")
+    return errors
+
+
+def compile_bank(questions):
+    strings = {}
+
+    def intern(s):
+        if s not in strings:
+            strings[s] = len(strings)
+        return strings[s]
+
+    by_boss = {}
+    for q in questions:
+        by_boss.setdefault(q["bossId"], []).append(q)
+
+    boss_ids = sorted(by_boss)
+    records_offset = HEADER.size + BOSS_ENTRY.size * len(boss_ids)
+
+    boss_table = bytearray()
+    records = bytearray()
+    for boss_id in boss_ids:
+        pool = by_boss[boss_id]
+        boss_table += BOSS_ENTRY.pack(boss_id, records_offset + len(records), len(pool))
+        for q in pool:
+            records += RECORD.pack(q["id"], intern(q["text"]), q["correct"], len(q["choices"]))
+            for choice in q["choices"]:
+                records += CHOICE.pack(intern(choice))
+
+    string_table = bytearray()
+    string_data = bytearray()
+    for s in strings:  # dicts keep insertion order, which is the index order
+        encoded = s.encode("utf-8")
+        string_table += STRING_ENTRY.pack(len(string_data), len(encoded))
+        string_data += encoded
+
+    table_offset = records_offset + len(records)
+    data_offset = table_offset + len(string_table)
+    header = HEADER.pack(BANK_MAGIC, BANK_VERSION, len(boss_ids), len(questions),
+                         len(strings), table_offset, data_offset)
+    return bytes(header + boss_table + records + string_table + string_data)
+
+
+def decompile(bank_path, out_path):
+    bank = QuestionBank(bank_path)
+    questions = []
+    for boss_id in bank.boss_ids():
+        questions.extend(bank.load_boss(boss_id))
+    bank.close()
+    questions.sort(key=lambda q: q["id"])
+    with open(out_path, "w", encoding="utf-8") as f:
+        json.dump({"questions": questions}, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {len(questions)} questions to {out_path}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the compiled question bank")
+    parser.add_argument("source", nargs="?", default=os.path.join(HERE, "questions.json"))
+    parser.add_argument("-o", "--output", default=os.path.join(HERE, "questions.qbank"))
+    parser.add_argument("--legacy", metavar="DAT", help="read a base64 questions.dat instead of JSON")
+    parser.add_argument("--decompile", metavar="JSON", help="dump the compiled bank back to JSON")
+    args = parser.parse_args(argv)
+
+    if args.decompile:
+        decompile(args.output, args.decompile)
+        return 0
+
+    source = args.legacy or args.source
+    if not os.path.exists(source):
+        parser.error(f"{source} not found; run with --decompile {os.path.join(HERE, 'questions.json')} "
+                     f"to regenerate it from {args.output}")
+    questions = load_source(source, legacy=bool(args.legacy))
+    errors = validate(questions)
+    if errors:
+        for e in errors:
+            print(f"error: {e}", file=sys.stderr)
+        print(f"{len(errors)} error(s); {args.output} not written", file=sys.stderr)
+        return 1
+
+    bank = compile_bank(questions)
+    with open(args.output, "wb") as f:
+        f.write(bank)
+    print(f"Compiled {len(questions)} questions into {args.output} ({len(bank)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,6 @@
 import os
+import time
+import warnings
 import pygame
 
 from src.constants import *
@@ -8,29 +10,66 @@ from src.soundGen import SoundManager
 from src.asset_loader import AssetLoader
 from src.renderer import Renderer
 from src.combat import CombatHandler
-from src.data_setup import create_roster, create_profs
+from src.data_setup import create_roster, create_profs, sprite_stages
 from src.hallway import HallwayManager
+from src.compositor import DirtyRectCompositor
+from src.async_loader import AsyncLoader
+from src.clip_cache import CLIPS
+from src.atlas import AtlasSet
+from src.sim_clock import CLOCK
+from src.profiler import PROFILER, profiled
+from src.spatial import IntervalIndex
 
 BASE_DIR  = os.path.dirname(os.path.abspath(__file__))
 AUDIO_DIR = os.path.join(BASE_DIR, "assets", "audio")
 SPRITE_DIR = os.path.join(BASE_DIR, "assets", "characters")
+ATLAS_DIR = os.path.join(BASE_DIR, "assets", "atlases")
 SFX_DIR   = os.path.join(BASE_DIR, "assets", "audio", "sfx")
 pygame.init()
 pygame.mixer.init()
 
+# Main-thread time per frame spent finishing loaded assets (see AsyncLoader.pump)
+LOADING_BUDGET_MS = 50
+BACKGROUND_BUDGET_MS = 4
+
+# A frame that has to run this many simulation steps skips drawing to catch up,
+# at most MAX_FRAME_SKIP frames in a row
+FRAME_SKIP_STEPS = 3
+MAX_FRAME_SKIP = 2
+
+# Per-step values the renderer blends between the last two simulation steps
+INTERPOLATED = ("camera_x", "player_screen_x", "boss_x", "combat_text_y_offset", "fade_alpha")
+
 class Game:
     def __init__(self):
         os.environ["SDL_VIDEO_CENTERED"] = "1"
 
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        global SCREEN_WIDTH, SCREEN_HEIGHT
+        if FORCED_SCREEN_SIZE:
+            self.screen, vsynced = self._open_display((SCREEN_WIDTH, SCREEN_HEIGHT), 0)
+        else:
+            self.screen, vsynced = self._open_display((0, 0), pygame.FULLSCREEN)
         self.clock = pygame.time.Clock()
+        self.sim_clock = CLOCK
+        self.frame_skipped = False
+        self.frames_skipped = 0
+        # Without vsync an uncapped loop would spin; cap it at the display's rate instead
+        self.fps_cap = FPS or (0 if vsynced or not VSYNC else self._refresh_rate())
+        self.compositor = DirtyRectCompositor(self.screen, enabled=DIRTY_RECTS)
 
-        global SCREEN_WIDTH, SCREEN_HEIGHT
         SCREEN_WIDTH = self.screen.get_width()
         SCREEN_HEIGHT = self.screen.get_height()
 
-        self.sound = SoundManager()
-        self.assets = AssetLoader(self.screen, BASE_DIR)
+        if PROFILE_TRACE:
+            PROFILER.start()
+
+        # Files decode on the loader's pool; AssetLoader queues the menu's stage first
+        self.loader = AsyncLoader()
+        CLIPS.loader = self.loader
+        self.sound = SoundManager(executor=self.loader.pool)
+        self.assets = AssetLoader(self.screen, BASE_DIR, self.loader)
+        CLIPS.pixels = self.assets.pixels
+        CLIPS.atlases = AtlasSet(ATLAS_DIR, SPRITE_DIR)
         self.renderer = Renderer()
         self.combat = CombatHandler()
         self.hallway = HallwayManager()
@@ -38,8 +77,12 @@ class Game:
         self.audio_dir = AUDIO_DIR
         self.sfx_dir = SFX_DIR
 
-        self.state = MENU
+        self.state = LOADING
+        self.after_loading = MENU
+        self.mouse_pos = (0, 0)
+        self.keys = pygame.key.get_pressed()
         self.last_music_state = None
+        self.current_boss_music_id = None
         self.show_how_to_play = False
         self.selected_idx = None
         self.current_level = 0
@@ -62,14 +105,7 @@ class Game:
         self.victory_timer = 0
         self.victory_stage = 0
         self.is_player_victory = True
-
-        self.btn_start = None
-        self.btn_help = None
-        self.btn_quit = None
-        self.btn_confirm = None
-        self.btn_back = None
-        self.btn_atk = None
-        self.btn_heal = None
+        self.battle_start_time = 0
 
         self.fading = False
         self.fade_alpha = 0
@@ -78,6 +114,7 @@ class Game:
         self.next_state = None
         self.fade_surface = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.fade_surface.fill(BLACK)
+        self._previous = {}
 
         self.floor_h = int(SCREEN_HEIGHT * 0.20)
         self.floor_y = SCREEN_HEIGHT - self.floor_h
@@ -91,23 +128,132 @@ class Game:
         self.hallway_width = SCREEN_WIDTH * 4
         self.camera_x = 0
         self.selected_door = None
-        self.doors_previously_near = set()
+        self.doors_near = set()  # unlocked doors the player is standing at
 
         door_positions = [0.1, 0.2, 0.3]
         self.door_locations = [
             {"x": int(self.hallway_width * p), "level": i, "rect": None}
             for i, p in enumerate(door_positions)
         ]
+        # Shared by movement, clicks and drawing, so none of them scans every door
+        self.doors = IntervalIndex(self.door_locations, width=lambda door: self.door_w)
 
         self.boss_entering = False
         self.boss_x = SCREEN_WIDTH + int(SCREEN_WIDTH * 0.1)
         self.boss_target_x = SCREEN_WIDTH - int(SCREEN_WIDTH * 0.30)
         self.boss_walk_speed = int(SCREEN_WIDTH * 0.003)
 
-        self.roster = create_roster(SPRITE_DIR)
-        self.profs = create_profs(SPRITE_DIR)
+        self.roster = []
+        self.profs = []
+        for name, build, paths in sprite_stages(SPRITE_DIR):
+            self.loader.add_stage(name, build, paths)
+        self.loader.add_stage("characters", self._create_characters)
         self.q_manager = QuestionManager()
 
+        # Retained widgets for every screen; sets self.ui and the btn_* attributes
+        self.renderer.build_ui(self)
+
+
+    def _create_characters(self):
+        # Every clip is already in CLIPS by now, so this only builds the entities
+        self.roster = create_roster(SPRITE_DIR)
+        self.profs = create_profs(SPRITE_DIR)
+        self.assets.pixels.flush()
+
+    def finish_loading(self):
+        """Blocks until every asset is loaded and leaves the loading screen."""
+        self.loader.wait()
+        if self.state == LOADING:
+            self.state = self.after_loading
+
+    def _update_loading(self):
+        if not self.loader.done:
+            budget = LOADING_BUDGET_MS if self.state == LOADING else BACKGROUND_BUDGET_MS
+            self.loader.pump(budget)
+        if self.state == LOADING:
+            # The menu can show as soon as its own stage is in; everything else waits for all of it
+            ready = "menu" in self.loader.ready if self.after_loading == MENU else self.loader.done
+            if ready:
+                self.state = self.after_loading
+
+    @staticmethod
+    def _open_display(size, flags):
+        if VSYNC:
+            # SCALED can't size itself from (0, 0) the way a plain fullscreen window does
+            vsync_size = size if size != (0, 0) else pygame.display.get_desktop_sizes()[0]
+            try:
+                # SDL only honours vsync for renderer-backed windows; pygame warns
+                # rather than fails when it has to fall back to a software one
+                with warnings.catch_warnings():
+                    warnings.simplefilter("error")
+                    return pygame.display.set_mode(vsync_size, flags | pygame.SCALED, vsync=1), True
+            except (pygame.error, Warning) as e:
+                print(f"[WARN] Opening the display without vsync: {e}")
+        return pygame.display.set_mode(size, flags), False
+
+    @staticmethod
+    def _refresh_rate():
+        # pygame-ce reports the display's rate; pygame 2 has no call for it, so assume 60 Hz
+        get_rate = getattr(pygame.display, "get_current_refresh_rate", None)
+        rate = get_rate() if get_rate else 0
+        return rate if rate > 0 else 60
+
+    def lerp(self, name):
+        """An INTERPOLATED attribute as of this frame, between the last two simulation steps."""
+        current = getattr(self, name)
+        previous = self._previous.get(name, current)
+        return previous + (current - previous) * self.sim_clock.alpha
+
+    def snap(self, *names):
+        """Stops interpolating the named attributes until the next step; call after they jump rather than move."""
+        for name in names:
+            self._previous[name] = getattr(self, name)
+
+    @profiled()
+    def update(self):
+        """Advances the simulation by one fixed step (1 / SIM_HZ seconds).
+
+        Every per-frame change to game state happens here or in the event
+        handlers; the renderer's draw_* methods only read it, so frames can be
+        skipped and the game can be stepped headless (see fast_forward).
+        """
+        self.sim_clock.tick()
+        self._previous = {name: getattr(self, name) for name in INTERPOLATED}
+
+        self.sound.update()
+        if self.state == MENU:
+            self._update_menu()
+        elif self.state == DOOR_VIEW:
+            # Decode the boss theme while the player reads the door
+            self.sound.prefetch_music(f"boss{self.selected_door['level'] + 1}_music")
+        elif self.state == SELECT:
+            self.last_music_state = SELECT
+        elif self.state == HALLWAY:
+            self.hallway.update(self)
+        elif self.state == BATTLE:
+            self.combat.update(self)
+        elif self.state == LOSS:
+            # Reset HP so re-entering the hallway starts fresh
+            self.player.hp = self.player.max_hp
+            self.boss.hp = self.boss.max_hp
+        if self.state != LOADING:
+            self.renderer.update_ui(self)
+        self._update_fade()
+
+    def save_trace(self, path=None):
+        path = path or os.path.join(BASE_DIR, time.strftime("trace-%Y%m%d-%H%M%S.json"))
+        count = PROFILER.export(path)
+        print(f"Wrote {count} trace events to {path} (open in chrome://tracing or ui.perfetto.dev)")
+
+    def fast_forward(self, ms: float) -> None:
+        """Runs ms of game time as fast as possible, without drawing."""
+        for _ in range(int(ms // self.sim_clock.step_ms)):
+            self.update()
+
+    def _update_menu(self):
+        if self.last_music_state != MENU:
+            self.sound.play_music("title_music")
+            self.last_music_state = MENU
 
     def start_fade(self, next_state: str):
         self.fading = True
@@ -115,7 +261,7 @@ class Game:
         self.fade_alpha = 0
         self.next_state = next_state
 
-    def _handle_fade(self):
+    def _update_fade(self):
         if not self.fading:
             return
 
@@ -131,7 +277,11 @@ class Game:
             self.fade_alpha = 0
             self.fading = False
 
-        self.fade_surface.set_alpha(self.fade_alpha)
+    def _draw_fade(self):
+        alpha = self.lerp("fade_alpha")
+        if not self.fading and alpha <= 0:
+            return
+        self.fade_surface.set_alpha(int(alpha))
         self.screen.blit(self.fade_surface, (0, 0))
 
     def _reset_game(self):
@@ -139,7 +289,9 @@ class Game:
         self.show_exit_prompt = False
         self.selected_idx = None
         self.player_world_x = int(SCREEN_WIDTH * 0.2)
+        self.player_screen_x = self.player_world_x
         self.camera_x = 0
+        self.snap("camera_x", "player_screen_x")
         self.player = None
         self.boss = None
         self.show_question = False
@@ -151,15 +303,20 @@ class Game:
         self.battle_buttons_locked = False
         self.boss_entering = False
         self.selected_door = None
-        self.doors_previously_near = set()
+        self.doors_near = set()
 
     def _on_menu_click(self, m_pos):
         self._reset_game()
-        if self.btn_start and self.btn_start.is_clicked(m_pos):
-            self.state = SELECT
-        if self.btn_help and self.btn_help.is_clicked(m_pos):
+        hit = self.ui[MENU].hit_test(m_pos)
+        if hit is self.btn_start:
+            if self.loader.done:
+                self.state = SELECT
+            else:
+                self.state = LOADING
+                self.after_loading = SELECT
+        elif hit is self.btn_help:
             self.show_how_to_play = True
-        if self.btn_quit and self.btn_quit.is_clicked(m_pos):
+        elif hit is self.btn_quit:
             return False # signal quit
         return True
 
@@ -170,25 +327,27 @@ class Game:
 
     def _on_hallway_click(self, m_pos):
         if self.show_exit_prompt:
-            if self.btn_exit_yes.is_clicked(m_pos):
+            hit = self.ui[EXIT_PROMPT].hit_test(m_pos)
+            if hit is self.btn_exit_yes:
                 self.show_exit_prompt = False
                 self.start_fade(MENU)
-            elif self.btn_exit_no.is_clicked(m_pos):
+            elif hit is self.btn_exit_no:
                 self.show_exit_prompt = False
                 self.player_world_x = 150
+                self.hallway.track_camera(self)
+                self.snap("camera_x", "player_screen_x")
         else:
-            for door in self.door_locations:
-                dist = abs(self.player_world_x - door["x"])
-                is_near = dist < self.door_interact_dist
+            for door in self.doors.within(self.player_world_x, self.door_interact_dist):
                 is_unlocked = door["level"] <= self.current_level
-                if door["rect"] and door["rect"].collidepoint(m_pos) and is_unlocked and is_near:
+                if door["rect"] and door["rect"].collidepoint(m_pos) and is_unlocked:
                     self.selected_door = door
                     self.state = DOOR_VIEW
 
     def _on_door_view_click(self, m_pos):
-        if self.btn_confirm.is_clicked(m_pos):
+        hit = self.ui[DOOR_VIEW].hit_test(m_pos)
+        if hit is self.btn_confirm:
             self.combat.transition_to_battle(self)
-        elif self.btn_back.is_clicked(m_pos):
+        elif hit is self.btn_back:
             self.state = HALLWAY
 
     def _on_win_loss_click(self):
@@ -211,89 +370,136 @@ class Game:
         self.start_fade(HALLWAY)
 
     def _on_total_win_click(self, m_pos):
-        if hasattr(self, "btn_exit_win") and self.btn_exit_win.is_clicked(m_pos):
+        if self.ui[TOTAL_WIN].hit_test(m_pos) is self.btn_exit_win:
             self._reset_game()
             self.start_fade(MENU)
 
     def run(self):
         running = True
+        last = time.perf_counter()
         while running:
-            self.screen.fill(BLACK)
-            m_pos = pygame.mouse.get_pos()
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000, now
+            events = pygame.event.get()
+            running = self.step(events, pygame.mouse.get_pos(), pygame.key.get_pressed(), elapsed_ms)
+            if not self.frame_skipped:
+                with PROFILER.scope("present"):
+                    self.compositor.present()
+            with PROFILER.scope("Clock.tick"):
+                self.clock.tick(self.fps_cap)
+            PROFILER.end_frame()
+
+        if PROFILE_TRACE:
+            self.save_trace(PROFILE_TRACE)
+        pygame.quit()
+
+    def step(self, events, m_pos, keys, elapsed_ms=None) -> bool:
+        """Runs one frame against the given input; returns False once the game should quit.
 
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
+        elapsed_ms is the wall time since the previous frame and decides how many
+        simulation steps run; None runs exactly one, which keeps headless callers
+        deterministic.
+        """
+        running = True
+        self.mouse_pos = m_pos
+        self.keys = keys
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                running = False
+
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE:
                     running = False
 
-                if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle_overlay()
+                if event.key == pygame.K_F4 and PROFILER.active:
+                    self.save_trace()
+
+                #press p to instantly defeat (debug)
+                if event.key == pygame.K_p and self.state == BATTLE:
+                    self.boss.hp = 0
+                    self.boss.play_animation("hurt", "up", 5, freeze_last=True)
+                    self.player.play_animation("spellcast", "right", 6, freeze_last=True)
+                    self.victory_timer = CLOCK.now()
+                    self.victory_stage = 1
+                    self.is_player_victory = True
+                    self.sound.clear_music()
+                    self.sound.play_voice("win", volume=0.3)
+
+                if event.key == pygame.K_SPACE and self.state == DOOR_VIEW:
+                    self.combat.transition_to_battle(self)
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.show_how_to_play:
+                    self.show_how_to_play = False
+                elif self.state == MENU:
+                    if not self._on_menu_click(m_pos):
                         running = False
-                    
-                    #press p to instantly defeat (debug)
-                    if event.key == pygame.K_p and self.state == BATTLE:
-                        self.boss.hp = 0
-                        self.boss.play_animation("hurt", "up", 5, freeze_last=True)
-                        self.player.play_animation("spellcast", "right", 6, freeze_last=True)
-                        self.victory_timer = pygame.time.get_ticks()
-                        self.victory_stage = 1
-                        self.is_player_victory = True
-                        self.sound.clear_music()
-                        self.sound.play_voice(
-                            os.path.join(SFX_DIR, "win-sound.wav"), volume=0.3
-                        )
-
-                    if event.key == pygame.K_SPACE and self.state == DOOR_VIEW:
-                        self.combat.transition_to_battle(self)
-
-                if event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.show_how_to_play:
-                        self.show_how_to_play = False
-                    elif self.state == MENU:
-                        if not self._on_menu_click(m_pos):
-                            running = False
-                    elif self.state == SELECT:
-                        self._on_select_click()
-                    elif self.state == HALLWAY:
-                        self._on_hallway_click(m_pos)
-                    elif self.state == DOOR_VIEW:
-                        self._on_door_view_click(m_pos)
-                    elif self.state == BATTLE:
-                        self.combat.handle_battle_click(self, m_pos)
-                    elif self.state in (WIN, LOSS):
-                        self._on_win_loss_click()
-                    elif self.state == TOTAL_WIN:
-                        self._on_total_win_click(m_pos)
-
-            if self.state == MENU:
-                self.renderer.draw_menu(self)
-            elif self.state == SELECT:
-                self.renderer.draw_character_select(self)
-            elif self.state == HALLWAY:
-                self.hallway.update(self)
-                self.renderer.draw_hallway(self)
-            elif self.state == DOOR_VIEW:
-                self.renderer.draw_door_view(self)
-            elif self.state == BATTLE:
-                self.renderer.draw_battle(self)
-            elif self.state == WIN:
-                self.renderer.draw_win(self)
-            elif self.state == LOSS:
-                self.renderer.draw_loss(self)
-                # Reset HP so re-entering the hallway starts fresh
-                self.player.hp = self.player.max_hp
-                self.boss.hp = self.boss.max_hp
-            elif self.state == TOTAL_WIN:
-                self.renderer.draw_total_win(self)
-
-            self._handle_fade()
-
-            if self.assets.custom_cursor:
-                self.screen.blit(self.assets.custom_cursor, self.assets.custom_cursor.get_rect(topleft=m_pos))
-
-            pygame.display.flip()
-            self.clock.tick(FPS)
-
-        pygame.quit()
+                elif self.state == SELECT:
+                    self._on_select_click()
+                elif self.state == HALLWAY:
+                    self._on_hallway_click(m_pos)
+                elif self.state == DOOR_VIEW:
+                    self._on_door_view_click(m_pos)
+                elif self.state == BATTLE:
+                    self.combat.handle_battle_click(self, m_pos)
+                elif self.state in (WIN, LOSS):
+                    self._on_win_loss_click()
+                elif self.state == TOTAL_WIN:
+                    self._on_total_win_click(m_pos)
+
+        self.assets.backgrounds.follow(self)
+        self._update_loading()
+
+        steps = self.sim_clock.advance(elapsed_ms)
+        for _ in range(steps):
+            self.update()
+
+        # Under load, spend the next frames catching up instead of drawing
+        self.frame_skipped = steps >= FRAME_SKIP_STEPS and self.frames_skipped < MAX_FRAME_SKIP
+        self.frames_skipped = self.frames_skipped + 1 if self.frame_skipped else 0
+        if self.frame_skipped:
+            return running
+
+        # The dirty-rect path does not know about the overlay, so it gets full redraws
+        static = self.compositor.enabled and not PROFILER.overlay
+        scene_key = self.renderer.static_scene_key(self) if static else None
+        if scene_key is not None:
+            self.compositor.draw_static(self, scene_key, self.assets.custom_cursor, m_pos)
+            return running
+
+        self.compositor.invalidate()
+        self.screen.fill(BLACK)
+        if self.state == LOADING:
+            self.renderer.draw_loading(self)
+        elif self.state == MENU:
+            self.renderer.draw_menu(self)
+        elif self.state == SELECT:
+            self.renderer.draw_character_select(self)
+        elif self.state == HALLWAY:
+            self.renderer.draw_hallway(self)
+        elif self.state == DOOR_VIEW:
+            self.renderer.draw_door_view(self)
+        elif self.state == BATTLE:
+            self.renderer.draw_battle(self)
+        elif self.state == WIN:
+            self.renderer.draw_win(self)
+        elif self.state == LOSS:
+            self.renderer.draw_loss(self)
+        elif self.state == TOTAL_WIN:
+            self.renderer.draw_total_win(self)
+
+        self._draw_fade()
+
+        if PROFILER.overlay:
+            PROFILER.draw(self.screen, self.assets.fonts["small"])
+
+        if self.assets.custom_cursor:
+            self.screen.blit(self.assets.custom_cursor, self.assets.custom_cursor.get_rect(topleft=m_pos))
+
+        return running
 
 if __name__ == "__main__":
-    Game().run()
\ No newline at end of file
+    Game().run()
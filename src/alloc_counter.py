@@ -0,0 +1,56 @@
+import pygame
+
+# Module-level entry points that hand back a freshly allocated surface
+_TRANSFORMS = ("scale", "smoothscale", "scale_by", "smoothscale_by", "rotate", "rotozoom", "flip")
+
+
+class SurfaceAllocCounter:
+    """Counts surfaces created through pygame.Surface, pygame.transform and pygame.image.load.
+
+    Works by swapping the module attributes while installed, so it only sees
+    code that looks them up at call time (``pygame.transform.scale(...)``),
+    which is how every module in src/ uses them. Font.render and Surface.copy
+    are C methods and cannot be wrapped; they are not counted.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._originals = []
+
+    def install(self) -> None:
+        if self._originals:
+            return
+        counter = self
+
+        original_surface = pygame.Surface
+
+        class CountingSurface(original_surface):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        self._swap(pygame, "Surface", CountingSurface)
+        self._swap(pygame.image, "load", self._wrap(pygame.image.load))
+        for name in _TRANSFORMS:
+            fn = getattr(pygame.transform, name, None)
+            if fn is not None:
+                self._swap(pygame.transform, name, self._wrap(fn))
+
+    def uninstall(self) -> None:
+        for module, name, original in reversed(self._originals):
+            setattr(module, name, original)
+        self._originals = []
+
+    def reset(self) -> int:
+        count, self.count = self.count, 0
+        return count
+
+    def _swap(self, module, name, replacement) -> None:
+        self._originals.append((module, name, getattr(module, name)))
+        setattr(module, name, replacement)
+
+    def _wrap(self, fn):
+        def counted(*args, **kwargs):
+            self.count += 1
+            return fn(*args, **kwargs)
+        return counted
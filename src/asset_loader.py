@@ -1,49 +1,194 @@
+import functools
+import json
 import pygame
 import os
-from src.constants import BLACK, GOLD, GRAY
+from src.async_loader import AsyncLoader
+from src.background_manager import BackgroundManager
+from src.pixel_cache import PixelCache
+from src.constants import BACKGROUND_BUDGET_MB, BLACK, GOLD, GRAY
+
+
+class FontRegistry:
+    """Hands out one Font per (size, bold) for a single font family.
+
+    Resolving a system font name scans every installed font, so the resolved
+    file paths are remembered in a JSON file and reused on the next launch.
+    """
+
+    def __init__(self, cache_path: str, family: str = "Courier"):
+        self.cache_path = cache_path
+        self.family = family
+        self._fonts = {}
+        self._paths = self._read_cache()
+
+    def get(self, size: int, bold: bool = False) -> pygame.font.Font:
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is None:
+            path = self._resolve(bold)
+            font = pygame.font.Font(path, size)
+            # Same as SysFont: fake bold when the family has no bold face
+            if bold and (path is None or path == self._resolve(False)):
+                font.set_bold(True)
+            self._fonts[key] = font
+        return font
+
+    def _resolve(self, bold: bool) -> str | None:
+        style = "bold" if bold else "regular"
+        if style not in self._paths:
+            self._paths[style] = pygame.font.match_font(self.family, bold=bold)
+            self._write_cache()
+        return self._paths[style]
+
+    def _read_cache(self) -> dict:
+        try:
+            with open(self.cache_path) as f:
+                paths = json.load(f).get(self.family, {})
+        except (OSError, ValueError):
+            return {}
+        # Drop entries for fonts that have since been uninstalled
+        return {style: path for style, path in paths.items() if path is None or os.path.exists(path)}
+
+    def _write_cache(self) -> None:
+        try:
+            with open(self.cache_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        data[self.family] = self._paths
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(self.cache_path, "w") as f:
+                json.dump(data, f, indent=2)
+        except OSError as e:
+            print(f"Error writing font cache: {e}")
+
+
+# Full-screen backgrounds under assets/backgrounds, scaled to the screen and
+# managed by BackgroundManager alongside battle_bg_1..3
+BACKGROUND_NAMES = ["title", "lost_sridhar", "lost_maiti", "lost_dioch",
+                    "class", "win_kris", "win_shri", "win_ken", "end"]
+
+# Title-screen scroll as a fraction of the screen
+SCROLL_SIZE = (0.85, 0.65)
+
+_full_screen = lambda w, h: (w, h)
+
+# Every image AssetLoader reads, relative to assets/: (largest size it is drawn
+# at on a w x h screen, None for a side that follows the aspect ratio; whether
+# its alpha channel is used). tools/build_bundle.py downscales and re-encodes
+# from this table, so keep it in step with the loaders below.
+IMAGES = {
+    **{f"backgrounds/{name}.png": (_full_screen, False) for name in BACKGROUND_NAMES},
+    **{f"backgrounds/battle_bg_{i}.png": (_full_screen, False) for i in (1, 2, 3)},
+    "backgrounds/scroll.png": (lambda w, h: (w * SCROLL_SIZE[0], h * SCROLL_SIZE[1]), True),
+    "backgrounds/hallway.png": (lambda w, h: (None, h), False),
+    "backgrounds/grass.png": (lambda w, h: (w, h * 0.3), True),
+    "backgrounds/navy.png": (lambda w, h: (w, h * 0.3), True),
+    "backgrounds/tile.png": (lambda w, h: (w, h * 0.3), True),
+    "door.png": (lambda w, h: (w * 0.15, h * 0.38), True),
+    "door_cracked.png": (_full_screen, True),
+    "door_upclose.png": (_full_screen, True),
+    "ui/mouse cursor.png": (lambda w, h: (32, 32), True),
+    "ui/notebook_paper.webp": (lambda w, h: (w, h * 0.16), True),  # the battle text box
+}
+IMAGE_MANIFEST_VERSION = 1
+
+
+def read_image_manifest(base_dir: str) -> dict:
+    """assets-relative path -> bundled file, from a build_bundle.py bundle; empty in a source tree."""
+    try:
+        with open(os.path.join(base_dir, "assets", "images.json")) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != IMAGE_MANIFEST_VERSION:
+        print("[WARN] Ignoring outdated image manifest")
+        return {}
+    return manifest["images"]
 
 
 class AssetLoader:
-    def __init__(self, screen: pygame.Surface, base_dir: str):
+    def __init__(self, screen: pygame.Surface, base_dir: str, loader: AsyncLoader | None = None):
         self.screen = screen
         self.base_dir = base_dir
+        self.cache_dir = os.path.join(base_dir, ".cache")
+        self.image_paths = read_image_manifest(base_dir)
 
         w = screen.get_width()
         h = screen.get_height()
 
+        self.font_registry = FontRegistry(os.path.join(self.cache_dir, "fonts.json"))
+        self.pixels = PixelCache(os.path.join(self.cache_dir, "pixels"), screen)
         self.fonts = self._load_fonts(h)
-        self.scroll_bg = self._load_scroll_bg(w, h)
-        self.ui_scroll = self._load_ui_scroll()
+        self.custom_cursor, self.cursor_visible = None, False
+
+        # Without a loader everything is loaded before returning, as before
+        blocking = loader is None
+        self.loader = loader or AsyncLoader()
+        self.backgrounds = BackgroundManager(self._background_sources(w, h), self.loader,
+                                             BACKGROUND_BUDGET_MB * 1024 * 1024)
+
+        asset = self.asset
+        # Sources already in the pixel cache are read back raw instead of decoded
+        self.loader.skip = self.pixels.covers
+        self.loader.add_stage("menu", lambda: self._finish_menu(w, h), [
+            asset("backgrounds/title.png"), asset("backgrounds/scroll.png"), asset("ui/mouse cursor.png"),
+        ])
+        self.loader.add_stage("hallway", lambda: self._finish_hallway(w, h), [
+            asset("ui/notebook_paper.webp"), asset("backgrounds/hallway.png"),
+            asset("door.png"), asset("door_cracked.png"), asset("door_upclose.png"),
+            asset("backgrounds/grass.png"), asset("backgrounds/navy.png"), asset("backgrounds/tile.png"),
+        ])
+        # Other full-screen backgrounds load as the game heads towards them (BackgroundManager.follow)
+        self.loader.add_stage("pixel cache", self.pixels.flush)
+        if blocking:
+            self.loader.wait()
+
+    def asset(self, rel: str) -> str:
+        """Path of an image in IMAGES, through the bundle's manifest when there is one."""
+        return os.path.join(self.base_dir, "assets", *self.image_paths.get(rel, rel).split("/"))
+
+    def _finish_menu(self, w: int, h: int) -> None:
+        path = self.asset("backgrounds/scroll.png")
+        scroll = functools.cache(lambda: self.loader.image(path))
+        self.scroll_bg = self.pixels.get(path, (w, h), ("scroll", SCROLL_SIZE), lambda: self._load_scroll_bg(scroll(), w, h), alpha=True)
+        self.ui_scroll = self.pixels.get(path, None, "convert", lambda: scroll().convert_alpha(), alpha=True)
         self.custom_cursor, self.cursor_visible = self._load_cursor()
+        self.backgrounds.get("title")
+
+    def _finish_hallway(self, w: int, h: int) -> None:
         self.notebook_paper_img = self._load_notebook_paper()
         self.hallway_start, self.hallway_loop, self.loop_w, self.mid_point = self._load_hallway(w, h)
-        self.background_assets = self._load_named_backgrounds(w, h)
-        self.battle_backgrounds = self._load_battle_backgrounds(w, h)
         self.door_img, self.door_upclose_img, self.door_nametage_img = self._load_door_assets(w, h)
         self.floor_textures = self._load_floor_textures(w)
 
     def _load_fonts(self, screen_h: int) -> dict:
+        fonts = self.font_registry
         return {
-            "normal": pygame.font.SysFont("Courier", int(screen_h * 0.025)),
-            "title": pygame.font.SysFont("Courier", int(screen_h * 0.07), bold=True),
-            "medium":pygame.font.SysFont("Courier", int(screen_h * 0.035), bold=True),
-            "small": pygame.font.SysFont("Courier", int(screen_h * 0.02)),
+            "normal": fonts.get(int(screen_h * 0.025)),
+            "title": fonts.get(int(screen_h * 0.07), bold=True),
+            "medium": fonts.get(int(screen_h * 0.035), bold=True),
+            "small": fonts.get(int(screen_h * 0.02)),
+            "small_bold": fonts.get(int(screen_h * 0.02), bold=True),
+            "combat": fonts.get(int(screen_h * 0.05), bold=True),
         }
 
-    def _load_scroll_bg(self, w: int, h: int) -> pygame.Surface:
-        path = os.path.join(self.base_dir, "assets", "backgrounds", "scroll.png")
-        img = pygame.image.load(path)
-        return pygame.transform.scale(img, (int(w * 0.85), int(h * 0.65)))
+    def _scaled(self, path: str, size, alpha: bool = False) -> pygame.Surface:
+        def build():
+            img = self.loader.image(path)
+            img = img.convert_alpha() if alpha else img.convert()
+            return pygame.transform.scale(img, size) if size else img
+        return self.pixels.get(path, size, "scale" if size else "convert", build, alpha)
 
-    def _load_ui_scroll(self) -> pygame.Surface:
-        path = os.path.join(self.base_dir, "assets", "backgrounds", "scroll.png")
-        return pygame.image.load(path).convert_alpha()
+    def _load_scroll_bg(self, img: pygame.Surface, w: int, h: int) -> pygame.Surface:
+        return pygame.transform.scale(img, (int(w * SCROLL_SIZE[0]), int(h * SCROLL_SIZE[1])))
 
     def _load_cursor(self) -> tuple:
-        path = os.path.join(self.base_dir, "assets", "ui", "mouse cursor.png")
+        path = self.asset("ui/mouse cursor.png")
         if os.path.exists(path):
             try:
-                img = pygame.image.load(path)
+                img = self.loader.image(path)
                 img = pygame.transform.scale(img, (32, 32))
                 img = img.convert_alpha()
                 pygame.mouse.set_visible(False)
@@ -53,20 +198,23 @@ class AssetLoader:
         return None, False
 
     def _load_notebook_paper(self) -> pygame.Surface | None:
-        path = os.path.join(self.base_dir, "assets", "ui", "notebook_paper.webp")
+        path = self.asset("ui/notebook_paper.webp")
         if os.path.exists(path):
             try:
-                return pygame.image.load(path).convert_alpha()
+                return self._scaled(path, None, alpha=True)
             except Exception as e:
                 print(f"Error loading notebook paper: {e}")
         return None
 
     def _load_hallway(self, screen_w: int, screen_h: int):
-        path = os.path.join(self.base_dir, "assets", "backgrounds", "hallway.png")
-        try:
-            raw = pygame.image.load(path).convert()
+        path = self.asset("backgrounds/hallway.png")
+        def build():
+            raw = self.loader.image(path).convert()
             scale = screen_h / raw.get_height()
-            tex = pygame.transform.scale(raw, (int(raw.get_width() * scale), screen_h))
+            return pygame.transform.scale(raw, (int(raw.get_width() * scale), screen_h))
+
+        try:
+            tex = self.pixels.get(path, screen_h, "fit height", build)
         except Exception:
             tex = pygame.Surface((screen_w, screen_h))
             tex.fill((30, 30, 35))
@@ -77,61 +225,52 @@ class AssetLoader:
         loop = tex.subsurface((mid, 0, mid, screen_h))
         return start, loop, loop.get_width(), mid
 
-    def _load_named_backgrounds(self, w: int, h: int) -> dict:
-        names = ["title", "lost_sridhar", "lost_maiti", "lost_dioch",
-                 "class", "win_kris", "win_shri", "win_ken", "end"]
-        assets = {}
-        for name in names:
-            path = os.path.join(self.base_dir, "assets", "backgrounds", f"{name}.png")
-            try:
-                img = pygame.image.load(path).convert()
-                assets[name] = pygame.transform.scale(img, (w, h))
-            except Exception:
-                fallback = pygame.Surface((w, h))
-                fallback.fill(BLACK)
-                assets[name] = fallback
-        return assets
+    def background(self, name: str) -> pygame.Surface:
+        return self.backgrounds.get(name)
+
+    def _background_sources(self, w: int, h: int) -> dict:
+        sources = {}
+        for name in BACKGROUND_NAMES:
+            path = self.asset(f"backgrounds/{name}.png")
+            sources[name] = (path, functools.partial(self._load_background, path, (w, h), "scale", BLACK))
+        for i, color in enumerate([(40, 30, 50), (30, 40, 60), (50, 30, 30)], start=1):
+            path = self.asset(f"backgrounds/battle_bg_{i}.png")
+            sources[f"battle_bg_{i}"] = (path, functools.partial(self._load_background, path, (w, h), "cover", color))
+        return sources
 
-    def _load_battle_backgrounds(self, screen_w: int, screen_h: int) -> list:
-        bgs = []
+    def _load_background(self, path: str, size, mode: str, fallback_color) -> pygame.Surface:
         try:
-            for i in range(1, 4):
-                path = os.path.join(self.base_dir, "assets", "backgrounds", f"battle_bg_{i}.png")
-                raw = pygame.image.load(path).convert()
-                orig_w, orig_h = raw.get_size()
-                scale = max(screen_w / orig_w, screen_h / orig_h)
-                new_w, new_h = int(orig_w * scale), int(orig_h * scale)
-                raw = pygame.transform.smoothscale(raw, (new_w, new_h))
-                x_off = (screen_w - new_w) // 2
-                y_off = (screen_h - new_h) // 2
-                final = pygame.Surface((screen_w, screen_h))
-                final.fill((0, 0, 0))
-                final.blit(raw, (x_off, y_off))
-                bgs.append(final)
+            if mode == "cover":
+                surf = self.pixels.get(path, size, (mode, BLACK), lambda: self._cover(path, *size, BLACK))
+            else:
+                surf = self._scaled(path, size)
         except Exception as e:
-            print(f"Error loading battle backgrounds: {e}")
-            colors = [(40, 30, 50), (30, 40, 60), (50, 30, 30)]
-            bgs = []
-            for c in colors:
-                s = pygame.Surface((screen_w, screen_h))
-                s.fill(c)
-                bgs.append(s)
-        return bgs
+            print(f"Error loading background {path}: {e}")
+            surf = pygame.Surface(size)
+            surf.fill(fallback_color)
+        self.pixels.flush()
+        return surf
+
+    def _cover(self, path: str, screen_w: int, screen_h: int, fill) -> pygame.Surface:
+        raw = self.loader.image(path).convert()
+        orig_w, orig_h = raw.get_size()
+        scale = max(screen_w / orig_w, screen_h / orig_h)
+        new_w, new_h = int(orig_w * scale), int(orig_h * scale)
+        raw = pygame.transform.smoothscale(raw, (new_w, new_h))
+        x_off = (screen_w - new_w) // 2
+        y_off = (screen_h - new_h) // 2
+        final = pygame.Surface((screen_w, screen_h))
+        final.fill(fill)
+        final.blit(raw, (x_off, y_off))
+        return final
 
     def _load_door_assets(self, screen_w: int, screen_h: int):
         door_w = int(screen_w * 0.15)
         door_h = int(screen_h * 0.38)
         try:
-            door_img = pygame.image.load(
-                os.path.join(self.base_dir, "assets", "door.png")).convert_alpha()
-            door_upclose_img = pygame.image.load(
-                os.path.join(self.base_dir, "assets", "door_cracked.png")).convert_alpha()
-            door_nametage_img = pygame.image.load(
-                os.path.join(self.base_dir, "assets", "door_upclose.png")).convert_alpha()
-
-            door_nametage_img = pygame.transform.scale(door_nametage_img, (screen_w, screen_h))
-            door_img = pygame.transform.scale(door_img, (door_w, door_h))
-            door_upclose_img = pygame.transform.scale(door_upclose_img, (screen_w, screen_h))
+            door_img = self._scaled(self.asset("door.png"), (door_w, door_h), alpha=True)
+            door_upclose_img = self._scaled(self.asset("door_cracked.png"), (screen_w, screen_h), alpha=True)
+            door_nametage_img = self._scaled(self.asset("door_upclose.png"), (screen_w, screen_h), alpha=True)
         except Exception:
             door_img = pygame.Surface((door_w, door_h))
             door_img.fill(GOLD)
@@ -149,10 +288,9 @@ class AssetLoader:
         }
         textures = {}
         for boss_id, (filename, fallback_color) in specs.items():
-            path = os.path.join(self.base_dir, "assets", "backgrounds", filename)
+            path = self.asset(f"backgrounds/{filename}")
             try:
-                img = pygame.image.load(path).convert_alpha()
-                textures[boss_id] = img# scaled at draw time (height varies)
+                textures[boss_id] = self._scaled(path, None, alpha=True)  # scaled at draw time (height varies)
             except Exception:
                 surf = pygame.Surface((screen_w, 1), pygame.SRCALPHA)
                 surf.fill(fallback_color)
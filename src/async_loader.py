@@ -0,0 +1,89 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from src.profiler import PROFILER
+
+
+class AsyncLoader:
+    """Decodes files on a thread pool and finishes them on the main thread in stages.
+
+    SDL_image and SDL_mixer release the GIL while decoding, so image and
+    sound files are read by worker threads. Anything that needs the display
+    (convert, convert_alpha, scaling converted surfaces, building entities)
+    is a stage: a callable run from pump() on the main thread once every file
+    it asked for has been decoded. Stages run in the order they were added,
+    so whatever the first screen needs should be added first.
+    """
+
+    def __init__(self, workers: int = 4):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="asset")
+        self._images = {}  # path -> Future[pygame.Surface]
+        self._stages = deque()
+        self._total = 0
+        self.ready = set()  # names of stages that have run
+        self.current = ""
+        self.skip = None  # predicate for paths not worth decoding ahead of time
+
+    def prefetch(self, paths) -> None:
+        for path in paths:
+            if path in self._images or (self.skip and self.skip(path)):
+                continue
+            if os.path.exists(path):
+                self._images[path] = self.pool.submit(self._decode, path)
+
+    def image(self, path: str) -> pygame.Surface:
+        """Decoded (unconverted) image, waiting for a prefetch if one is pending."""
+        future = self._images.pop(path, None)
+        if future is None:
+            return pygame.image.load(path)
+        return future.result()
+
+    @staticmethod
+    def _decode(path: str) -> pygame.Surface:
+        with PROFILER.scope("AsyncLoader._decode", path):
+            return pygame.image.load(path)
+
+    def add_stage(self, name: str, build, paths=()) -> None:
+        paths = tuple(paths)
+        self.prefetch(paths)
+        self._stages.append((name, build, paths))
+        self._total += 1
+
+    def pump(self, budget_ms: float = 8) -> bool:
+        """Runs ready stages until the budget is spent; returns True once everything is loaded."""
+        start = time.perf_counter()
+        while self._stages:
+            name, build, paths = self._stages[0]
+            if not all(self._images[p].done() for p in paths if p in self._images):
+                break
+            self._run_next()
+            if (time.perf_counter() - start) * 1000 >= budget_ms:
+                break
+        return self.done
+
+    def wait(self) -> None:
+        """Blocks until every stage has run."""
+        while self._stages:
+            self._run_next()
+
+    def _run_next(self) -> None:
+        name, build, paths = self._stages.popleft()
+        self.current = name
+        with PROFILER.scope("AsyncLoader stage", name):
+            build()
+        self.ready.add(name)
+        if not self._stages:
+            # Anything prefetched but never claimed is dead weight now
+            self._images.clear()
+
+    @property
+    def done(self) -> bool:
+        return not self._stages
+
+    @property
+    def progress(self) -> float:
+        return len(self.ready) / self._total if self._total else 1.0
@@ -0,0 +1,62 @@
+import json
+import os
+
+# Transparent pixels between packed frames. Baked shadows reach
+# 2 * SHADOW_OFFSET pixels past a frame once scaled, so sheets are only
+# sliced at scales where the padding covers that (ClipCache checks).
+ATLAS_PADDING = 2
+ATLAS_VERSION = 1
+
+
+class AtlasSet:
+    """Per-character sprite sheets written by tools/build_atlases.py.
+
+    Each character folder under the sprite directory may have a
+    ``<character>.png`` sheet and ``<character>.json`` manifest in the atlas
+    directory. The manifest maps each packed folder (``standard/idle/left``)
+    to its frame rects, and marks whether the whole folder was packed or just
+    a fixed number of frames. Manifests are read on first use; a character
+    without one, or a clip the manifest does not fully cover, returns None
+    so the caller falls back to the per-frame PNGs.
+    """
+
+    def __init__(self, atlas_dir: str, sprite_dir: str):
+        self.atlas_dir = atlas_dir
+        self.sprite_dir = sprite_dir
+        self._manifests = {}
+
+    def lookup(self, folder: str, frame_count: int | None = None):
+        """(sheet path, [(x, y, w, h), ...]) for the clip, or None when it is not packed."""
+        rel = os.path.relpath(folder, self.sprite_dir)
+        if rel.startswith(os.pardir):
+            return None
+        character, _, clip = rel.replace(os.sep, "/").partition("/")
+        manifest = self._manifest(character)
+        entry = manifest and manifest["folders"].get(clip)
+        if not entry:
+            return None
+
+        frames = entry["frames"]
+        if frame_count is None:
+            if not entry["complete"]:
+                return None
+            files = sorted(frames)
+        else:
+            files = [f"{i}.png" for i in range(1, frame_count + 1)]
+            if any(f not in frames for f in files):
+                return None
+        return os.path.join(self.atlas_dir, f"{character}.png"), [frames[f] for f in files]
+
+    def _manifest(self, character: str) -> dict | None:
+        if character not in self._manifests:
+            path = os.path.join(self.atlas_dir, f"{character}.json")
+            try:
+                with open(path) as f:
+                    manifest = json.load(f)
+            except (OSError, ValueError):
+                manifest = None
+            if manifest and manifest.get("version") != ATLAS_VERSION:
+                print(f"[WARN] Ignoring outdated sprite atlas {path}; rerun tools/build_atlases.py")
+                manifest = None
+            self._manifests[character] = manifest
+        return self._manifests[character]
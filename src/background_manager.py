@@ -0,0 +1,152 @@
+from collections import OrderedDict
+
+import pygame
+
+from src.constants import *
+from src.profiler import PROFILER
+
+# Win screen per student, loss screen per professor
+WIN_BACKGROUNDS = {"4.0 Medallion": "win_kris", "Cs Get Degrees": "win_shri", "TA God": "win_ken"}
+LOSS_BACKGROUNDS = {1: "lost_sridhar", 2: "lost_dioch", 3: "lost_maiti"}
+
+
+def win_background(player) -> str:
+    return WIN_BACKGROUNDS.get(player.name, "title") if player else "title"
+
+
+def loss_background(boss) -> str:
+    return LOSS_BACKGROUNDS.get(boss.bossId, "lost_sridhar") if boss else "lost_sridhar"
+
+
+def battle_background(boss_id: int) -> str:
+    return f"battle_bg_{boss_id}"
+
+
+def _size(surf: pygame.Surface) -> int:
+    return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+
+class BackgroundManager:
+    """Full-screen backgrounds, loaded as the game approaches the state that shows them.
+
+    ``sources`` maps each background name to (source path, build), where
+    build returns the finished screen-sized surface. follow() is called once
+    per frame: it pins what the current state draws, queues what the next
+    state will need on the AsyncLoader, and evicts least-recently-used
+    backgrounds that are not pinned once the total passes ``budget_bytes``.
+    get() still loads synchronously if a background was not prefetched in time.
+    Surfaces built from a background (a dimmed copy, the battle backdrop)
+    come from derived(), which counts them against the same budget and drops
+    them together with their background.
+    """
+
+    def __init__(self, sources: dict, loader, budget_bytes: int):
+        self.sources = sources
+        self.loader = loader
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._surfaces = OrderedDict()  # name -> surface, least recently used first
+        self._derived = {}  # name -> {key: surface built from that background}
+        self._queued = set()
+        self._pinned = set()
+        self._follow_key = None
+
+    def get(self, name: str) -> pygame.Surface:
+        surf = self._surfaces.get(name)
+        if surf is None:
+            surf = self._load(name)
+        self._surfaces.move_to_end(name)
+        return surf
+
+    def derived(self, name: str, key, build) -> pygame.Surface:
+        """build(background) for this background and key, kept and evicted along with the background."""
+        base = self.get(name)
+        layers = self._derived.setdefault(name, {})
+        surf = layers.get(key)
+        if surf is None:
+            surf = layers[key] = build(base)
+            self.used_bytes += _size(surf)
+            self._evict(keep=name)
+        return surf
+
+    def follow(self, game) -> None:
+        boss_id = game.boss.bossId if game.boss else None
+        door = game.selected_door["level"] if game.selected_door else None
+        player = game.player.name if game.player else None
+        key = (game.state, game.next_state if game.fading else None, boss_id, door, player, game.current_level)
+        if key == self._follow_key:
+            return
+        self._follow_key = key
+
+        needed = self._needs(game, game.state)
+        upcoming = self._upcoming(game) | (self._needs(game, game.next_state) if game.fading else set())
+        self._pinned = needed | upcoming
+        for name in sorted(needed) + sorted(upcoming - needed):
+            self.prefetch(name)
+
+    def prefetch(self, name: str) -> None:
+        if name in self._surfaces or name in self._queued or name not in self.sources:
+            return
+        self._queued.add(name)
+        path, _build = self.sources[name]
+        self.loader.add_stage(f"background {name}", lambda: self._loaded(name), [path])
+
+    def _loaded(self, name: str) -> None:
+        if name in self._queued and name not in self._surfaces:
+            self._load(name)
+
+    def _load(self, name: str) -> pygame.Surface:
+        self._queued.discard(name)
+        _path, build = self.sources[name]
+        with PROFILER.scope("BackgroundManager._load", name):
+            surf = build()
+        self._surfaces[name] = surf
+        self.used_bytes += _size(surf)
+        self._evict(keep=name)
+        return surf
+
+    def _evict(self, keep: str) -> None:
+        for name in list(self._surfaces):
+            if self.used_bytes <= self.budget_bytes:
+                break
+            if name == keep or name in self._pinned:
+                continue
+            surf = self._surfaces.pop(name)
+            self.used_bytes -= _size(surf)
+            for layer in self._derived.pop(name, {}).values():
+                self.used_bytes -= _size(layer)
+
+    def _needs(self, game, state) -> set:
+        if state in (LOADING, MENU):
+            return {"title"}
+        if state == SELECT:
+            return {"class"}
+        if state == BATTLE and game.boss:
+            return {battle_background(game.boss.bossId)}
+        if state == WIN:
+            return {win_background(game.player)}
+        if state == LOSS:
+            return {loss_background(game.boss)}
+        if state == TOTAL_WIN:
+            return {"end"}
+        return set()
+
+    def _upcoming(self, game) -> set:
+        state = game.state
+        if state in (LOADING, MENU):
+            return {"class"}
+        if state == HALLWAY:
+            # The furthest unlocked door is the one most likely to be opened next
+            return {battle_background(game.current_level + 1)}
+        if state == DOOR_VIEW and game.selected_door:
+            return {battle_background(game.selected_door["level"] + 1)}
+        if state == BATTLE:
+            upcoming = {win_background(game.player), loss_background(game.boss)}
+            if game.current_level >= 2:
+                upcoming.add("end")
+            return upcoming
+        if state == WIN and game.current_level >= 2:
+            return {"end"}
+        if state == TOTAL_WIN:
+            return {"title"}
+        return set()
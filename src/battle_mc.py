@@ -0,0 +1,79 @@
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # optional; only tools/simulate_battles.py --engine numpy needs it
+    np = None
+
+from src import rules
+from src.battle_sim import heal_policy, pairing_report
+
+# Trials held in memory at once per pairing (a handful of int arrays each)
+BATCH_SIZE = 1_000_000
+
+
+def play_batch(student: dict, prof: dict, trials: int, accuracy: float, should_heal, rng) -> tuple:
+    """Plays ``trials`` battles at once, one turn of every live battle per array step.
+
+    Same rules and turn order as battle_sim.play, using the damage table of
+    rules.attack: a crit at 1.5x, a partial hit at 0.5x, or a direct hit.
+    Returns (wins by turn, losses by turn) as int arrays indexed by turn.
+    """
+    name = student["name"]
+    power = student["attack"]
+    max_hp = student["hp"]
+    boss_attack = prof["attack"]
+    crit = rules.SPECIAL_CRIT_CHANCE if name == rules.CRIT_STUDENT else rules.CRIT_CHANCE
+    crit_damage = int(power * rules.CRIT_MULTIPLIER)
+    block_damage = int(power * rules.BLOCK_MULTIPLIER)
+    heal_amount = rules.heal(name)[0]
+    curve = rules.CURVE_CHANCE if name == rules.CURVE_STUDENT else 0.0
+
+    hp = np.full(trials, max_hp, dtype=np.int32)
+    boss_hp = np.full(trials, prof["hp"], dtype=np.int32)
+    heals = np.full(trials, rules.NUM_HEALS, dtype=np.int32)
+    wins, losses = [0], [0]  # turn 0 never ends a battle
+
+    while hp.size:
+        n = hp.size
+        healing = (heals > 0) & (hp < max_hp) & np.broadcast_to(should_heal(hp, max_hp, boss_attack), n)
+        hp = np.where(healing, np.minimum(hp + heal_amount, max_hp), hp)
+        heals -= healing
+
+        roll = rng.random(n)
+        damage = np.where(roll < crit, crit_damage, np.where(roll < crit + rules.BLOCK_CHANCE, block_damage, power))
+        boss_hp -= np.where(healing, 0, damage).astype(np.int32)
+        won = boss_hp <= 0
+
+        hit = (rng.random(n) >= accuracy) & (rng.random(n) >= curve) & ~won
+        hp -= hit.astype(np.int32) * boss_attack
+        lost = hp <= 0
+
+        wins.append(int(won.sum()))
+        losses.append(int(lost.sum()))
+        live = ~(won | lost)
+        hp, boss_hp, heals = hp[live], boss_hp[live], heals[live]
+
+    return np.array(wins), np.array(losses)
+
+
+def run(trials: int, accuracy: float = 0.5, heal: str = "lethal", seed: int = 0,
+        students=None, profs=None) -> list[dict]:
+    """NumPy counterpart of battle_sim.run: the same report, from batched trials in this process."""
+    if np is None:
+        raise RuntimeError("The NumPy battle engine needs numpy (pip install numpy)")
+    should_heal = heal_policy(heal)
+    students = students or rules.STUDENTS
+    profs = profs or rules.PROFESSORS
+
+    results = []
+    for s, student in enumerate(students):
+        for p, prof in enumerate(profs):
+            rng = np.random.default_rng([seed, s, p])
+            won_turns, lost_turns = Counter(), Counter()
+            for start in range(0, trials, BATCH_SIZE):
+                wins, losses = play_batch(student, prof, min(BATCH_SIZE, trials - start), accuracy, should_heal, rng)
+                won_turns.update({t: int(c) for t, c in enumerate(wins) if c})
+                lost_turns.update({t: int(c) for t, c in enumerate(losses) if c})
+            results.append(pairing_report(student, prof, trials, sum(won_turns.values()), won_turns, lost_turns))
+    return results
@@ -0,0 +1,141 @@
+import os
+import random
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from src import rules
+
+# Battles per process pool task; big enough that pickling results is noise
+CHUNK_SIZE = 50_000
+
+
+def heal_policy(spec: str):
+    """Parses a heal policy into should_heal(hp, max_hp, boss_attack).
+
+    never      only ever attack
+    always     heal whenever a heal is left and HP is below max
+    lethal     heal once the next wrong answer would end the battle
+    below:F    heal at or below fraction F of max HP, e.g. below:0.3
+    """
+    if spec == "never":
+        return lambda hp, max_hp, boss_attack: False
+    if spec == "always":
+        return lambda hp, max_hp, boss_attack: True
+    if spec == "lethal":
+        return lambda hp, max_hp, boss_attack: hp <= boss_attack
+    if spec.startswith("below:"):
+        fraction = float(spec.partition(":")[2])
+        return lambda hp, max_hp, boss_attack: hp <= max_hp * fraction
+    raise ValueError(f"Unknown heal policy {spec!r}")
+
+
+def play(student: dict, prof: dict, accuracy: float, should_heal, rng) -> tuple[bool, int]:
+    """Plays one battle with CombatHandler's turn order; returns (student won, turns taken).
+
+    Each turn the student attacks or heals, then (unless the professor is
+    down) answers a question, correctly with probability ``accuracy``.
+    """
+    name = student["name"]
+    power = student["attack"]
+    hp = max_hp = student["hp"]
+    heals = rules.NUM_HEALS
+    boss_hp = prof["hp"]
+    boss_attack = prof["attack"]
+    attack, heal, can_heal, curve_saves = rules.attack, rules.heal, rules.can_heal, rules.curve_saves
+    chance = rng.random
+
+    turns = 0
+    while True:
+        turns += 1
+        if can_heal(hp, max_hp, heals) and should_heal(hp, max_hp, boss_attack):
+            hp = min(max_hp, hp + heal(name)[0])
+            heals -= 1
+        else:
+            boss_hp -= attack(name, power, rng)[0]
+            if boss_hp <= 0:
+                return True, turns
+
+        if chance() >= accuracy and not curve_saves(name, rng):
+            hp -= boss_attack
+            if hp <= 0:
+                return False, turns
+
+
+def simulate(student: dict, prof: dict, battles: int, accuracy: float, heal: str, seed: str) -> tuple:
+    """(wins, Counter of turns for wins, Counter of turns for losses) over ``battles`` battles."""
+    should_heal = heal_policy(heal)
+    rng = random.Random(seed)
+
+    won_turns, lost_turns = Counter(), Counter()
+    for _ in range(battles):
+        won, turns = play(student, prof, accuracy, should_heal, rng)
+        if won:
+            won_turns[turns] += 1
+        else:
+            lost_turns[turns] += 1
+    return sum(won_turns.values()), won_turns, lost_turns
+
+
+def run(battles: int, accuracy: float = 0.5, heal: str = "lethal", seed: int = 0,
+        workers: int | None = None, students=None, profs=None) -> list[dict]:
+    """Simulates ``battles`` battles for every (student, professor) pairing across a process pool.
+
+    students and profs default to the tables in src/rules.py. Results are
+    deterministic for a given seed, whatever the worker count.
+    """
+    heal_policy(heal)  # fail here, not in every worker
+    students = students or rules.STUDENTS
+    profs = profs or rules.PROFESSORS
+    tasks = []
+    for s, student in enumerate(students):
+        for p, prof in enumerate(profs):
+            for chunk, start in enumerate(range(0, battles, CHUNK_SIZE)):
+                n = min(CHUNK_SIZE, battles - start)
+                tasks.append(((s, p), (student, prof, n, accuracy, heal, f"{seed}:{s}:{p}:{chunk}")))
+
+    totals = {}
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [(key, pool.submit(simulate, *args)) for key, args in tasks]
+        for key, future in futures:
+            wins, won_turns, lost_turns = future.result()
+            total = totals.setdefault(key, [0, Counter(), Counter()])
+            total[0] += wins
+            total[1].update(won_turns)
+            total[2].update(lost_turns)
+
+    return [pairing_report(students[s], profs[p], battles, *totals[s, p]) for s, p in sorted(totals)]
+
+
+def pairing_report(student: dict, prof: dict, battles: int, wins: int, won_turns: Counter, lost_turns: Counter) -> dict:
+    return {
+        "student": student["name"],
+        "professor": prof["name"],
+        "battles": battles,
+        "win_rate": wins / battles if battles else 0.0,
+        "loss_rate": (battles - wins) / battles if battles else 0.0,
+        "turns": turn_stats(won_turns + lost_turns),
+        "turns_won": turn_stats(won_turns),
+        "turns_lost": turn_stats(lost_turns),
+    }
+
+
+def turn_stats(counts: Counter) -> dict:
+    """Mean, percentiles and the full histogram of a turn-count Counter."""
+    total = sum(counts.values())
+    if not total:
+        return {"mean": None, "p50": None, "p95": None, "max": None, "histogram": {}}
+
+    def percentile(q):
+        seen = 0
+        for turns in sorted(counts):
+            seen += counts[turns]
+            if seen >= q * total:
+                return turns
+
+    return {
+        "mean": sum(t * n for t, n in counts.items()) / total,
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "max": max(counts),
+        "histogram": {str(t): counts[t] for t in sorted(counts)},
+    }
@@ -0,0 +1,130 @@
+import os
+import pygame
+
+from src.atlas import ATLAS_PADDING
+from src.profiler import PROFILER
+
+SHADOW_OFFSET = 5
+SHADOW_COLOR = (0, 0, 0, 150)
+_SHADOW_DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1), (-1, -1), (1, 1), (-1, 1), (1, -1)]
+# Everything bake_shadow bakes in, for PixelCache keys
+_SHADOW_PARAMS = (SHADOW_OFFSET, SHADOW_COLOR, tuple(_SHADOW_DIRS))
+
+
+def bake_shadow(frame: pygame.Surface) -> pygame.Surface:
+    """Outline shadow for a frame; blit it SHADOW_OFFSET up and left of the frame."""
+    w, h = frame.get_size()
+    tinted = frame.copy()
+    tinted.fill(SHADOW_COLOR, special_flags=pygame.BLEND_RGBA_MULT)
+
+    shadow = pygame.Surface((w + SHADOW_OFFSET * 2, h + SHADOW_OFFSET * 2), pygame.SRCALPHA)
+    for dx, dy in _SHADOW_DIRS:
+        shadow.blit(tinted, (SHADOW_OFFSET + dx * SHADOW_OFFSET, SHADOW_OFFSET + dy * SHADOW_OFFSET))
+    return shadow
+
+
+class ClipCache:
+    """Loads and scales each animation clip once and hands out shared frames.
+
+    A clip is identified by its folder (character/action/direction), the
+    scale it is drawn at and, optionally, a fixed frame count. Frames are
+    returned as tuples so every entity sharing a clip gets the same surfaces
+    and nobody can accidentally append to or reorder them. Missing folders
+    cache as an empty clip, so a lookup never touches the disk twice.
+    Each frame's outline shadow is baked alongside it at load time.
+    Set ``loader`` to an AsyncLoader to pick up frames it has already decoded,
+    ``pixels`` to a PixelCache to keep scaled frames and shadows on disk, and
+    ``atlases`` to an AtlasSet to slice clips out of packed sprite sheets.
+    """
+
+    def __init__(self):
+        self._clips = {}
+        self._sheets = {}
+        self.loader = None
+        self.pixels = None
+        self.atlases = None
+
+    def get(self, folder: str, scale: int, frame_count: int | None = None) -> tuple:
+        return self._clip(folder, scale, frame_count)[0]
+
+    def shadows(self, folder: str, scale: int, frame_count: int | None = None) -> tuple:
+        return self._clip(folder, scale, frame_count)[1]
+
+    def _clip(self, folder: str, scale: int, frame_count: int | None) -> tuple:
+        key = (folder, scale, frame_count)
+        clip = self._clips.get(key)
+        if clip is None:
+            clip = self._clips[key] = self._load(folder, scale, frame_count)
+        return clip
+
+    def preload(self, base_path: str, clips: list, scale: int) -> None:
+        for action, direction in clips:
+            self.get(os.path.join(base_path, action, direction), scale)
+
+    def sources(self, folder: str, frame_count: int | None = None) -> list[str]:
+        """Files a clip is read from: its atlas sheet when one covers it, else the frame PNGs."""
+        packed = self.atlases.lookup(folder, frame_count) if self.atlases else None
+        if packed:
+            return [packed[0]]
+        return [os.path.join(folder, f) for f in self._frame_files(folder, frame_count)]
+
+    def clear(self) -> None:
+        self._clips.clear()
+        self._sheets.clear()
+
+    def _frame_files(self, folder: str, frame_count: int | None) -> list[str]:
+        if not os.path.isdir(folder):
+            return []
+        if frame_count is None:
+            return sorted(f for f in os.listdir(folder) if f.endswith(".png"))
+        return [f"{i}.png" for i in range(1, frame_count + 1)]
+
+    def _load(self, folder: str, scale: int, frame_count: int | None) -> tuple:
+        with PROFILER.scope("ClipCache._load", folder):
+            return self._load_clip(folder, scale, frame_count)
+
+    def _load_clip(self, folder: str, scale: int, frame_count: int | None) -> tuple:
+        packed = self.atlases.lookup(folder, frame_count) if self.atlases else None
+        # Below this scale neighbouring frames would bleed into each other's shadows
+        if packed and ATLAS_PADDING * scale >= SHADOW_OFFSET * 2:
+            return self._slice(*packed, scale)
+
+        files = self._frame_files(folder, frame_count)
+        frames = []
+        shadows = []
+        for f in files:
+            path = os.path.join(folder, f)
+            frame = self._cached(path, scale, "sprite", lambda: self._scaled_frame(path, scale))
+            frames.append(frame)
+            shadows.append(self._cached(path, scale, ("shadow", *_SHADOW_PARAMS), lambda: bake_shadow(frame)))
+        return tuple(frames), tuple(shadows)
+
+    def _slice(self, sheet_path: str, rects: list, scale: int) -> tuple:
+        # One scaled sheet and one shadow sheet per character; clips are subsurfaces of them
+        key = (sheet_path, scale)
+        sheets = self._sheets.get(key)
+        if sheets is None:
+            # Nearest-neighbour scaling a small sheet is cheaper than reading it back scaled
+            sheet = self._scaled_frame(sheet_path, scale)
+            shadow = self._cached(sheet_path, scale, ("sheet shadow", *_SHADOW_PARAMS), lambda: bake_shadow(sheet))
+            sheets = self._sheets[key] = (sheet, shadow)
+        sheet, shadow = sheets
+
+        pad = SHADOW_OFFSET * 2
+        frames = tuple(sheet.subsurface((x * scale, y * scale, w * scale, h * scale)) for x, y, w, h in rects)
+        shadows = tuple(shadow.subsurface((x * scale, y * scale, w * scale + pad, h * scale + pad))
+                        for x, y, w, h in rects)
+        return frames, shadows
+
+    def _scaled_frame(self, path: str, scale: int) -> pygame.Surface:
+        img = (self.loader.image(path) if self.loader else pygame.image.load(path)).convert_alpha()
+        w, h = img.get_size()
+        return pygame.transform.scale(img, (int(w * scale), int(h * scale)))
+
+    def _cached(self, path: str, scale: int, mode, build) -> pygame.Surface:
+        if self.pixels is None:
+            return build()
+        return self.pixels.get(path, scale, mode, build, alpha=True)
+
+
+CLIPS = ClipCache()
@@ -1,16 +1,61 @@
-import os
-import random
-import pygame
-from src.constants import GOLD, WHITE, GRAY, IDLE
+from src.constants import GOLD, WHITE, GRAY, IDLE, WALK, BATTLE, ANSWERS, WIN, LOSS, SCREEN_WIDTH
+from src.sim_clock import CLOCK
+from src import rules
+from src.profiler import profiled
 
 
 class CombatHandler:
+    @profiled()
+    def update(self, game):
+        """One simulation step of a battle: music, animation, the boss walk-in and the victory sequence."""
+        boss_music_id = game.boss.bossId
+        if game.current_boss_music_id != boss_music_id:
+            game.sound.play_music(f"boss{boss_music_id}_music", volume=0.1)
+            game.current_boss_music_id = boss_music_id
+
+        game.player.update_animation()
+        game.boss.update_animation()
+
+        if game.boss_entering:
+            game.boss.set_state(WALK)
+            game.boss_x -= game.boss_walk_speed
+            if game.boss_x <= game.boss_target_x:
+                game.boss_x = game.boss_target_x
+                game.boss_entering = False
+                game.boss.set_state(IDLE)
+
+        if game.combat_text and CLOCK.now() < game.combat_text_timer:
+            game.combat_text_y_offset -= 0.5
+
+        if game.flash_timer > 0:
+            game.flash_timer -= 1
+
+        if game.victory_stage > 0:
+            self._advance_victory(game)
+
+    def _advance_victory(self, game):
+        elapsed = CLOCK.now() - game.victory_timer
+        if game.victory_stage == 1 and elapsed > 2000:
+            game.victory_stage = 2
+            game.victory_timer = CLOCK.now()
+        elif game.victory_stage == 2 and elapsed > 100:
+            game.victory_stage = 3
+            if game.is_player_victory:
+                game.start_fade(WIN)
+                game.boss_entering = True
+                game.boss_x = SCREEN_WIDTH + 200
+                game.snap("boss_x")
+            else:
+                game.start_fade(LOSS)
+
     def show_combat_text(self, game, text: str, color=WHITE):
         game.combat_text = text
         game.combat_text_color = color
-        game.combat_text_timer = pygame.time.get_ticks() + 2000
+        game.combat_text_timer = CLOCK.now() + 2000
         game.combat_text_y_offset = -30
+        game.snap("combat_text_y_offset")
 
+    @profiled()
     def handle_battle_click(self, game, mouse_pos):
         if game.boss_entering or game.victory_stage > 0:
             return
@@ -21,13 +66,14 @@ class CombatHandler:
             self._handle_answer_click(game, mouse_pos)
 
     def _handle_action_click(self, game, mouse_pos):
-        if game.btn_atk and game.btn_atk.is_clicked(mouse_pos):
+        hit = game.ui[BATTLE].hit_test(mouse_pos)
+        if hit is game.btn_atk:
             dmg, msg, is_special = game.player.calculate_attack()
 
             if is_special:
-                game.sound.play_sfx(os.path.join(game.sfx_dir, "critical_hit.wav"), volume=0.1)
+                game.sound.play_sfx("critical_hit", volume=0.1)
             else:
-                game.sound.play_sfx(os.path.join(game.sfx_dir, "punch_sound.wav"), volume=0.1)
+                game.sound.play_sfx("punch", volume=0.1)
 
             self.show_combat_text(game, msg, GOLD if is_special else WHITE)
 
@@ -42,7 +88,7 @@ class CombatHandler:
             else:
                 self._ask_question(game)
 
-        elif game.btn_heal and game.btn_heal.is_clicked(mouse_pos):
+        elif hit is game.btn_heal:
             amt, msg, is_special = game.player.get_heal_amount()
             self.show_combat_text(game, msg, GOLD if is_special else GRAY)
             game.player.hp = min(game.player.max_hp, game.player.hp + amt)
@@ -50,65 +96,64 @@ class CombatHandler:
             self._ask_question(game)
 
     def _handle_answer_click(self, game, mouse_pos):
-        for btn in game.answer_btns:
-            if not btn.is_clicked(mouse_pos):
-                continue
+        btn = game.ui[ANSWERS].hit_test(mouse_pos)
+        if btn is None:
+            return
 
-            correct_index = game.current_q["correct"]
-            correct_answer = game.current_q["choices"][correct_index]
+        correct_index = game.current_q["correct"]
+        correct_answer = game.current_q["choices"][correct_index]
 
-            if btn.text == correct_answer:
-                game.battle_log = "CORRECT! You dodged the grade deduction!"
-                self.show_combat_text(game, "DODGED!", (0, 255, 255))
-                game.sound.play_sfx(os.path.join(game.sfx_dir, "dodge.mp3"), volume=0.1)
+        if btn.text == correct_answer:
+            game.battle_log = "CORRECT! You dodged the grade deduction!"
+            self.show_combat_text(game, "DODGED!", (0, 255, 255))
+            game.sound.play_sfx("dodge", volume=0.1)
+        else:
+            if rules.curve_saves(game.player.name):
+                game.battle_log = "WRONG! But the curve saved you!"
             else:
-                if game.player.name == "Cs Get Degrees" and random.random() < 0.25:
-                    game.battle_log = "WRONG! But the curve saved you!"
-                else:
-                    dmg = game.boss.attack_power
-                    game.player.hp -= dmg
-                    game.boss.play_animation("spellcast", "down", 6)
-                    game.player.play_animation("hurt", "up", 3)
-                    game.battle_log = f"INCORRECT! Lost {dmg} HP!"
+                dmg = game.boss.attack_power
+                game.player.hp -= dmg
+                game.boss.play_animation("spellcast", "down", 6)
+                game.player.play_animation("hurt", "up", 3)
+                game.battle_log = f"INCORRECT! Lost {dmg} HP!"
 
-            game.show_question = False
+        game.show_question = False
 
-            if game.player.hp <= 0:
-                self._trigger_boss_victory(game)
-            break
+        if game.player.hp <= 0:
+            self._trigger_boss_victory(game)
 
     def _ask_question(self, game):
-        game.show_question = True
         game.current_q = game.q_manager.get_random_question(game.boss.bossId)
+        # Only possible with the STOP policy once the boss's questions run out
+        game.show_question = game.current_q is not None
         volume = 0.3 if game.boss.bossId in (2, 3) else 1.0
         game.sound.play_random_voiceline(game.boss.bossId, volume=volume)
 
     def _trigger_player_victory(self, game):
         game.boss.play_animation("hurt", "up", 5, freeze_last=True)
         game.player.play_animation("spellcast", "right", 6, freeze_last=True)
-        game.victory_timer = pygame.time.get_ticks()
+        game.victory_timer = CLOCK.now()
         game.victory_stage = 1
         game.is_player_victory = True
         game.sound.clear_music()
-        game.sound.play_voice(os.path.join(game.sfx_dir, "win-sound.wav"), volume=0.3)
+        game.sound.play_voice("win", volume=0.3)
 
     def _trigger_boss_victory(self, game):
         game.player.play_animation("hurt", "up", 5, freeze_last=True)
         game.boss.play_animation("spellcast", "left", 6, freeze_last=True)
-        game.victory_timer = pygame.time.get_ticks()
+        game.victory_timer = CLOCK.now()
         game.victory_stage = 1
         game.is_player_victory = False
         game.sound.clear_music()
-        game.sound.play_voice(os.path.join(game.sfx_dir, "lose_sound.wav"), volume=0.2)
+        game.sound.play_voice("lose", volume=0.2)
 
+    @profiled()
     def transition_to_battle(self, game):
-        import os
-        game.battle_start_time = pygame.time.get_ticks()
+        game.battle_start_time = CLOCK.now()
         game.boss = game.profs[game.selected_door["level"]]
 
-        intro_file = os.path.join(game.audio_dir, f"Prof{game.boss.bossId}Intro.wav")
         volume = 0.3 if game.boss.bossId in (2, 3) else 1.0
-        game.sound.play_voice(intro_file, volume=volume)
+        game.sound.play_voice(f"prof{game.boss.bossId}_intro", volume=volume)
 
         game.player.facing = "right"
         game.boss.facing = "left"
@@ -122,4 +167,5 @@ class CombatHandler:
 
         game.start_fade("BATTLE")
         game.boss_entering = True
-        game.boss_x = game.screen.get_width() + 200
\ No newline at end of file
+        game.boss_x = game.screen.get_width() + 200
+        game.snap("boss_x")
\ No newline at end of file
@@ -0,0 +1,67 @@
+import pygame
+
+
+class DirtyRectCompositor:
+    """Pushes only changed screen regions to the display on static screens.
+
+    While the renderer reports a static scene (see Renderer.static_scene_key)
+    the backdrop is drawn once and snapshotted; each later frame restores the
+    snapshot under last frame's live widgets and cursor, redraws them, and
+    updates just those rects. Anything else (scene changes, fades, the
+    hallway and battle) falls back to a full redraw and flip.
+    """
+
+    def __init__(self, screen: pygame.Surface, enabled: bool = False):
+        self.screen = screen
+        self.enabled = enabled
+        self._backdrop = None
+        self._scene_key = None
+        self._prev_rects = []
+        self._rects = []
+        self._dirty = []
+        self._full = True
+
+    def invalidate(self) -> None:
+        self._scene_key = None
+        self._full = True
+
+    def draw_static(self, game, scene_key, cursor, m_pos) -> None:
+        renderer = game.renderer
+        if scene_key != self._scene_key:
+            renderer.draw_backdrop(game)
+            if self._backdrop is None or self._backdrop.get_size() != self.screen.get_size():
+                self._backdrop = self.screen.copy()
+            else:
+                self._backdrop.blit(self.screen, (0, 0))
+            self._scene_key = scene_key
+            self._prev_rects = []
+            self._full = True
+        else:
+            for rect in self._prev_rects:
+                self.screen.blit(self._backdrop, rect, rect)
+                self._dirty.append(rect)
+
+        layer = renderer.live_widgets(game)
+        if layer is not None:
+            layer.draw(self.screen, game.assets.fonts["normal"], m_pos)
+            for widget in layer.widgets:
+                self._add(widget.rect)
+
+        if cursor:
+            self._add(self.screen.blit(cursor, cursor.get_rect(topleft=m_pos)))
+
+    def present(self) -> None:
+        if self._full or not self.enabled:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._dirty)
+
+        self._prev_rects = self._rects
+        self._rects = []
+        self._dirty = []
+        self._full = False
+
+    def _add(self, rect) -> None:
+        rect = pygame.Rect(rect).clip(self.screen.get_rect())
+        self._rects.append(rect)
+        self._dirty.append(rect)
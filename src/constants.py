@@ -1,10 +1,31 @@
+import os
 import pygame
 
 pygame.init()
-info = pygame.display.Info()
-SCREEN_WIDTH = info.current_w
-SCREEN_HEIGHT = info.current_h
-FPS = 60
+
+# CAD_SCREEN_SIZE=WIDTHxHEIGHT runs windowed at a fixed size (used by benchmark.py)
+FORCED_SCREEN_SIZE = os.environ.get("CAD_SCREEN_SIZE")
+if FORCED_SCREEN_SIZE:
+    SCREEN_WIDTH, SCREEN_HEIGHT = (int(v) for v in FORCED_SCREEN_SIZE.lower().split("x"))
+else:
+    info = pygame.display.Info()
+    SCREEN_WIDTH = info.current_w
+    SCREEN_HEIGHT = info.current_h
+# Rendering is decoupled from the fixed-step simulation: CAD_FPS caps frames per
+# second (0 = uncapped) and CAD_VSYNC=0 stops flips waiting for the display
+FPS = int(os.environ.get("CAD_FPS", "0"))
+VSYNC = os.environ.get("CAD_VSYNC", "1") == "1"
+SIM_HZ = 60  # gameplay steps per second; every speed in the game is per step
+
+# CAD_DIRTY_RECTS=1 opts into DirtyRectCompositor (partial display updates on static screens)
+DIRTY_RECTS = os.environ.get("CAD_DIRTY_RECTS") == "1"
+
+# CAD_BG_BUDGET_MB caps memory held by full-screen backgrounds (see BackgroundManager)
+BACKGROUND_BUDGET_MB = int(os.environ.get("CAD_BG_BUDGET_MB", "160"))
+
+# CAD_PROFILE=<file> profiles from launch and writes a Chrome trace there on
+# quit; F3 toggles the profiler overlay, F4 saves a trace at any time
+PROFILE_TRACE = os.environ.get("CAD_PROFILE", "")
 
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -15,4 +36,7 @@ GREEN = (0, 255, 0)
 GOLD = (255, 215, 0)
 
 MENU, SELECT, HALLWAY, DOOR_VIEW, BATTLE, WIN, LOSS, TOTAL_WIN = "MENU", "SELECT", "HALLWAY", "DOOR_VIEW", "BATTLE", "WIN", "LOSS", "TOTAL WIN"
+LOADING = "LOADING"
+# UI layers that are overlays within a state rather than a state of their own
+EXIT_PROMPT, ANSWERS = "EXIT_PROMPT", "ANSWERS"
 IDLE, ACTION, WALK = "IDLE", "ACTION", "WALK"
\ No newline at end of file
@@ -1,30 +1,127 @@
 # dataGen.py
-import json
-import base64
+import mmap
 import random
+import struct
+from collections import deque
 from pathlib import Path
 
-DATA_PATH = Path(__file__).parent.parent / "data" / "questions.dat"
+DATA_PATH = Path(__file__).parent.parent / "data" / "questions.qbank"
+
+# Compiled bank layout; data/build_questions.py documents and writes it
+BANK_MAGIC = b"CADQ"
+BANK_VERSION = 1
+HEADER = struct.Struct("<4sHHIIII")
+BOSS_ENTRY = struct.Struct("<iII")
+RECORD = struct.Struct("<IIBB2x")
+CHOICE = struct.Struct("<I")
+STRING_ENTRY = struct.Struct("<II")
+
+# What get_random_question does once a boss's deck runs out
+RESHUFFLE = "reshuffle"  # deal a fresh deck, recently asked questions last
+STOP = "stop"            # return None, like the original asked-set behaviour
+
+class QuestionBank:
+    """Read-only view of a compiled question bank.
+
+    Only the header and boss table are read up front; a boss's questions are
+    decoded from the memory map the first time that pool is asked for.
+    """
+
+    def __init__(self, path=DATA_PATH):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, boss_count, self.question_count, self._string_count, \
+            self._table_offset, self._data_offset = HEADER.unpack_from(self._map, 0)
+        if magic != BANK_MAGIC or version != BANK_VERSION:
+            self._map.close()
+            raise ValueError(f"{path} is not a version {BANK_VERSION} question bank")
+
+        self._bosses = {}
+        for i in range(boss_count):
+            boss_id, offset, count = BOSS_ENTRY.unpack_from(self._map, HEADER.size + i * BOSS_ENTRY.size)
+            self._bosses[boss_id] = (offset, count)
+        self._strings = {}
+        self._pools = {}
+
+    def boss_ids(self):
+        return list(self._bosses)
+
+    def load_boss(self, boss_id):
+        pool = self._pools.get(boss_id)
+        if pool is not None:
+            return pool
+        offset, count = self._bosses.get(boss_id, (0, 0))
+        pool = []
+        for _ in range(count):
+            qid, text, correct, n_choices = RECORD.unpack_from(self._map, offset)
+            offset += RECORD.size
+            choices = [self._string(CHOICE.unpack_from(self._map, offset + i * CHOICE.size)[0])
+                       for i in range(n_choices)]
+            offset += n_choices * CHOICE.size
+            pool.append({"id": qid, "text": self._string(text), "choices": choices,
+                         "correct": correct, "bossId": boss_id})
+        self._pools[boss_id] = pool
+        return pool
+
+    def _string(self, index):
+        s = self._strings.get(index)
+        if s is None:
+            start, length = STRING_ENTRY.unpack_from(self._map, self._table_offset + index * STRING_ENTRY.size)
+            start += self._data_offset
+            s = self._strings[index] = self._map[start:start + length].decode("utf-8")
+        return s
+
+    def close(self):
+        self._map.close()
+
 
 def load_questions():
-    with open(DATA_PATH, "r") as f:
-        encoded = f.read()
-    decoded = base64.b64decode(encoded).decode("utf-8")
-    data = json.loads(decoded)
-    return data["questions"]  # list of all questions
+    bank = QuestionBank()
+    questions = [q for boss_id in bank.boss_ids() for q in bank.load_boss(boss_id)]
+    bank.close()
+    return questions
 
 class QuestionManager:
-    def __init__(self):
-        self.all_questions = load_questions()
+    def __init__(self, exhaustion_policy=RESHUFFLE, recent_window=5, rng=None):
+        if exhaustion_policy not in (RESHUFFLE, STOP):
+            raise ValueError(f"Unknown exhaustion policy: {exhaustion_policy}")
+        self.exhaustion_policy = exhaustion_policy
+        self.recent_window = recent_window
+        self.rng = rng or random.Random()
+
+        self.bank = QuestionBank()
         self.asked = set()  # track asked question IDs
 
+        # Per boss: a shuffled deck popped from the end, dealt from the bank on first use
+        self._decks = {}
+        self._recent = {}
+
     def get_questions_for_boss(self, boss_id):
-        return [q for q in self.all_questions if q["bossId"] == boss_id]
+        return self.bank.load_boss(boss_id)
 
     def get_random_question(self, boss_id):
-        available = [q for q in self.get_questions_for_boss(boss_id) if q["id"] not in self.asked]
-        if not available:
+        recent = self._recent.setdefault(boss_id, deque(maxlen=self.recent_window))
+        deck = self._decks.get(boss_id)
+        if deck is None:
+            deck = self._decks[boss_id] = self._deal(boss_id, recent)
+        elif not deck and self.exhaustion_policy == RESHUFFLE:
+            deck = self._decks[boss_id] = self._deal(boss_id, recent)
+
+        if not deck:
             return None
-        q = random.choice(available)
+        q = deck.pop()
         self.asked.add(q["id"])
+        recent.append(q["id"])
         return q
+
+    def _deal(self, boss_id, recent):
+        questions = self.get_questions_for_boss(boss_id)
+        recent_ids = set(recent)
+        fresh = [q for q in questions if q["id"] not in recent_ids]
+        self.rng.shuffle(fresh)
+
+        # Bottom of the deck: most recently asked first, so it is drawn last
+        by_id = {q["id"]: q for q in questions}
+        stale = list(dict.fromkeys(qid for qid in reversed(recent) if qid in by_id))
+        return [by_id[qid] for qid in stale] + fresh
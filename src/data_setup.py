@@ -1,39 +1,76 @@
 import os
 import pygame
+from src.clip_cache import CLIPS
 from src.entities import Student, Professor
+from src.rules import STUDENTS, PROFESSORS
+
+# Clips played by CombatHandler; loaded up front so attacks never hit the disk
+STUDENT_ANIMATIONS = [("slash", "right"), ("spellcast", "right"), ("hurt", "up")]
+PROF_ANIMATIONS = [("hurt", "up"), ("spellcast", "down"), ("spellcast", "left")]
+
+# Sprite folder name -> (draw scale, extra clips) for every character
+SPRITES = {
+    "swi": (5, STUDENT_ANIMATIONS),
+    "kris": (5, STUDENT_ANIMATIONS),
+    "ken": (5, STUDENT_ANIMATIONS),
+    "sridhar": (6, PROF_ANIMATIONS),
+    "dioch": (6, PROF_ANIMATIONS),
+    "maiti": (6, PROF_ANIMATIONS),
+}
+IDLE_FRAMES = 2
+
+
+def sprite_clips(sprite_dir: str) -> list[tuple]:
+    """(character, folder, scale, frame_count) for every clip a character entity loads.
+
+    Idle and walk load a fixed frame count; the extra clips (frame_count None)
+    load the whole folder. tools/build_atlases.py packs exactly these frames.
+    """
+    clips = []
+    for name, (scale, extra) in SPRITES.items():
+        base = os.path.join(sprite_dir, name, "standard")
+        for action in ("idle", "walk"):
+            for d in ("left", "right", "front"):
+                clips.append((name, os.path.join(base, action, d), scale, IDLE_FRAMES))
+        for action, d in extra:
+            clips.append((name, os.path.join(base, action, d), scale, None))
+    return clips
+
+
+def sprite_stages(sprite_dir: str) -> list[tuple]:
+    """One (name, build, paths) AsyncLoader stage per clip any character loads.
+
+    Each stage warms CLIPS with one clip, so create_roster and create_profs
+    afterwards only hit the cache; paths are the files to decode ahead of time.
+    """
+    stages = []
+    for name, folder, scale, frame_count in sprite_clips(sprite_dir):
+        if not os.path.isdir(folder):
+            continue
+        label = " ".join([name, *folder.split(os.sep)[-2:]])
+        build = lambda folder=folder, scale=scale, frame_count=frame_count: CLIPS.get(folder, scale, frame_count)
+        stages.append((label, build, CLIPS.sources(folder, frame_count)))
+    return stages
 
 
 def create_roster(sprite_dir: str) -> list[Student]:
     roster = [
         Student(
-            "Cs Get Degrees", 100, 15,
-            "Hidden Ability: 25% chance to ignore a wrong answer on a dodge.",
-            "C's Really Do Get Degrees! You passed!",
-            sprite_folder=os.path.join(sprite_dir, "swi", "standard", "idle", "right"),
-            idle_frames=2,
-        ),
-        Student(
-            "4.0 Medallion", 100, 20,
-            "Special: 20% Critical Hit chance (The Curve) for 1.5x damage.",
-            "Academic Excellence!",
-            sprite_folder=os.path.join(sprite_dir, "kris", "standard", "idle", "right"),
-            idle_frames=2,
-        ),
-        Student(
-            "TA God", 100, 18,
-            "Special: Healing restores twice as much HP (Lab Snacks).",
-            "The lab is yours now!",
-            sprite_folder=os.path.join(sprite_dir, "ken", "standard", "idle", "right"),
-            idle_frames=2,
-        ),
+            stats["name"], stats["hp"], stats["attack"],
+            stats["ability_desc"],
+            stats["win_msg"],
+            sprite_folder=os.path.join(sprite_dir, stats["sprite"], "standard", "idle", "right"),
+            idle_frames=IDLE_FRAMES,
+        )
+        for stats in STUDENTS
     ]
 
     hover_paths = [
-        os.path.join(sprite_dir, "swi", "standard", "thrust", "left", "3.png"),
-        os.path.join(sprite_dir, "kris", "standard", "thrust", "left", "3.png"),
-        os.path.join(sprite_dir, "ken", "standard", "thrust", "left", "3.png"),
+        os.path.join(sprite_dir, stats["sprite"], "standard", "thrust", "left", "3.png")
+        for stats in STUDENTS
     ]
     for student, path in zip(roster, hover_paths):
+        student.preload_animations(STUDENT_ANIMATIONS)
         student.hover_path = path
         try:
             student.hover_sprite = pygame.image.load(path).convert_alpha()
@@ -44,26 +81,18 @@ def create_roster(sprite_dir: str) -> list[Student]:
 
 
 def create_profs(sprite_dir: str) -> list[Professor]:
-    return [
-        Professor(
-            "Prof Sridhar", 150, 35,
-            "Logic is not O(1). You fail Data Structures.",
-            "The Biz", bossId=1,
-            sprite_folder=os.path.join(sprite_dir, "sridhar", "standard", "idle", "left"),
-            idle_frames=2,
-        ),
-        Professor(
-            "Prof Diochnos", 200, 35,
-            "This language is not decidable\u2026 and neither are you. You fail Theory.\u201d",
-            "Turing Machine Terrace", bossId=2,
-            sprite_folder=os.path.join(sprite_dir, "dioch", "standard", "idle", "left"),
-            idle_frames=2,
-        ),
+    profs = [
         Professor(
-            "Prof Maiti", 275, 35,
-            "Your hash has collisions. You fail Cryptography.",
-            "Bitcoin Boulevard", bossId=3,
-            sprite_folder=os.path.join(sprite_dir, "maiti", "standard", "idle", "left"),
-            idle_frames=2,
-        ),
-    ]
\ No newline at end of file
+            stats["name"], stats["hp"], stats["attack"],
+            stats["loss_msg"],
+            stats["level_name"], bossId=stats["bossId"],
+            sprite_folder=os.path.join(sprite_dir, stats["sprite"], "standard", "idle", "left"),
+            idle_frames=IDLE_FRAMES,
+        )
+        for stats in PROFESSORS
+    ]
+
+    for prof in profs:
+        prof.preload_animations(PROF_ANIMATIONS)
+
+    return profs
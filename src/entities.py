@@ -1,7 +1,10 @@
 import pygame
-import random
 import math
 from src.constants import *
+from src.clip_cache import CLIPS
+from src.sim_clock import CLOCK
+from src import rules
+from src.profiler import profiled
 import os
 
 class AnimatedEntity:
@@ -18,7 +21,7 @@ class AnimatedEntity:
         self.state = IDLE
 
         self.frame_index = 0
-        self.last_update = pygame.time.get_ticks()
+        self.last_update = CLOCK.now()
         self.animation_speed = animation_speed
         self.offset_y = 0
         self.override_frames = None
@@ -39,6 +42,12 @@ class AnimatedEntity:
                 "right": {IDLE: [], WALK: [], ACTION: []},
                 "front": {IDLE: [], WALK: [], ACTION: []},
             }
+            # Baked outline shadows, same layout as all_frames
+            self.all_shadows = {
+                "left": {IDLE: (), WALK: (), ACTION: ()},
+                "right": {IDLE: (), WALK: (), ACTION: ()},
+                "front": {IDLE: (), WALK: (), ACTION: ()},
+            }
             # This handles all the heavy lifting of loading PNGs
             self.load_all_directions()
             
@@ -50,10 +59,11 @@ class AnimatedEntity:
                         self.all_frames[d][ACTION] = [pygame.Surface(size, pygame.SRCALPHA) for _ in range(action_frames)]
             
             self.current_frame = 0
-            self.last_frame_time = pygame.time.get_ticks()
+            self.last_frame_time = CLOCK.now()
 
         # Animation state systems
         self.override_frames = None
+        self.override_shadows = ()
         self.override_index = 0
         self.freeze_last_frame = False
         self.is_dead = False
@@ -65,32 +75,27 @@ class AnimatedEntity:
             path = os.path.join(self.base_path, "idle", d)
             if os.path.exists(path):
                 self.all_frames[d][IDLE] = self.load_frames(path, self.idle_frames)
+                self.all_shadows[d][IDLE] = CLIPS.shadows(path, self.scale, self.idle_frames)
             # Load Walk
             path = os.path.join(self.base_path, "walk", d)
             if os.path.exists(path):
                 self.all_frames[d][WALK] = self.load_frames(path, self.idle_frames) # assuming same frame count
+                self.all_shadows[d][WALK] = CLIPS.shadows(path, self.scale, self.idle_frames)
     def load_frames(self, folder, frame_count):
-        frames = []
-        for i in range(1, frame_count + 1):
-            img = pygame.image.load(os.path.join(folder, f"{i}.png")).convert_alpha()
-            img = pygame.transform.scale(img, (img.get_width()*self.scale, img.get_height()*self.scale))
-            frames.append(img)
-        return frames
+        return CLIPS.get(folder, self.scale, frame_count)
+
+    def preload_animations(self, clips):
+        CLIPS.preload(self.base_path, clips, self.scale)
 
+    @profiled()
     def play_animation(self, action_name, direction, frame_count, freeze_last=False):        # Example: idle/right → hurt/up
         base = os.path.dirname(os.path.dirname(self.base_sprite_folder))
         anim_path = os.path.join(base, action_name, direction)
-    
-        if os.path.exists(anim_path):
-            frames = []
-            files = sorted([f for f in os.listdir(anim_path) if f.endswith(".png")])
-            for f in files:
-                img = pygame.image.load(os.path.join(anim_path, f)).convert_alpha()
-                w, h = img.get_size()
-                img = pygame.transform.scale(img, (int(w * self.scale), int(h * self.scale)))
-                frames.append(img)
-            
+        frames = CLIPS.get(anim_path, self.scale)
+
+        if frames:
             self.override_frames = frames
+            self.override_shadows = CLIPS.shadows(anim_path, self.scale)
             self.override_index = 0
             self.freeze_last_frame = freeze_last
             
@@ -100,11 +105,11 @@ class AnimatedEntity:
             self.state = new_state
             self.frame_index = 0
             self.current_frame = 0  # ADD THIS LINE - reset frame index
-            self.last_update = pygame.time.get_ticks()
-            self.last_frame_time = pygame.time.get_ticks()  # ADD THIS TOO for consistency
+            self.last_update = CLOCK.now()
+            self.last_frame_time = CLOCK.now()  # ADD THIS TOO for consistency
 
     def update_animation(self):
-        now = pygame.time.get_ticks()
+        now = CLOCK.now()
 
         # If playing temporary animation
         if self.override_frames:
@@ -168,7 +173,7 @@ class AnimatedEntity:
 class Student(AnimatedEntity):
     def __init__(self, name, hp, attack_power, ability_desc, win_msg,
                  sprite_folder=None, idle_frames=2, action_frames=1,
-                 scale=5, animation_speed=300,numHeals=1):
+                 scale=5, animation_speed=300,numHeals=rules.NUM_HEALS):
         # Pass everything to AnimatedEntity
         super().__init__(name, hp, attack_power, GREEN,
                          sprite_folder=sprite_folder,
@@ -188,33 +193,13 @@ class Student(AnimatedEntity):
     def say(self, text):
         """Sets the text and starts a 2-second timer."""
         self.current_speech = text
-        self.speech_timer = pygame.time.get_ticks() + 2000 
+        self.speech_timer = CLOCK.now() + 2000 
 
     def calculate_attack(self):
-      #  self.set_state(ACTION)
-
-        roll = random.random()
-        crit_chance = 0.20 if self.name == "4.0 Medallion" else 0.05
-        
-        if roll < crit_chance:
-            if self.name == "4.0 Medallion":
-                msg = "CRITICAL HIT!\n(The Curve effect!)"
-                return int(self.attack_power * 1.5), msg, True
-            else:
-                msg = "CRITICAL HIT!"
-                return int(self.attack_power * 1.5), msg, False
-        elif roll < crit_chance + 0.15:
-            msg = "BLOCKED!\nPartial Hit."
-            return int(self.attack_power * 0.5), msg, False
-        return self.attack_power, "Direct Hit!", False
+        return rules.attack(self.name, self.attack_power)
 
     def get_heal_amount(self):
-      #  self.set_state(ACTION)
-
-        base = 35
-        if self.name == "TA God":
-            return int(base * 2), "SPECIAL:\nLab snacks! Double Healing!", True
-        return base, f"Studied hard.\nRestored {base} HP.", False
+        return rules.heal(self.name)
 
 class Professor(AnimatedEntity):
     def __init__(self, name, hp, attack_power, loss_msg, level_name, bossId,
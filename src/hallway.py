@@ -1,8 +1,13 @@
 import pygame
 from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WALK, IDLE, DOOR_VIEW, MENU
+from src.profiler import profiled
 
 
 class HallwayManager:
+    def __init__(self):
+        self._doors_in_view = []  # the doors given click rects last step
+
+    @profiled()
     def update(self, game) -> None:
         if game.victory_stage > 0:
             game.player.update()
@@ -14,11 +19,12 @@ class HallwayManager:
         else:
             game.player.set_state(IDLE)
 
-        self._clamp_and_track_camera(game)
+        self.track_camera(game)
+        self._update_doors(game)
         game.player.update()
 
     def _handle_movement(self, game) -> None:
-        keys = pygame.key.get_pressed()
+        keys = game.keys
         speed = 10
 
         if keys[pygame.K_a] or keys[pygame.K_LEFT]:
@@ -33,19 +39,16 @@ class HallwayManager:
             game.player.set_state(IDLE)
 
     def _handle_door_interact(self, game) -> None:
-        keys = pygame.key.get_pressed()
+        keys = game.keys
         if not keys[pygame.K_e]:
             return
-        for door in game.door_locations:
-            distance = abs(game.player_world_x - door["x"])
-            is_near = distance < game.door_interact_dist
-            is_unlocked = door["level"] <= game.current_level
-            if is_near and is_unlocked:
+        for door in game.doors.within(game.player_world_x, game.door_interact_dist):
+            if door["level"] <= game.current_level:
                 game.selected_door = door
                 game.state = DOOR_VIEW
                 break
 
-    def _clamp_and_track_camera(self, game) -> None:
+    def track_camera(self, game) -> None:
         max_world_x = game.door_locations[-1]["x"] + 300
         game.player_world_x = max(100, min(game.player_world_x, max_world_x))
 
@@ -55,4 +58,24 @@ class HallwayManager:
         game.player_screen_x = game.player_world_x - game.camera_x
 
         if game.player_world_x <= 100:
-            game.show_exit_prompt = True
\ No newline at end of file
+            game.show_exit_prompt = True
+
+    def _update_doors(self, game) -> None:
+        """Places click rects on the doors in view and plays the door sound on reaching an unlocked door."""
+        in_view = game.doors.overlapping(game.camera_x, game.camera_x + SCREEN_WIDTH)
+        # Doors that scrolled out keep no rect, or a click could still land on where they were
+        kept = {id(door) for door in in_view}
+        for door in self._doors_in_view:
+            if id(door) not in kept:
+                door["rect"] = None
+        for door in in_view:
+            door["rect"] = pygame.Rect(door["x"] - game.camera_x, game.door_y, game.door_w, game.door_h)
+        self._doors_in_view = in_view
+        doors_near = {
+            door["level"] for door in game.doors.within(game.player_world_x, int(SCREEN_WIDTH * 0.05))
+            if door["level"] <= game.current_level
+        }
+
+        if doors_near - game.doors_near:
+            game.sound.play_sfx("door", volume=0.5)
+        game.doors_near = doors_near
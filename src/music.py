@@ -0,0 +1,92 @@
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from src.profiler import PROFILER
+
+# Two channels so one track can fade in while the other fades out
+MUSIC_CHANNELS = (4, 5)
+CROSSFADE_MS = 1000
+
+
+@functools.lru_cache(maxsize=None)
+def prefer_ogg(path: str) -> str:
+    """The .ogg next to a music file when there is one; it is a fraction of the WAV's size."""
+    ogg = os.path.splitext(path)[0] + ".ogg"
+    return ogg if os.path.exists(ogg) else path
+
+
+class MusicPlayer:
+    """Background music, decoded off the main thread and crossfaded between two channels.
+
+    pygame.mixer.music can only hold one stream, and loading it blocks the
+    frame that changes track. Tracks here are decoded whole on an executor
+    instead: prefetch() starts that early (the door view prefetches its
+    boss's theme), and play() never waits. A track that is not decoded yet
+    starts from update() as soon as it is, fading in on the free channel
+    while the current one fades out.
+
+    Decoded PCM is large, about 10 MB a minute at 44.1 kHz 16-bit stereo,
+    so only the current track and the one prefetched next are kept; a
+    track fading out stays alive on its channel until the fade ends.
+    """
+
+    def __init__(self, decode, executor=None):
+        self.decode = decode  # path -> Sound | None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="music")
+        self.channels = [pygame.mixer.Channel(i) for i in MUSIC_CHANNELS]
+        self.current = None  # path of the track playing or about to
+        self._active = 0  # index into channels of the current track
+        self._pending = None  # (path, volume, fade_ms) waiting on its decode
+        self._tracks = {}  # path -> Future[Sound | None]; the current track and the next
+
+    def prefetch(self, path: str) -> None:
+        path = prefer_ogg(path)
+        if path not in self._tracks:
+            self._keep(self.current, path)
+            self._tracks[path] = self.executor.submit(self.decode, path)
+
+    def play(self, path: str, volume: float = 0.1, fade_ms: int = CROSSFADE_MS) -> None:
+        path = prefer_ogg(path)
+        if path == self.current:
+            return
+        self.current = path
+        self.prefetch(path)
+        self._keep(path)
+        self._pending = (path, volume, fade_ms)
+        self.update()
+
+    def stop(self, fade_ms: int = 500) -> None:
+        self.current = None
+        self._pending = None
+        for channel in self.channels:
+            if channel.get_busy():
+                channel.fadeout(fade_ms)
+
+    def update(self) -> None:
+        """Starts a pending track once it has been decoded; cheap to call every step."""
+        if self._pending is None:
+            return
+        path, volume, fade_ms = self._pending
+        future = self._tracks[path]
+        if not future.done():
+            return
+        self._pending = None
+        sound = future.result()
+        if sound is None:
+            return
+
+        with PROFILER.scope("MusicPlayer.crossfade", path):
+            old = self.channels[self._active]
+            self._active = 1 - self._active
+            if old.get_busy():
+                old.fadeout(fade_ms)
+            self.channels[self._active].set_volume(volume)
+            self.channels[self._active].play(sound, loops=-1, fade_ms=fade_ms)
+
+    def _keep(self, *paths) -> None:
+        """Drops every decoded or decoding track but these."""
+        for path in [p for p in self._tracks if p not in paths]:
+            self._tracks.pop(path).cancel()
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import struct
+
+import pygame
+
+from src.profiler import PROFILER
+
+_ENTRY = struct.Struct("<4sII4s")  # magic, width, height, byte format
+_MAGIC = b"CADP"
+# Part of every key; bump it when a build function changes in a way its mode does not capture
+CACHE_VERSION = 2
+
+
+class PixelCache:
+    """On-disk cache of scaled, converted pixel buffers.
+
+    Scaling a full-screen background or a 5x sprite gives the same pixels on
+    every launch at a given display size, so the result is stored as raw
+    bytes under a key of (source file hash, target, mode, display pixel
+    format, CACHE_VERSION) and read back with pygame.image.frombuffer. A
+    mode names the build and carries every parameter baked into its pixels,
+    e.g. ("shadow", offset, color), so changing one misses instead of serving
+    stale pixels. Source hashes are remembered by mtime and size, so an
+    unchanged file is not re-read; an edited file gets a new hash and its old
+    entries are deleted, as is everything when CACHE_VERSION changes.
+    """
+
+    def __init__(self, cache_dir: str, screen: pygame.Surface):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self.pixel_format = (screen.get_bitsize(), *screen.get_masks())
+        self._sources = self._read_index()  # path -> [mtime_ns, size, sha1]
+        self._dirty = False
+        try:
+            entries = os.listdir(cache_dir)
+        except OSError:
+            entries = []
+        # Hash prefixes with at least one cached buffer
+        self._cached = {name.split("-", 1)[0] for name in entries if name.endswith(".px")}
+
+    def get(self, path: str, target, mode, build, alpha: bool = False) -> pygame.Surface:
+        """Cached result of build() for this source, target and mode; build() runs on a miss."""
+        try:
+            source = self._source_hash(path)
+        except OSError:
+            return build()
+
+        key = repr((target, mode, alpha, self.pixel_format, CACHE_VERSION)).encode("utf-8")
+        entry = os.path.join(self.cache_dir, f"{source}-{hashlib.sha1(key).hexdigest()[:16]}.px")
+        with PROFILER.scope("PixelCache.get", path):
+            surf = self._read(entry, alpha)
+            if surf is None:
+                surf = build()
+                self._write(entry, surf, alpha)
+                self._cached.add(source)
+        return surf
+
+    def covers(self, path: str) -> bool:
+        """True when the source has cached buffers, so decoding it up front is probably wasted."""
+        try:
+            return self._source_hash(path) in self._cached
+        except OSError:
+            return False
+
+    def flush(self) -> None:
+        if not self._dirty:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.index_path, "w") as f:
+                json.dump({"version": CACHE_VERSION, "sources": self._sources}, f)
+            self._dirty = False
+        except OSError as e:
+            print(f"Error writing pixel cache index: {e}")
+
+    def _source_hash(self, path: str) -> str:
+        st = os.stat(path)
+        known = self._sources.get(path)
+        if known and known[0] == st.st_mtime_ns and known[1] == st.st_size:
+            return known[2]
+
+        with open(path, "rb") as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+        if known and known[2] != digest:
+            self._drop(known[2])
+        self._sources[path] = [st.st_mtime_ns, st.st_size, digest]
+        self._dirty = True
+        return digest
+
+    def _drop(self, source: str) -> None:
+        if source not in self._cached:
+            return
+        self._cached.discard(source)
+        for name in os.listdir(self.cache_dir):
+            if name.startswith(source + "-"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+
+    def _read(self, entry: str, alpha: bool) -> pygame.Surface | None:
+        try:
+            with open(entry, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        if len(data) < _ENTRY.size:
+            return None
+        magic, w, h, fmt = _ENTRY.unpack_from(data)
+        fmt = fmt.decode("ascii")
+        if magic != _MAGIC or len(data) - _ENTRY.size != w * h * len(fmt):
+            return None
+        surf = pygame.image.frombuffer(memoryview(data)[_ENTRY.size:], (w, h), fmt)
+        # Converting copies out of the file buffer into display format
+        return surf.convert_alpha() if alpha else surf.convert()
+
+    def _write(self, entry: str, surf: pygame.Surface, alpha: bool) -> None:
+        fmt = "RGBA" if alpha else "RGBX"
+        w, h = surf.get_size()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp = entry + ".tmp"
+            with open(tmp, "wb") as f:
+                f.write(_ENTRY.pack(_MAGIC, w, h, fmt.encode("ascii")))
+                f.write(pygame.image.tobytes(surf, fmt))
+            os.replace(tmp, entry)
+        except OSError as e:
+            print(f"Error writing pixel cache entry: {e}")
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path) as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get("version") == CACHE_VERSION:
+            return index["sources"]
+        # Entries from another version can never be hit again
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".px"):
+                try:
+                    os.remove(os.path.join(self.cache_dir, name))
+                except OSError:
+                    pass
+        return {}
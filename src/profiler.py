@@ -0,0 +1,235 @@
+import json
+import threading
+import time
+from collections import deque
+from functools import wraps
+
+import pygame
+
+from src.alloc_counter import SurfaceAllocCounter
+
+HISTORY_FRAMES = 240  # frames kept for the graph and percentiles
+HITCH_MS = 1000 / 30  # frames slower than this land in the hitch log
+GRAPH_MAX_MS = 50
+OVERLAY_REFRESH_MS = 100
+TRACE_EVENTS = 500_000  # oldest trace events are dropped past this
+
+
+class _Scope:
+    __slots__ = ("profiler", "name", "detail", "start")
+
+    def __init__(self, profiler, name, detail):
+        self.profiler = profiler
+        self.name = name
+        self.detail = detail
+
+    def __enter__(self):
+        self.start = self.profiler._enter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler._exit(self.name, self.start, self.detail)
+        return False
+
+
+class _NullScope:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Profiler:
+    """Frame timing, named scopes and surface allocation counts, off unless started.
+
+    Code marks hot paths with ``with PROFILER.scope("name"):`` or the
+    @profiled decorator; both cost one attribute check while the profiler
+    is stopped. While running, every scope becomes a Chrome trace event
+    (any thread), and main-thread scopes also add their self time (minus
+    nested scopes) to this frame's per-scope totals. end_frame() closes a
+    frame: it records the frame time and surface allocations, logs a hitch
+    naming the slowest scope if the frame ran long, and feeds the overlay.
+    """
+
+    def __init__(self):
+        self.active = False
+        self.overlay = False
+        self.frame_ms = deque(maxlen=HISTORY_FRAMES)
+        self.allocs = deque(maxlen=HISTORY_FRAMES)
+        self.hitches = deque(maxlen=6)  # (seconds since start, frame ms, [(scope, ms), ...])
+        self.scope_ms = {}  # scope -> smoothed self time per frame
+        self.events = deque(maxlen=TRACE_EVENTS)  # (name, start, end, thread id, detail)
+        self.counters = deque(maxlen=TRACE_EVENTS)  # (time, frame ms, allocs)
+        self.counter = SurfaceAllocCounter()
+        self._main = threading.get_ident()
+        self._origin = time.perf_counter()
+        self._frame_start = None
+        self._frame = {}  # scope -> self ms this frame
+        self._stack = []  # nested child time per open main-thread scope
+        self._panel = None
+        self._panel_built = 0.0
+
+    def start(self) -> None:
+        if self.active:
+            return
+        self.active = True
+        self.counter.install()
+        self._frame_start = time.perf_counter()
+
+    def stop(self) -> None:
+        self.active = False
+        self.overlay = False
+        self.counter.uninstall()
+        self._stack.clear()
+        self._frame.clear()
+
+    def toggle_overlay(self) -> None:
+        self.overlay = not self.overlay
+        if self.overlay:
+            self.start()
+
+    def scope(self, name: str, detail: str | None = None):
+        """Context manager timing a block; detail shows up in the trace event's args."""
+        if not self.active:
+            return _NULL_SCOPE
+        return _Scope(self, name, detail)
+
+    def _enter(self) -> float:
+        if threading.get_ident() == self._main:
+            self._stack.append(0.0)
+        return time.perf_counter()
+
+    def _exit(self, name: str, start: float, detail=None) -> None:
+        end = time.perf_counter()
+        tid = threading.get_ident()
+        self.events.append((name, start, end, tid, detail))
+        if tid != self._main or not self._stack:
+            return
+        ms = (end - start) * 1000
+        own = ms - self._stack.pop()
+        if self._stack:
+            self._stack[-1] += ms
+        self._frame[name] = self._frame.get(name, 0.0) + own
+
+    def end_frame(self) -> None:
+        if not self.active:
+            return
+        now = time.perf_counter()
+        ms = (now - self._frame_start) * 1000
+        self._frame_start = now
+        allocs = self.counter.reset()
+        self.frame_ms.append(ms)
+        self.allocs.append(allocs)
+        self.counters.append((now, ms, allocs))
+
+        frame, self._frame = self._frame, {}
+        if ms > HITCH_MS and len(self.frame_ms) > 1:
+            worst = sorted(frame.items(), key=lambda item: item[1], reverse=True)[:2]
+            self.hitches.append((now - self._origin, ms, worst))
+        for name in self.scope_ms.keys() | frame.keys():
+            self.scope_ms[name] = self.scope_ms.get(name, 0.0) * 0.9 + frame.get(name, 0.0) * 0.1
+
+    def draw(self, screen: pygame.Surface, font: pygame.font.Font) -> None:
+        """Blits the overlay; its panel is rebuilt a few times a second, not every frame."""
+        now = time.perf_counter()
+        if self._panel is None or (now - self._panel_built) * 1000 >= OVERLAY_REFRESH_MS:
+            before = self.counter.count
+            self._panel = self._build_panel(font)
+            self.counter.count = before  # the overlay's own surfaces are not the game's
+            self._panel_built = now
+        screen.blit(self._panel, (10, 10))
+
+    def _build_panel(self, font) -> pygame.Surface:
+        line_h = font.get_linesize()
+        graph_h = 80
+        scopes = sorted(self.scope_ms.items(), key=lambda item: item[1], reverse=True)[:8]
+        width = HISTORY_FRAMES * 2 + 20
+        height = 10 + graph_h + 10 + line_h * (2 + len(scopes) + 1 + len(self.hitches)) + 10
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+
+        # Frame-time graph, with 60 and 30 fps guides
+        scale = graph_h / GRAPH_MAX_MS
+        for ms, color in ((1000 / 60, (0, 160, 0)), (HITCH_MS, (160, 0, 0))):
+            y = 10 + graph_h - int(ms * scale)
+            pygame.draw.line(panel, color, (10, y), (width - 10, y))
+        for i, ms in enumerate(self.frame_ms):
+            h = min(graph_h, int(ms * scale))
+            color = (230, 80, 80) if ms > HITCH_MS else (230, 230, 230)
+            pygame.draw.rect(panel, color, (10 + i * 2, 10 + graph_h - h, 2, h))
+
+        y = 20 + graph_h
+        times = sorted(self.frame_ms)
+        if times:
+            p50, p99 = times[len(times) // 2], times[min(len(times) - 1, int(len(times) * 0.99))]
+            text = f"frame p50 {p50:.1f} ms  p99 {p99:.1f} ms  ({1000 / p50 if p50 else 0:.0f} fps)"
+        else:
+            text = "frame: no data yet"
+        panel.blit(font.render(text, True, (255, 255, 255)), (10, y))
+        y += line_h
+        allocs = sum(self.allocs) / len(self.allocs) if self.allocs else 0
+        panel.blit(font.render(f"surface allocs/frame {allocs:.1f}", True, (255, 255, 255)), (10, y))
+        y += line_h
+
+        bar_w = width - 20 - 220
+        for name, ms in scopes:
+            pygame.draw.rect(panel, (90, 140, 230), (230, y + 3, min(bar_w, int(bar_w * ms / 16.7)), line_h - 6))
+            panel.blit(font.render(f"{ms:5.2f} {name}"[:36], True, (255, 255, 255)), (10, y))
+            y += line_h
+
+        panel.blit(font.render("hitches (F4 saves a trace)", True, (255, 200, 0)), (10, y))
+        y += line_h
+        for at, ms, worst in reversed(self.hitches):
+            blame = ", ".join(f"{name} {scope_ms:.1f}" for name, scope_ms in worst)
+            panel.blit(font.render(f"{at:7.1f}s {ms:5.1f} ms  {blame}", True, (255, 200, 0)), (10, y))
+            y += line_h
+        return panel
+
+    def export(self, path: str) -> int:
+        """Writes recorded scopes and frame counters as Chrome trace-event JSON; returns the event count."""
+        def us(t):
+            return (t - self._origin) * 1_000_000
+
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        thread_names[self._main] = "main"
+        events = [
+            {"name": "thread_name", "ph": "M", "pid": 1, "tid": tid, "args": {"name": name}}
+            for tid, name in thread_names.items()
+        ]
+        for name, start, end, tid, detail in list(self.events):
+            event = {"name": name, "ph": "X", "pid": 1, "tid": tid, "ts": us(start), "dur": us(end) - us(start)}
+            if detail is not None:
+                event["args"] = {"detail": detail}
+            events.append(event)
+        for at, ms, allocs in list(self.counters):
+            events.append({"name": "frame", "ph": "C", "pid": 1, "tid": self._main, "ts": us(at),
+                           "args": {"ms": round(ms, 3), "surface allocs": allocs}})
+
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return len(events)
+
+
+PROFILER = Profiler()
+
+
+def profiled(name: str | None = None):
+    """Decorator: times every call as a PROFILER scope named after the function."""
+    def wrap(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            if not PROFILER.active:
+                return fn(*args, **kwargs)
+            start = PROFILER._enter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                PROFILER._exit(label, start)
+        return timed
+    return wrap
@@ -1,16 +1,73 @@
 import math
 import random
+from collections import OrderedDict
 import pygame
 from src.constants import *
-from src.ui import Button, draw_text, draw_speech_bubble, wrap_text
+from src.ui import CROSS_OUTLINE, Button, UILayer, draw_text, draw_speech_bubble, render_text, wrap_text
+from src.clip_cache import SHADOW_OFFSET
+from src.background_manager import battle_background, loss_background, win_background
+from src.sim_clock import CLOCK
+from src.profiler import profiled
+
+# Screen-wide hallway slices kept pre-rendered; two are on screen at a time,
+# the rest cover walking back and a door switching to its close-up
+HALLWAY_TILE_RING = 4
 
 class Renderer: #DRAW FCTS
+    def __init__(self):
+        # Prebuilt static surfaces, rebuilt only when the screen size or asset set changes
+        self._layers = {}
+        self._layers_key = None
+        self._answers_for = None
+        # Cosmetic randomness stays off the global generator that combat rolls use
+        self._shake = random.Random()
+
+    def invalidate_layers(self):
+        self._layers.clear()
+        self._layers_key = None
+
+    def _layer(self, game, key, build):
+        layers_key = (game.screen.get_size(), id(game.assets))
+        if layers_key != self._layers_key:
+            self._layers.clear()
+            self._layers_key = layers_key
+
+        surf = self._layers.get(key)
+        if surf is None:
+            surf = build()
+            self._layers[key] = surf
+        return surf
+
+    def _overlay(self, game, alpha: int) -> pygame.Surface:
+        def build():
+            s = pygame.Surface(game.screen.get_size())
+            s.fill(BLACK)
+            s.set_alpha(alpha)
+            return s
+        return self._layer(game, ("overlay", alpha), build)
+
+    def _dimmed_background(self, game, name: str, alpha: int) -> pygame.Surface:
+        def build(background):
+            s = background.copy()
+            s.blit(self._overlay(game, alpha), (0, 0))
+            return s
+        # Full-screen, so it is kept (and evicted) under the backgrounds' memory budget
+        return game.assets.backgrounds.derived(name, ("dimmed", alpha), build)
+
     def draw_transparent_rect(self, surface: pygame.Surface, color, rect: pygame.Rect, alpha: int):
-        s = pygame.Surface((rect.w, rect.h), pygame.SRCALPHA)
-        r, g, b = color
-        s.fill((r, g, b, alpha))
+        key = ("rect", rect.size, tuple(color), alpha)
+        s = self._layers.get(key)
+        if s is None:
+            s = pygame.Surface((rect.w, rect.h), pygame.SRCALPHA)
+            r, g, b = color
+            s.fill((r, g, b, alpha))
+            self._layers[key] = s
         surface.blit(s, (rect.x, rect.y))
 
+    def _scaled_sprite(self, game, frame: pygame.Surface, size) -> pygame.Surface:
+        return self._layer(game, ("sprite", id(frame), size),
+                           lambda: pygame.transform.smoothscale(frame, size))
+
     def draw_character_preview(self, game, student, rect: pygame.Rect, facing: str = "front"):
         frame = None
         if hasattr(student, "all_frames"):
@@ -32,101 +89,305 @@ class Renderer: #DRAW FCTS
         scale = min(max_w / fw, max_h / fh)
         tw = max(1, int(fw * scale))
         th = max(1, int(fh * scale))
-        sprite = pygame.transform.smoothscale(frame, (tw, th))
+        sprite = self._scaled_sprite(game, frame, (tw, th))
         game.screen.blit(sprite, (rect.x + (rect.w - tw) // 2, rect.y + (rect.h - th) // 2))
 
     def draw_character_with_shadow(self, game, character, x: int, y: int):
-        shadow_offset = 5
-
         if character.override_frames:
-            if character.override_index >= len(character.override_frames):
-                character.override_index = len(character.override_frames) - 1
-            frame = character.override_frames[character.override_index]
+            frames = character.override_frames
+            shadows = character.override_shadows
+            index = min(character.override_index, len(frames) - 1)
         else:
             cur = character.all_frames[character.facing]
             frames = cur.get(character.state, cur[IDLE])
-            if not frames or character.current_frame >= len(frames):
-                character.current_frame = 0
-                if not frames:
-                    frames = cur[IDLE]
+            shadows = character.all_shadows[character.facing].get(character.state, ())
+            if not frames:
+                frames = cur[IDLE]
+                shadows = character.all_shadows[character.facing][IDLE]
             if len(frames) == 0:
                 return
-            frame = frames[character.current_frame]
-
-        shadow = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
-        shadow.fill((0, 0, 0, 0))
-        shadow_color = (0, 0, 0, 150)
-        for dx, dy in [(-shadow_offset, 0), (shadow_offset, 0),
-                       (0, -shadow_offset), (0, shadow_offset),
-                       (-shadow_offset, -shadow_offset), (shadow_offset, shadow_offset),
-                       (-shadow_offset, shadow_offset), (shadow_offset, -shadow_offset)]:
-            shadow.blit(frame, (0, 0))
-            shadow.fill(shadow_color, special_flags=pygame.BLEND_RGBA_MULT)
-            game.screen.blit(shadow, (x + dx, y + dy))
-        game.screen.blit(frame, (x, y))
-
-    def draw_menu(self, game):
-        import os
-        from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
-        assets = game.assets
-        screen = game.screen
-        font = assets.fonts["normal"]
+            index = character.current_frame if character.current_frame < len(frames) else 0
 
-        screen.blit(assets.background_assets["title"], (0, 0))
+        if index < len(shadows):
+            game.screen.blit(shadows[index], (x - SHADOW_OFFSET, y - SHADOW_OFFSET))
+        game.screen.blit(frames[index], (x, y))
 
-        if game.last_music_state != MENU:
-            game.sound.clear_music()
-            intro_file = os.path.join(game.sfx_dir, "title_screen.wav")
-            game.sound.play_music(intro_file)
-            game.last_music_state = MENU
+    def build_ui(self, game):
+        """Creates every screen's buttons once; update_ui moves and restyles them."""
+        font = game.assets.fonts["normal"]
+        game.ui = {name: UILayer() for name in (MENU, EXIT_PROMPT, DOOR_VIEW, BATTLE, ANSWERS, TOTAL_WIN)}
+        self._answers_for = None
 
         side_margin = 0.025 * SCREEN_WIDTH
-        help_w = 0.026 * SCREEN_WIDTH
         quit_w = 0.063 * SCREEN_WIDTH
         help_x = side_margin
         quit_x = SCREEN_WIDTH - side_margin - quit_w
 
-        game.btn_help = Button(
+        menu = game.ui[MENU]
+        game.btn_help = menu.add(Button(
             "?",
             int(help_x),
             SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.08),
             int(SCREEN_HEIGHT * 0.05),
             int(SCREEN_HEIGHT * 0.05),
             OU_CREAM,
-        )
-
-        current_ticks = pygame.time.get_ticks()
-        wiggle_x = 0
-        if (current_ticks % 2500) < 500:
-            wiggle_x = math.sin(current_ticks * 0.05) * 6
-
-        btn_x = SCREEN_WIDTH // 2 - 125 + wiggle_x
-        game.btn_start = Button(
+        ))
+        game.btn_start = menu.add(Button(
             "BEGIN SEMESTER",
-            btn_x,
+            SCREEN_WIDTH // 2 - 125,
             SCREEN_HEIGHT // 2 + int(SCREEN_HEIGHT * 0.07),
             int(SCREEN_WIDTH * 0.16),
             int(SCREEN_HEIGHT * 0.06),
             OU_CREAM,
-        )
-
-        game.btn_quit = Button(
+        ))
+        game.btn_quit = menu.add(Button(
             "QUIT",
             int(quit_x),
             SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.08),
             int(quit_w),
             int(SCREEN_HEIGHT * 0.05),
             OU_CREAM,
-        )
+        ))
+
+        btn_w = int(SCREEN_WIDTH * 0.07)
+        btn_h = int(SCREEN_HEIGHT * 0.07)
+        gap = int(SCREEN_WIDTH * 0.02)
+        total_w = btn_w * 2 + gap
+        start_x = SCREEN_WIDTH // 2 - total_w // 2
+        btn_y = SCREEN_HEIGHT // 2 + int(SCREEN_HEIGHT * 0.05)
+        prompt = game.ui[EXIT_PROMPT]
+        game.btn_exit_yes = prompt.add(Button("YES", start_x, btn_y, btn_w, btn_h, OU_CREAM))
+        game.btn_exit_no = prompt.add(Button("NO", start_x + btn_w + gap, btn_y, btn_w, btn_h, OU_CREAM))
+
+        door = game.ui[DOOR_VIEW]
+        game.btn_confirm = door.add(Button("CHALLENGE", SCREEN_WIDTH // 2 - 225, SCREEN_HEIGHT - 150, 200, 60, OU_CREAM))
+        game.btn_back = door.add(Button("BACK", SCREEN_WIDTH // 2 + 10, SCREEN_HEIGHT - 150, 200, 60, OU_CREAM))
+
+        btn_width = int(SCREEN_WIDTH * 0.16)
+        btn_height = int(SCREEN_HEIGHT * 0.055)
+        btn_spacing = int(SCREEN_WIDTH * 0.015)
+        btn_margin = int(SCREEN_WIDTH * 0.05)
+        battle = game.ui[BATTLE]
+        game.btn_atk = battle.add(Button(
+            "ATTACK",
+            SCREEN_WIDTH - btn_margin - 2 * btn_width - btn_spacing,
+            SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.105),
+            btn_width, btn_height,
+            (255, 0, 0), GOLD,
+        ))
+        game.btn_heal = battle.add(Button(
+            "HEAL",
+            SCREEN_WIDTH - btn_margin - btn_width,
+            SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.105),
+            btn_width, btn_height,
+            GREEN,
+        ))
+
+        btn_w, btn_h = 300, 60
+        game.btn_exit_win = game.ui[TOTAL_WIN].add(Button(
+            "RETURN TO TITLE",
+            SCREEN_WIDTH // 2 - btn_w // 2,
+            SCREEN_HEIGHT - 100,
+            btn_w, btn_h, OU_CREAM,
+        ))
+
+        for layer in game.ui.values():
+            layer.layout(font)
+
+    @profiled()
+    def update_ui(self, game):
+        """Per-step widget state: hover selection, button wiggles and locks, answer buttons.
+
+        Runs in Game.update so the draw_* methods below only read game state.
+        """
+        if game.state == MENU:
+            self._wiggle(game.btn_start, SCREEN_WIDTH // 2 - 125)
+        elif game.state == SELECT:
+            game.selected_idx = self._hovered_card(game)
+        elif game.state == DOOR_VIEW:
+            self._wiggle(game.btn_confirm, SCREEN_WIDTH // 2 - 225)
+        elif game.state == BATTLE:
+            if game.show_question:
+                self._sync_answers(game, game.assets.fonts["normal"])
+            else:
+                is_locked = (CLOCK.now() - game.battle_start_time) < 4500
+                game.btn_atk.disabled = is_locked
+                game.btn_atk.set_hover_color((128, 128, 128) if is_locked else GOLD)
+                game.btn_heal.disabled = (game.player.numHeals <= 0) or (game.player.hp >= game.player.max_hp)
+
+        # Clicks are hit-tested before the next draw, which may be skipped
+        for layer in game.ui.values():
+            layer.reindex()
+
+    def _select_cards(self):
+        card_w, card_h = int(SCREEN_WIDTH * 0.18), int(SCREEN_HEIGHT * 0.45)
+        gap = (SCREEN_WIDTH - (3 * card_w)) // 4
+        return card_w, card_h, gap
+
+    def _hovered_card(self, game):
+        card_w, card_h, gap = self._select_cards()
+        for i in range(len(game.roster)):
+            rect = pygame.Rect(gap + i * (card_w + gap), int(SCREEN_HEIGHT * 0.35), card_w, card_h)
+            if rect.collidepoint(game.mouse_pos):
+                return i
+        return None
+
+    def _sync_answers(self, game, font):
+        # Answer buttons only change when a new question comes up
+        if self._answers_for is game.current_q:
+            return
+        self._answers_for = game.current_q
+
+        layer = game.ui[ANSWERS]
+        layer.clear()
+        game.answer_btns = []
+
+        btn_width = int(SCREEN_WIDTH * 0.16)
+        btn_spacing = int(SCREEN_WIDTH * 0.015)
+        num_choices = len(game.current_q["choices"])
+        total_width = (num_choices * btn_width) + ((num_choices - 1) * btn_spacing)
+        start_x = (SCREEN_WIDTH - total_width) / 2
+        for i, opt in enumerate(game.current_q["choices"]):
+            x = start_x + (i * (btn_width + btn_spacing))
+            btn = Button(
+                opt,
+                int(x),
+                SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.11),
+                btn_width,
+                int(SCREEN_HEIGHT * 0.12),
+                (212, 175, 55, 120),
+                (212, 175, 55),
+            )
+            game.answer_btns.append(layer.add(btn))
+        layer.layout(font)
+
+    def _battle_backdrop(self, game, boss_id: int) -> pygame.Surface:
+        def build(background=None):
+            assets = game.assets
+            screen_w, screen_h = game.screen.get_size()
+            backdrop = pygame.Surface((screen_w, screen_h))
+            backdrop.fill(BLACK)
+            if background is not None:
+                backdrop.blit(background, (0, 0))
+                backdrop.blit(self._overlay(game, 100), (0, 0))
+
+            floor_height = int(screen_h * 0.3)
+            floor_y = screen_h - floor_height
+            floor_tex = assets.floor_textures.get(boss_id)
+            if floor_tex:
+                try:
+                    scaled_floor = pygame.transform.scale(floor_tex, (screen_w, floor_height))
+                    backdrop.blit(scaled_floor, (0, floor_y + screen_h * 0.03))
+                except Exception:
+                    pass
+            return backdrop
+        name = battle_background(boss_id)
+        if name in game.assets.backgrounds.sources:
+            # Kept (and evicted) under the backgrounds' memory budget, with the arena it is built on
+            return game.assets.backgrounds.derived(name, "backdrop", build)
+        return self._layer(game, ("battle", name), build)
+
+    def _hp_box(self, game, size, color) -> pygame.Surface:
+        def build():
+            box_surf = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(box_surf, color, (0, 0, *size), border_radius=12)
+            return box_surf
+        return self._layer(game, ("hp_box", size, color), build)
+
+    def _notebook_paper(self, game, size) -> pygame.Surface:
+        def build():
+            bg_img = pygame.transform.smoothscale(game.assets.notebook_paper_img, size)
+            paper_surface = pygame.Surface(size, pygame.SRCALPHA)
+            paper_surface.blit(bg_img, (0, 0))
+            mask_surface = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.rect(mask_surface, (255, 255, 255, 255), mask_surface.get_rect(), border_radius=15)
+            paper_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+            return paper_surface
+        return self._layer(game, ("paper", size), build)
+
+    def _flash(self, game) -> pygame.Surface:
+        def build():
+            flash_surf = pygame.Surface(game.screen.get_size())
+            flash_surf.fill(WHITE)
+            flash_surf.set_alpha(100)
+            return flash_surf
+        return self._layer(game, "flash", build)
+
+    def static_scene_key(self, game):
+        """Identifies a screen whose backdrop stays put, or None when the whole frame changes."""
+        if game.fading:
+            return None
+        if game.state == MENU:
+            return (MENU, game.show_how_to_play)
+        if game.state == DOOR_VIEW:
+            return (DOOR_VIEW, game.selected_door["level"])
+        if game.state == WIN:
+            return (WIN, game.player.name if game.player else None)
+        if game.state == LOSS:
+            return (LOSS, game.boss.bossId)
+        if game.state == TOTAL_WIN:
+            return (TOTAL_WIN,)
+        return None
+
+    def draw_backdrop(self, game):
+        """Draws the static part of a static_scene_key screen, i.e. all but its live widgets."""
+        if game.state == MENU:
+            self.draw_menu(game, widgets=game.show_how_to_play)
+        elif game.state == DOOR_VIEW:
+            self.draw_door_view(game, widgets=False)
+        elif game.state == WIN:
+            self.draw_win(game)
+        elif game.state == LOSS:
+            self.draw_loss(game)
+        elif game.state == TOTAL_WIN:
+            self.draw_total_win(game, widgets=False)
+
+    def live_widgets(self, game):
+        """Widgets drawn over a static backdrop each frame, already positioned."""
+        if game.state == MENU and not game.show_how_to_play:
+            return game.ui[MENU]
+        if game.state == DOOR_VIEW:
+            return game.ui[DOOR_VIEW]
+        if game.state == TOTAL_WIN:
+            return game.ui[TOTAL_WIN]
+        return None
+
+    def _wiggle(self, button, base_x):
+        # Attention wiggle: shake for the first 500ms of every 2.5s
+        current_ticks = CLOCK.now()
+        wiggle_x = 0
+        if (current_ticks % 2500) < 500:
+            wiggle_x = math.sin(current_ticks * 0.05) * 6
+        button.move_to(base_x + wiggle_x)
+
+    @profiled()
+    def draw_loading(self, game):
+        screen = game.screen
+        loader = game.loader
+        bar_w, bar_h = int(SCREEN_WIDTH * 0.4), int(SCREEN_HEIGHT * 0.03)
+        bar = pygame.Rect(SCREEN_WIDTH // 2 - bar_w // 2, SCREEN_HEIGHT // 2, bar_w, bar_h)
+
+        draw_text(screen, "LOADING...", SCREEN_WIDTH // 2, bar.top - int(SCREEN_HEIGHT * 0.06),
+                  game.assets.fonts["medium"], OU_CREAM, True)
+        pygame.draw.rect(screen, OU_CRIMSON, (bar.x, bar.y, int(bar_w * loader.progress), bar_h))
+        pygame.draw.rect(screen, OU_CREAM, bar, 2)
+        if loader.current:
+            draw_text(screen, loader.current, SCREEN_WIDTH // 2, bar.bottom + int(SCREEN_HEIGHT * 0.03),
+                      game.assets.fonts["small"], GRAY if loader.done else WHITE, True)
+
+    @profiled()
+    def draw_menu(self, game, widgets=True):
+        assets = game.assets
+        screen = game.screen
+        font = assets.fonts["normal"]
 
-        game.btn_start.draw(screen, font)
-        game.btn_help.draw(screen, font)
-        game.btn_quit.draw(screen, font)
+        screen.blit(assets.background("title"), (0, 0))
+
+        if widgets:
+            game.ui[MENU].draw(screen, font, game.mouse_pos)
 
         if game.show_how_to_play:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 220))
-            screen.blit(overlay, (0, 0))
+            screen.blit(self._overlay(game, 220), (0, 0))
 
             scroll_x = SCREEN_WIDTH // 2 - assets.scroll_bg.get_width() // 2
             scroll_y = SCREEN_HEIGHT // 4
@@ -156,40 +417,23 @@ class Renderer: #DRAW FCTS
                 )
             draw_text(screen, "(Click anywhere to close)", SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.7, font, BLACK, True)
 
+    @profiled()
     def draw_character_select(self, game):
         assets = game.assets
         screen = game.screen
         font = assets.fonts["normal"]
         medium_font = assets.fonts["medium"]
-        small_font = assets.fonts["small"]
+        small_bold_font = assets.fonts["small_bold"]
         title_font = assets.fonts["title"]
 
-        screen.blit(assets.background_assets["class"], (0, 0))
-
-        if game.last_music_state != SELECT:
-            game.last_music_state = SELECT
+        screen.blit(assets.background("class"), (0, 0))
 
         title = "CHOOSE YOUR STUDENT"
         tx = SCREEN_WIDTH // 2
         ty = int(SCREEN_HEIGHT * 0.2)
-        card_w, card_h = int(SCREEN_WIDTH * 0.18), int(SCREEN_HEIGHT * 0.45)
-        gap = (SCREEN_WIDTH - (3 * card_w)) // 4
-        m_pos = pygame.mouse.get_pos()
+        card_w, card_h, gap = self._select_cards()
 
-        for ox, oy in [(-3, 0), (3, 0), (0, -3), (0, 3)]:
-            draw_text(screen, title, tx + ox, ty + oy, title_font, BLACK, True)
-        draw_text(screen, title, tx, ty, title_font, OU_CREAM, True)
-
-        hover_idx = None
-        for i in range(len(game.roster)):
-            x = gap + i * (card_w + gap)
-            y = int(SCREEN_HEIGHT * 0.35)
-            rect = pygame.Rect(x, y, card_w, card_h)
-            if rect.collidepoint(m_pos):
-                hover_idx = i
-                break
-
-        game.selected_idx = hover_idx
+        draw_text(screen, title, tx, ty, title_font, OU_CREAM, True, outline=(BLACK, 3, CROSS_OUTLINE))
 
         if game.selected_idx is None:
             for i, s in enumerate(game.roster):
@@ -231,8 +475,8 @@ class Renderer: #DRAW FCTS
                     if hasattr(s_focused, "hover_sprite") and s_focused.hover_sprite:
                         img = s_focused.hover_sprite
                         scale = min(p_rect.w / img.get_width(), p_rect.h / img.get_height())
-                        scaled = pygame.transform.smoothscale(
-                            img, (int(img.get_width() * scale), int(img.get_height() * scale))
+                        scaled = self._scaled_sprite(
+                            game, img, (int(img.get_width() * scale), int(img.get_height() * scale))
                         )
                         screen.blit(
                             scaled,
@@ -243,12 +487,10 @@ class Renderer: #DRAW FCTS
                         self.draw_character_preview(game, s_focused, p_rect)
 
                     draw_text(screen, s_focused.name, fx + large_w // 2, fy + int(large_h * 0.62), medium_font, BLACK, True)
-                    small_font.set_bold(True)
-                    draw_text(screen, "SPECIAL ABILITY:", fx + large_w // 2, fy + int(large_h * 0.70), small_font, GOLD, True)
-                    lines = wrap_text(s_focused.ability_desc, small_font, int(large_w * 0.82))
+                    draw_text(screen, "SPECIAL ABILITY:", fx + large_w // 2, fy + int(large_h * 0.70), small_bold_font, GOLD, True)
+                    lines = wrap_text(s_focused.ability_desc, small_bold_font, int(large_w * 0.82))
                     for j, line in enumerate(lines):
-                        draw_text(screen, line, fx + large_w // 2, fy + int(large_h * 0.75) + (j * 20), small_font, BLACK, True)
-                    small_font.set_bold(False)
+                        draw_text(screen, line, fx + large_w // 2, fy + int(large_h * 0.75) + (j * 20), small_bold_font, BLACK, True)
                 else:
                     self.draw_transparent_rect(screen, GRAY, rect, 180)
                     pygame.draw.rect(screen, WHITE, rect, 2, border_radius=15)
@@ -261,88 +503,86 @@ class Renderer: #DRAW FCTS
                     self.draw_character_preview(game, other, p_rect)
                     draw_text(screen, other.name, x + card_w // 2, y + int(card_h * 0.68), font, WHITE, True)
 
+    @profiled()
     def draw_hallway(self, game):
         assets = game.assets
         screen = game.screen
         font = assets.fonts["normal"]
         title_font = assets.fonts["title"]
 
-        start_screen_x = -game.camera_x
-        if start_screen_x < SCREEN_WIDTH:
-            screen.blit(assets.hallway_start, (start_screen_x, 0))
-
-        if game.camera_x < assets.mid_point:
-            current_x = assets.mid_point - game.camera_x
-        else:
-            offset = (game.camera_x - assets.mid_point) % assets.loop_w
-            current_x = -offset
-
-        while current_x < SCREEN_WIDTH:
-            screen.blit(assets.hallway_loop, (current_x, 0))
-            current_x += assets.loop_w
-
-        doors_currently_near = set()
-        import os
-
-        for i, door in enumerate(game.door_locations):
-            screen_x = door["x"] - game.camera_x
-            if -200 < screen_x < SCREEN_WIDTH:
-                distance = abs(game.player_world_x - door["x"])
-                is_near = distance < int(SCREEN_WIDTH * 0.05)
-                is_unlocked = i <= game.current_level
-
-                if is_near and is_unlocked:
-                    doors_currently_near.add(i)
-
-                if is_near and is_unlocked and i not in game.doors_previously_near:
-                    door_sound = os.path.join(game.sfx_dir, "dragon-studio-opening-door-sfx-454240.mp3")
-                    game.sound.play_sfx(door_sound, volume=0.5)
-
-                if is_near and is_unlocked:
-                    img_to_use = assets.door_upclose_img
-                else:
-                    img_to_use = assets.door_img
-
-                if is_near:
-                    display_img = pygame.transform.scale(img_to_use, (game.door_w, game.door_h))
-                else:
-                    display_img = img_to_use
-
-                if i > game.current_level:
-                    display_img = display_img.copy()
-                    display_img.fill((40, 40, 40), special_flags=pygame.BLEND_RGB_MULT)
-
-                door_y = game.door_y
-                screen.blit(display_img, (screen_x, door_y))
-                door["rect"] = pygame.Rect(screen_x, door_y, game.door_w, game.door_h)
-
-        game.doors_previously_near = doors_currently_near
+        camera_x = int(game.lerp("camera_x"))
+        first = camera_x // SCREEN_WIDTH
+        for idx in (first, first + 1):
+            tile_x = idx * SCREEN_WIDTH - camera_x
+            if tile_x >= SCREEN_WIDTH:
+                break
+            screen.blit(self._hallway_tile(game, idx), (tile_x, 0))
 
-        player_draw_x = game.player_screen_x - int(SCREEN_WIDTH * 0.04)
+        player_draw_x = int(game.lerp("player_screen_x")) - int(SCREEN_WIDTH * 0.04)
         player_draw_y = SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.50)
-        game.player.update_animation()
         self.draw_character_with_shadow(game, game.player, player_draw_x, player_draw_y)
 
         if game.show_exit_prompt:
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (0, 0))
+            screen.blit(self._overlay(game, 180), (0, 0))
 
             draw_text(screen, "Return to Menu?", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 - 70, title_font, WHITE, True)
 
-            btn_w = int(SCREEN_WIDTH * 0.07)
-            btn_h = int(SCREEN_HEIGHT * 0.07)
-            gap = int(SCREEN_WIDTH * 0.02)
-            total_w = btn_w * 2 + gap
-            start_x = SCREEN_WIDTH // 2 - total_w // 2
-            btn_y = SCREEN_HEIGHT // 2 + int(SCREEN_HEIGHT * 0.05)
-
-            game.btn_exit_yes = Button("YES", start_x, btn_y, btn_w, btn_h, OU_CREAM)
-            game.btn_exit_no = Button("NO", start_x + btn_w + gap, btn_y, btn_w, btn_h, OU_CREAM)
-            game.btn_exit_yes.draw(screen, font)
-            game.btn_exit_no.draw(screen, font)
+            game.ui[EXIT_PROMPT].draw(screen, font, game.mouse_pos)
+
+    def _hallway_tile(self, game, idx: int) -> pygame.Surface:
+        """Hallway slice idx (world x idx * SCREEN_WIDTH onwards) with its doors baked in.
+
+        A slice only changes with the level (which doors are tinted locked)
+        and which of its doors the player stands at, so those are its key;
+        the last few slices are kept, and drawing the hallway costs two blits
+        whatever its length or door count.
+        """
+        left = idx * SCREEN_WIDTH
+        doors = game.doors.overlapping(left, left + SCREEN_WIDTH)
+        near = frozenset(door["level"] for door in doors
+                         if abs(game.player_world_x - door["x"]) < int(SCREEN_WIDTH * 0.05))
+        ring = self._layer(game, ("hallway", "tiles"), OrderedDict)
+        key = (idx, game.current_level, near)
+        tile = ring.get(key)
+        if tile is None:
+            tile = self._build_hallway_tile(game, left, doors, near)
+            ring[key] = tile
+            if len(ring) > HALLWAY_TILE_RING:
+                ring.popitem(last=False)
+        else:
+            ring.move_to_end(key)
+        return tile
 
-    def draw_door_view(self, game):
+    @profiled()
+    def _build_hallway_tile(self, game, left: int, doors, near) -> pygame.Surface:
+        assets = game.assets
+        tile = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        if left < assets.mid_point:
+            tile.blit(assets.hallway_start, (-left, 0))
+
+        # hallway_loop repeats from mid_point onwards
+        x = assets.mid_point + max(0, (left - assets.mid_point) // assets.loop_w) * assets.loop_w
+        while x < left + SCREEN_WIDTH:
+            tile.blit(assets.hallway_loop, (x - left, 0))
+            x += assets.loop_w
+
+        for door in doors:
+            i = door["level"]
+            is_near = i in near
+            if is_near and i <= game.current_level:
+                img = assets.door_upclose_img
+            else:
+                img = assets.door_img
+            if is_near:
+                img = pygame.transform.scale(img, (game.door_w, game.door_h))
+            if i > game.current_level:
+                img = img.copy()
+                img.fill((40, 40, 40), special_flags=pygame.BLEND_RGB_MULT)
+            tile.blit(img, (door["x"] - left, game.door_y))
+        return tile
+
+    @profiled()
+    def draw_door_view(self, game, widgets=True):
         assets = game.assets
         screen = game.screen
         font = assets.fonts["normal"]
@@ -358,36 +598,16 @@ class Renderer: #DRAW FCTS
             current_y += title_font.get_linesize()
         draw_text(screen, boss.level_name, SCREEN_WIDTH // 2, SCREEN_HEIGHT * 0.53, font, BLACK, center=True)
 
-        current_ticks = pygame.time.get_ticks()
-        wiggle_x = math.sin(current_ticks * 0.05) * 6 if (current_ticks % 2500) < 500 else 0
-
-        confirm_x = SCREEN_WIDTH // 2 - 225 + wiggle_x
-        game.btn_confirm = Button("CHALLENGE", confirm_x, SCREEN_HEIGHT - 150, 200, 60, OU_CREAM)
-        game.btn_back = Button("BACK", SCREEN_WIDTH // 2 + 10, SCREEN_HEIGHT - 150, 200, 60, OU_CREAM)
-        game.btn_confirm.draw(screen, font)
-        game.btn_back.draw(screen, font)
+        if widgets:
+            game.ui[DOOR_VIEW].draw(screen, font, game.mouse_pos)
 
+    @profiled()
     def draw_battle(self, game):
-        import os
         assets = game.assets
         screen = game.screen
         font = assets.fonts["normal"]
 
-        boss_music_id = game.boss.bossId
-        if getattr(game, "current_boss_music_id", None) != boss_music_id:
-            game.sound.clear_music()
-            game.sound.play_music(os.path.join(game.sfx_dir, f"Boss{boss_music_id}_music.wav"), volume=0.1)
-            game.current_boss_music_id = boss_music_id
-
-        bg_index = game.boss.bossId - 1
-        if 0 <= bg_index < len(assets.battle_backgrounds):
-            screen.blit(assets.battle_backgrounds[bg_index], (0, 0))
-            overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 100))
-            screen.blit(overlay, (0, 0))
-
-        floor_height = int(SCREEN_HEIGHT * 0.3)
-        floor_y = SCREEN_HEIGHT - floor_height
+        screen.blit(self._battle_backdrop(game, game.boss.bossId), (0, 0))
 
         box_w, box_h = int(SCREEN_WIDTH * 0.225), int(SCREEN_HEIGHT * 0.09)
         padding = 15
@@ -398,35 +618,16 @@ class Renderer: #DRAW FCTS
             draw_x, draw_y = x_pos, padding
             if is_low_health and i == 0:
                 bg_color = (200, 0, 0, 180)
-                draw_x += random.randint(-5, 5)
-                draw_y += random.randint(-5, 5)
-            box_surf = pygame.Surface((box_w, box_h), pygame.SRCALPHA)
-            pygame.draw.rect(box_surf, bg_color, (0, 0, box_w, box_h), border_radius=12)
-            screen.blit(box_surf, (draw_x, draw_y))
-
-        floor_tex = assets.floor_textures.get(game.boss.bossId)
-        if floor_tex:
-            try:
-                scaled_floor = pygame.transform.scale(floor_tex, (SCREEN_WIDTH, floor_height))
-                screen.blit(scaled_floor, (0, floor_y + SCREEN_HEIGHT * 0.03))
-            except Exception:
-                pass
+                draw_x += self._shake.randint(-5, 5)
+                draw_y += self._shake.randint(-5, 5)
+            screen.blit(self._hp_box(game, (box_w, box_h), bg_color), (draw_x, draw_y))
 
         player_x = int(SCREEN_WIDTH * 0.08)
         player_y = SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.55)
-        game.player.update_animation()
         self.draw_character_with_shadow(game, game.player, player_x, player_y)
 
         boss_y = SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.63)
-        if game.boss_entering:
-            game.boss.set_state(WALK)
-            game.boss_x -= game.boss_walk_speed
-            if game.boss_x <= game.boss_target_x:
-                game.boss_x = game.boss_target_x
-                game.boss_entering = False
-                game.boss.set_state(IDLE)
-        game.boss.update_animation()
-        self.draw_character_with_shadow(game, game.boss, game.boss_x, boss_y)
+        self.draw_character_with_shadow(game, game.boss, int(game.lerp("boss_x")), boss_y)
 
         hp_bar_w = int(SCREEN_WIDTH * 0.18)
         hp_bar_h = int(SCREEN_HEIGHT * 0.03)
@@ -446,14 +647,9 @@ class Renderer: #DRAW FCTS
         boss_bar_x = SCREEN_WIDTH - ui_margin - hp_bar_w
         pygame.draw.rect(screen, OU_CRIMSON, (boss_bar_x, hp_y, hp_bar_w, hp_bar_h))
         pygame.draw.rect(screen, GREEN, (boss_bar_x, hp_y, int(hp_bar_w * b_hp_ratio), hp_bar_h))
-        boss_text_surf = font.render(f"{game.boss.name}: {boss_hp_display} HP", True, WHITE)
+        boss_text_surf = render_text(font, f"{game.boss.name}: {boss_hp_display} HP", WHITE)
         screen.blit(boss_text_surf, (SCREEN_WIDTH - ui_margin - boss_text_surf.get_width(), text_y))
 
-        btn_width = int(SCREEN_WIDTH * 0.16)
-        btn_height = int(SCREEN_HEIGHT * 0.055)
-        btn_spacing = int(SCREEN_WIDTH * 0.015)
-        btn_margin = int(SCREEN_WIDTH * 0.05)
-
         ui_rect = pygame.Rect(
             ui_margin,
             SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.18),
@@ -462,36 +658,26 @@ class Renderer: #DRAW FCTS
         )
         if assets.notebook_paper_img:
             bg_rect = ui_rect.inflate(0, 10)
-            bg_img = pygame.transform.smoothscale(assets.notebook_paper_img, (bg_rect.w, bg_rect.h))
-            paper_surface = pygame.Surface((bg_rect.w, bg_rect.h), pygame.SRCALPHA)
-            paper_surface.blit(bg_img, (0, 0))
-            mask_surface = pygame.Surface((bg_rect.w, bg_rect.h), pygame.SRCALPHA)
-            pygame.draw.rect(mask_surface, (255, 255, 255, 255), mask_surface.get_rect(), border_radius=15)
-            paper_surface.blit(mask_surface, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-            screen.blit(paper_surface, (bg_rect.x, bg_rect.y))
+            screen.blit(self._notebook_paper(game, bg_rect.size), (bg_rect.x, bg_rect.y))
         else:
             pygame.draw.rect(screen, BLACK, ui_rect.inflate(0, 10), border_radius=15)
         pygame.draw.rect(screen, OU_CRIMSON, ui_rect, 4, border_radius=15)
 
-        if game.combat_text and pygame.time.get_ticks() < game.combat_text_timer:
-            game.combat_text_y_offset -= 0.5
-            time_left = game.combat_text_timer - pygame.time.get_ticks()
+        if game.combat_text and CLOCK.now() < game.combat_text_timer:
+            time_left = game.combat_text_timer - CLOCK.now()
             alpha = max(0, min(255, int(255 * (time_left / 1000))))
-            big_font = pygame.font.SysFont("Courier", int(SCREEN_HEIGHT * 0.05), bold=True)
+            big_font = assets.fonts["combat"]
             lines = game.combat_text.split("\n")
             line_height = big_font.get_height()
             for i, line in enumerate(lines):
                 tx = ui_margin + int(SCREEN_WIDTH * 0.075)
-                ty = SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.6) + game.combat_text_y_offset + (i * line_height)
-                for dx, dy in [(-2, -2), (0, -2), (2, -2),
-                               (-2, 0), (2, 0),
-                               (-2, 2), (0, 2), (2, 2)]:
-                    outline = big_font.render(line, True, BLACK) #wat
-                    outline.set_alpha(alpha)
-                    screen.blit(outline, (tx + dx, ty + dy))
-                txt = big_font.render(line, True, game.combat_text_color)
-                txt.set_alpha(alpha)
-                screen.blit(txt, (tx, ty))
+                ty = SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.6) + game.lerp("combat_text_y_offset") + (i * line_height)
+                txt = render_text(big_font, line, game.combat_text_color, outline=(BLACK, 2))
+                if alpha < 255:
+                    # The cached surface is shared; fade a copy of it
+                    txt = txt.copy()
+                    txt.set_alpha(alpha)
+                screen.blit(txt, (tx - 2, ty - 2))
 
         if game.show_question:
             draw_speech_bubble(
@@ -502,96 +688,23 @@ class Renderer: #DRAW FCTS
                 font,
                 type="boss",
             )
-            game.answer_btns = []
-            num_choices = len(game.current_q["choices"])
-            total_width = (num_choices * btn_width) + ((num_choices - 1) * btn_spacing)
-            start_x = (SCREEN_WIDTH - total_width) / 2
-            for i, opt in enumerate(game.current_q["choices"]):
-                x = start_x + (i * (btn_width + btn_spacing))
-                btn = Button(
-                    opt,
-                    int(x),
-                    SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.11),
-                    btn_width,
-                    int(SCREEN_HEIGHT * 0.12),
-                    (212, 175, 55, 120),
-                    (212, 175, 55),
-                )
-                btn.draw(screen, font)
-                game.answer_btns.append(btn)
+            game.ui[ANSWERS].draw(screen, font, game.mouse_pos)
         else:
             text_margin = int(SCREEN_WIDTH * 0.07)
             battle_font = assets.fonts["medium"]
             draw_text(screen, game.battle_log, text_margin, SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.12), battle_font, BLACK)
-
-            current_time = pygame.time.get_ticks()
-            heal_disabled = (game.player.numHeals <= 0) or (game.player.hp >= game.player.max_hp)
-            is_locked = (current_time - getattr(game, "battle_start_time", 0)) < 4500
-            atk_color = (128, 128, 128) if is_locked else GOLD
-
-            game.btn_atk = Button(
-                "ATTACK",
-                SCREEN_WIDTH - btn_margin - 2 * btn_width - btn_spacing,
-                SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.105),
-                btn_width, btn_height,
-                (255, 0, 0), atk_color,
-                disabled=is_locked,
-            )
-            game.btn_heal = Button(
-                "HEAL",
-                SCREEN_WIDTH - btn_margin - btn_width,
-                SCREEN_HEIGHT - int(SCREEN_HEIGHT * 0.105),
-                btn_width, btn_height,
-                GREEN,
-                disabled=heal_disabled,
-            )
-            game.btn_atk.draw(screen, font)
-            game.btn_heal.draw(screen, font)
-
-        if game.victory_stage > 0:
-            elapsed = pygame.time.get_ticks() - game.victory_timer
-            if game.victory_stage == 1 and elapsed > 2000:
-                game.victory_stage = 2
-                game.victory_timer = pygame.time.get_ticks()
-            elif game.victory_stage == 2 and elapsed > 100:
-                game.victory_stage = 3
-                if game.is_player_victory:
-                    game.start_fade(WIN)
-                    game.boss_entering = True
-                    game.boss_x = SCREEN_WIDTH + 200
-                else:
-                    game.start_fade(LOSS)
+            game.ui[BATTLE].draw(screen, font, game.mouse_pos)
 
         if game.flash_timer > 0:
-            flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-            flash_surf.fill(WHITE)
-            flash_surf.set_alpha(100)
-            screen.blit(flash_surf, (0, 0))
-            game.flash_timer -= 1
+            screen.blit(self._flash(game), (0, 0))
 
+    @profiled()
     def draw_win(self, game):
-        win_bg = "title"
-        if game.player:
-            name_map = {
-                "4.0 Medallion": "win_kris",
-                "Cs Get Degrees": "win_shri",
-                "TA God": "win_ken",
-            }
-            win_bg = name_map.get(game.player.name, "title")
-
-        game.screen.blit(game.assets.background_assets[win_bg], (0, 0))
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 80))
-        game.screen.blit(overlay, (0, 0))
+        game.screen.blit(self._dimmed_background(game, win_background(game.player), 80), (0, 0))
 
+    @profiled()
     def draw_loss(self, game):
-        boss_bg_map = {1: "lost_sridhar", 2: "lost_dioch", 3: "lost_maiti"}
-        bg_key = boss_bg_map.get(game.boss.bossId, "lost_sridhar")
-        game.screen.blit(game.assets.background_assets[bg_key], (0, 0))
-
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 100))
-        game.screen.blit(overlay, (0, 0))
+        game.screen.blit(self._dimmed_background(game, loss_background(game.boss), 100), (0, 0))
 
         draw_text(
             game.screen, game.boss.loss_msg,
@@ -599,26 +712,19 @@ class Renderer: #DRAW FCTS
             game.assets.fonts["normal"], OU_CRIMSON, True,
         )
 
-    def draw_total_win(self, game):
+    @profiled()
+    def draw_total_win(self, game, widgets=True):
         screen = game.screen
         font = game.assets.fonts["normal"]
         medium_font = game.assets.fonts["medium"]
 
-        screen.blit(game.assets.background_assets["end"], (0, 0))
+        screen.blit(game.assets.background("end"), (0, 0))
 
         header_w, header_h = int(SCREEN_WIDTH * 0.5), 80
         header_rect = pygame.Rect(SCREEN_WIDTH // 2 - header_w // 2, 40, header_w, header_h)
-        s = pygame.Surface((header_w, header_h), pygame.SRCALPHA)
-        s.fill((249, 244, 227, 220))
-        screen.blit(s, (header_rect.x, header_rect.y))
+        self.draw_transparent_rect(screen, (249, 244, 227), header_rect, 220)
         pygame.draw.rect(screen, BLACK, header_rect, 3, border_radius=5)
         draw_text(screen, "DEGREE CONFERRED: C.S. COMPLETED!", SCREEN_WIDTH // 2, 69, medium_font, BLACK, True)
 
-        btn_w, btn_h = 300, 60
-        game.btn_exit_win = Button(
-            "RETURN TO TITLE",
-            SCREEN_WIDTH // 2 - btn_w // 2,
-            SCREEN_HEIGHT - 100,
-            btn_w, btn_h, OU_CREAM,
-        )
-        game.btn_exit_win.draw(screen, font)
\ No newline at end of file
+        if widgets:
+            game.ui[TOTAL_WIN].draw(screen, font, game.mouse_pos)
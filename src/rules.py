@@ -0,0 +1,85 @@
+import random
+
+# Character stats. data_setup builds the sprite-backed entities from these
+# tables and src/battle_sim plays them headless, so keep this module free of pygame.
+STUDENTS = [
+    {
+        "name": "Cs Get Degrees", "hp": 100, "attack": 15, "sprite": "swi",
+        "ability_desc": "Hidden Ability: 25% chance to ignore a wrong answer on a dodge.",
+        "win_msg": "C's Really Do Get Degrees! You passed!",
+    },
+    {
+        "name": "4.0 Medallion", "hp": 100, "attack": 20, "sprite": "kris",
+        "ability_desc": "Special: 20% Critical Hit chance (The Curve) for 1.5x damage.",
+        "win_msg": "Academic Excellence!",
+    },
+    {
+        "name": "TA God", "hp": 100, "attack": 18, "sprite": "ken",
+        "ability_desc": "Special: Healing restores twice as much HP (Lab Snacks).",
+        "win_msg": "The lab is yours now!",
+    },
+]
+
+PROFESSORS = [
+    {
+        "name": "Prof Sridhar", "hp": 150, "attack": 35, "bossId": 1, "sprite": "sridhar",
+        "loss_msg": "Logic is not O(1). You fail Data Structures.",
+        "level_name": "The Biz",
+    },
+    {
+        "name": "Prof Diochnos", "hp": 200, "attack": 35, "bossId": 2, "sprite": "dioch",
+        "loss_msg": "This language is not decidable\u2026 and neither are you. You fail Theory.\u201d",
+        "level_name": "Turing Machine Terrace",
+    },
+    {
+        "name": "Prof Maiti", "hp": 275, "attack": 35, "bossId": 3, "sprite": "maiti",
+        "loss_msg": "Your hash has collisions. You fail Cryptography.",
+        "level_name": "Bitcoin Boulevard",
+    },
+]
+
+NUM_HEALS = 1
+
+# Students with a special ability
+CURVE_STUDENT = "Cs Get Degrees"
+CRIT_STUDENT = "4.0 Medallion"
+HEAL_STUDENT = "TA God"
+
+CRIT_CHANCE = 0.05
+SPECIAL_CRIT_CHANCE = 0.20
+CRIT_MULTIPLIER = 1.5
+BLOCK_CHANCE = 0.15
+BLOCK_MULTIPLIER = 0.5
+HEAL_AMOUNT = 35
+SPECIAL_HEAL_MULTIPLIER = 2
+CURVE_CHANCE = 0.25
+
+
+def attack(name: str, attack_power: int, rng=random) -> tuple[int, str, bool]:
+    """(damage, combat text, is_special) for one attack by the named student."""
+    roll = rng.random()
+    crit_chance = SPECIAL_CRIT_CHANCE if name == CRIT_STUDENT else CRIT_CHANCE
+
+    if roll < crit_chance:
+        if name == CRIT_STUDENT:
+            return int(attack_power * CRIT_MULTIPLIER), "CRITICAL HIT!\n(The Curve effect!)", True
+        return int(attack_power * CRIT_MULTIPLIER), "CRITICAL HIT!", False
+    elif roll < crit_chance + BLOCK_CHANCE:
+        return int(attack_power * BLOCK_MULTIPLIER), "BLOCKED!\nPartial Hit.", False
+    return attack_power, "Direct Hit!", False
+
+
+def heal(name: str) -> tuple[int, str, bool]:
+    """(HP restored, combat text, is_special) for one heal by the named student."""
+    if name == HEAL_STUDENT:
+        return int(HEAL_AMOUNT * SPECIAL_HEAL_MULTIPLIER), "SPECIAL:\nLab snacks! Double Healing!", True
+    return HEAL_AMOUNT, f"Studied hard.\nRestored {HEAL_AMOUNT} HP.", False
+
+
+def can_heal(hp: int, max_hp: int, heals_left: int) -> bool:
+    return heals_left > 0 and hp < max_hp
+
+
+def curve_saves(name: str, rng=random) -> bool:
+    """True when the curve lets the named student off a wrong answer."""
+    return name == CURVE_STUDENT and rng.random() < CURVE_CHANCE
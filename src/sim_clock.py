@@ -0,0 +1,50 @@
+from src.constants import SIM_HZ
+
+
+class FixedStepClock:
+    """Turns variable frame times into a whole number of fixed simulation steps.
+
+    Game.update runs once per step, so gameplay speed no longer depends on
+    the frame rate. Whatever time is left over becomes ``alpha``, the
+    fraction of a step the renderer should interpolate towards the newest
+    state. After a long stall only ``max_steps`` are run and the rest is
+    dropped, so a slow frame cannot snowball into ever longer catch-ups.
+
+    ``now()`` is simulated time, advanced by tick() once per step. Gameplay
+    timers read it instead of pygame.time.get_ticks so that skipped frames
+    and fast-forwarded steps see the same clock as real-time play.
+    """
+
+    def __init__(self, step_ms: float, max_steps: int = 5):
+        self.step_ms = step_ms
+        self.max_steps = max_steps
+        self.lag = 0.0
+        self.alpha = 1.0
+        self.time_ms = 0.0
+
+    def now(self) -> int:
+        return int(self.time_ms)
+
+    def tick(self) -> None:
+        self.time_ms += self.step_ms
+
+    def advance(self, elapsed_ms: float | None) -> int:
+        """Steps to simulate for this frame; None means exactly one, drawn without interpolation."""
+        if elapsed_ms is None:
+            self.lag = 0.0
+            self.alpha = 1.0
+            return 1
+
+        self.lag += elapsed_ms
+        steps = int(self.lag // self.step_ms)
+        if steps > self.max_steps:
+            steps = self.max_steps
+            self.lag = 0.0
+        else:
+            self.lag -= steps * self.step_ms
+        self.alpha = self.lag / self.step_ms
+        return steps
+
+
+# Shared by the game loop and every gameplay timer (see AnimatedEntity)
+CLOCK = FixedStepClock(1000 / SIM_HZ)
@@ -1,9 +1,124 @@
 import pygame
+import json
 import os
 import random
+import threading
+from collections import OrderedDict
+
+from src.profiler import PROFILER, profiled
+from src.music import MusicPlayer
+
+# Logical name -> source file under assets/audio. Boss intros and voicelines
+# are added by audio_sources(); tools/build_audio.py transcodes exactly those.
+SOUNDS = {
+    "critical_hit": "sfx/critical_hit.wav",
+    "punch": "sfx/punch_sound.wav",
+    "dodge": "sfx/dodge.mp3",
+    "door": "sfx/dragon-studio-opening-door-sfx-454240.mp3",
+    "win": "sfx/win-sound.wav",
+    "lose": "sfx/lose_sound.wav",
+    "title_music": "sfx/title_screen.wav",
+    "boss1_music": "sfx/Boss1_music.wav",
+    "boss2_music": "sfx/Boss2_music.wav",
+    "boss3_music": "sfx/Boss3_music.wav",
+}
+
+# Effects played during a run; decoded up front so playback never touches the disk
+PRELOAD_SOUNDS = ["critical_hit", "punch", "dodge", "door", "win", "lose"]
+
+AUDIO_MANIFEST_VERSION = 1
+
+
+def audio_sources(audio_dir):
+    """({logical name: source path}, {boss id: [voiceline names]}) for every sound the game plays."""
+    sources = {name: os.path.join(audio_dir, *rel.split("/")) for name, rel in SOUNDS.items()}
+    voicelines = {}
+    if not os.path.isdir(audio_dir):
+        return sources, voicelines
+    for entry in sorted(os.listdir(audio_dir)):
+        folder = os.path.join(audio_dir, entry)
+        if not (entry.startswith("Boss") and os.path.isdir(folder)):
+            continue
+        try:
+            boss_id = int(entry[len("Boss"):])
+        except ValueError:
+            continue
+        sources[f"prof{boss_id}_intro"] = os.path.join(audio_dir, f"Prof{boss_id}Intro.wav")
+        names = []
+        for f in sorted(os.listdir(folder)):
+            if f.lower().endswith(".wav") and "voiceline" in f.lower():
+                name = f"boss{boss_id}/{os.path.splitext(f)[0]}"
+                sources[name] = os.path.join(folder, f)
+                names.append(name)
+        voicelines[boss_id] = names
+    return sources, voicelines
+
+
+def decode_sound(file_path):
+    if not os.path.exists(file_path):
+        print(f"[WARN] Missing audio file: {file_path}")
+        return None
+    with PROFILER.scope("decode_sound", file_path):
+        return pygame.mixer.Sound(file_path)
+
+
+class SoundBank:
+    """Decoded sounds keyed by path, evicted least-recently-used past a byte budget."""
+
+    def __init__(self, budget_bytes=64 * 1024 * 1024):
+        self.budget_bytes = budget_bytes
+        self.used_bytes = 0
+        self._sounds = OrderedDict()  # path -> (Sound | None, size)
+        self._lock = threading.Lock()
+
+    def get(self, file_path):
+        with self._lock:
+            entry = self._sounds.get(file_path)
+            if entry is not None:
+                self._sounds.move_to_end(file_path)
+                return entry[0]
+
+        sound = decode_sound(file_path)
+        self._store(file_path, sound)
+        return sound
+
+    def preload(self, paths, background=True, executor=None):
+        paths = [p for p in paths if p not in self._sounds]
+        if executor is not None:
+            return [executor.submit(self.get, path) for path in paths]
+        if not background:
+            self._load_all(paths)
+            return None
+
+        thread = threading.Thread(target=self._load_all, args=(paths,), daemon=True)
+        thread.start()
+        return thread
+
+    def _load_all(self, paths):
+        for path in paths:
+            self.get(path)
+
+    def _store(self, file_path, sound):
+        size = self._sound_bytes(sound)
+        with self._lock:
+            if file_path in self._sounds:
+                return
+            self._sounds[file_path] = (sound, size)
+            self.used_bytes += size
+            while self.used_bytes > self.budget_bytes and len(self._sounds) > 1:
+                _, (_, old_size) = self._sounds.popitem(last=False)
+                self.used_bytes -= old_size
+
+    @staticmethod
+    def _sound_bytes(sound):
+        if sound is None:
+            return 0
+        freq, fmt, channels = pygame.mixer.get_init()
+        return int(sound.get_length() * freq) * channels * (abs(fmt) // 8)
+
 
 class SoundManager:
-    def __init__(self):
+    def __init__(self, budget_bytes=64 * 1024 * 1024, executor=None):
         pygame.mixer.init()
 
         # Dedicated channels
@@ -15,63 +130,102 @@ class SoundManager:
         # Base paths
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         self.audio_dir = os.path.join(base_dir, "assets", "audio")
-
-    def play_voice(self, file_path, volume=1.0, fade_ms=150):
-        if not os.path.exists(file_path):
-            print(f"[WARN] Missing audio file: {file_path}")
+        self.build_dir = os.path.join(self.audio_dir, "build")
+
+        # Sounds are played by logical name: the transcoded file when
+        # tools/build_audio.py has run, the source file otherwise
+        self.paths, self.voicelines = audio_sources(self.audio_dir)
+        self._use_manifest(self._read_manifest())
+
+        self.bank = SoundBank(budget_bytes)
+        # Music stays out of the bank; decoded tracks are large enough to evict every effect
+        self.music = MusicPlayer(decode_sound, executor)
+        self.preload(executor=executor)
+        self.prefetch_music("title_music")
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.build_dir, "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("version") != AUDIO_MANIFEST_VERSION:
+            print("[WARN] Ignoring outdated audio manifest; rerun tools/build_audio.py")
+            return None
+        return manifest
+
+    def _use_manifest(self, manifest):
+        if manifest is None:
+            return
+        freq, _fmt, channels = pygame.mixer.get_init()
+        if (manifest["rate"], manifest["channels"]) != (freq, channels):
+            print(f"[WARN] Audio was built for {manifest['rate']} Hz, the mixer runs at {freq} Hz; "
+                  "sounds will be resampled on load")
+        for name, file in manifest["sounds"].items():
+            self.paths[name] = os.path.join(self.build_dir, file)
+        self.voicelines = {int(boss_id): names for boss_id, names in manifest["voicelines"].items()}
+
+    def path(self, name):
+        path = self.paths.get(name)
+        if path is None:
+            print(f"[WARN] Unknown sound: {name}")
+        return path
+
+    def preload(self, background=True, executor=None):
+        names = list(PRELOAD_SOUNDS)
+        for boss_id, lines in self.voicelines.items():
+            names.append(f"prof{boss_id}_intro")
+            names.extend(lines)
+        paths = [self.paths[name] for name in names if name in self.paths]
+        return self.bank.preload(paths, background=background, executor=executor)
+
+    @profiled()
+    def play_voice(self, name, volume=1.0, fade_ms=150):
+        path = self.path(name)
+        sound = self.bank.get(path) if path else None
+        if sound is None:
             return
-
-        sound = pygame.mixer.Sound(file_path)
-        sound.set_volume(volume)
 
         if self.voice_channel.get_busy():
             self.voice_channel.fadeout(fade_ms)
 
+        # Volume goes on the channel; the Sound is shared through the bank
+        self.voice_channel.set_volume(volume)
         self.voice_channel.play(sound)
-        
-    def play_sfx(self, file_path, volume=1.0):
-        if not os.path.exists(file_path):
-            print(f"[WARN] Missing SFX file: {file_path}")
+
+    @profiled()
+    def play_sfx(self, name, volume=1.0):
+        path = self.path(name)
+        sound = self.bank.get(path) if path else None
+        if sound is None:
             return
 
-        sound = pygame.mixer.Sound(file_path)
-        sound.set_volume(volume)
+        self.sfx_channel.set_volume(volume)
         self.sfx_channel.play(sound)
-        
-    def play_music(self, file_path, volume=0.1, fade_ms=500):
-        if not os.path.exists(file_path):
-            print(f"[WARN] Missing music file: {file_path}")
-            return
 
-        # Fade out any currently playing music
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.fadeout(fade_ms)
+    @profiled()
+    def play_music(self, name, volume=0.1, fade_ms=1000):
+        """Crossfades to the track (an .ogg beside it wins) once decoded; never blocks."""
+        path = self.path(name)
+        if path:
+            self.music.play(path, volume, fade_ms)
 
-        # Load and play the new music
-        pygame.mixer.music.load(file_path)
-        pygame.mixer.music.set_volume(volume)
-        pygame.mixer.music.play(loops=-1, fade_ms=fade_ms)  # loop forever with fade
+    def prefetch_music(self, name):
+        path = self.path(name)
+        if path:
+            self.music.prefetch(path)
 
-        
     def clear_music(self, fade_ms=500):
-        if pygame.mixer.music.get_busy():
-            pygame.mixer.music.fadeout(fade_ms)
+        self.music.stop(fade_ms)
 
-    def play_random_voiceline(self, boss_id, volume):
-        folder = os.path.join(self.audio_dir, f"Boss{boss_id}")
+    def update(self):
+        self.music.update()
 
-        if not os.path.exists(folder):
-            print(f"[WARN] Boss audio folder missing: {folder}")
-            return
-
-        files = [
-            f for f in os.listdir(folder)
-            if f.lower().endswith(".wav") and "voiceline" in f.lower()
-        ]
+    def play_random_voiceline(self, boss_id, volume):
+        names = self.voicelines.get(boss_id)
 
-        if not files:
+        if not names:
             print(f"[WARN] No voicelines for boss {boss_id}")
             return
 
-        file_path = os.path.join(folder, random.choice(files))
-        self.play_voice(file_path, volume=volume)
\ No newline at end of file
+        self.play_voice(random.choice(names), volume=volume)
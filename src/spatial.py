@@ -0,0 +1,33 @@
+from bisect import bisect_left, bisect_right
+
+
+class IntervalIndex:
+    """Items spanning [x, x + width) on the hallway's world x axis, sorted for bisect lookups.
+
+    The hallway asks two questions many times a frame: which items are
+    within reach of the player, and which overlap the camera window. Each is a bisect over the sorted start positions plus a
+    walk over the answers, so the cost grows with the number of matches,
+    not with the number of doors along the hallway.
+    """
+
+    def __init__(self, items=(), x=lambda item: item["x"], width=lambda item: 0):
+        entries = sorted(((x(item), width(item), item) for item in items), key=lambda e: e[0])
+        self.starts = [start for start, _, _ in entries]
+        self.widths = [w for _, w, _ in entries]
+        self.items = [item for _, _, item in entries]
+        self.max_width = max(self.widths, default=0)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def within(self, x: float, radius: float) -> list:
+        """Items whose start is less than radius away from x, in world order."""
+        lo = bisect_right(self.starts, x - radius)
+        hi = bisect_left(self.starts, x + radius)
+        return self.items[lo:hi]
+
+    def overlapping(self, left: float, right: float) -> list:
+        """Items drawn at least partly between left and right, in world order."""
+        lo = bisect_right(self.starts, left - self.max_width)
+        hi = bisect_left(self.starts, right)
+        return [self.items[i] for i in range(lo, hi) if self.starts[i] + self.widths[i] > left]
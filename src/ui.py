@@ -1,13 +1,78 @@
 import pygame
+from collections import OrderedDict
 from src.constants import *
 
-def draw_text(screen, text, x, y, font, color=WHITE, center=False):
+TEXT_CACHE_SIZE = 512
+LAYOUT_CACHE_SIZE = 256
+_OUTLINE_DIRS = ((-1, -1), (0, -1), (1, -1), (-1, 0), (1, 0), (-1, 1), (0, 1), (1, 1))
+CROSS_OUTLINE = ((-1, 0), (1, 0), (0, -1), (0, 1))
+
+
+class LRUCache:
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._items = OrderedDict()
+
+    def get(self, key, build):
+        value = self._items.get(key)
+        if value is None:
+            value = build()
+            self._items[key] = value
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        else:
+            self._items.move_to_end(key)
+        return value
+
+    def clear(self):
+        self._items.clear()
+
+
+_text_cache = LRUCache(TEXT_CACHE_SIZE)
+_layout_cache = LRUCache(LAYOUT_CACHE_SIZE)
+
+
+def render_text(font, text, color=WHITE, outline=None):
+    """Cached font.render; outline is (color, width) for an 8-way outline,
+    or (color, width, directions), e.g. CROSS_OUTLINE, for other offsets.
+
+    The returned surface is shared, so callers must not draw onto it or set
+    its alpha; fade a copy instead.
+    """
+    key = (font, font.get_bold(), text, tuple(color), outline)
+    return _text_cache.get(key, lambda: _render_text(font, text, color, outline))
+
+
+def _render_text(font, text, color, outline):
     img = font.render(text, True, color)
+    if outline is None:
+        return img
+
+    outline_color, width, *dirs = outline
+    edge = font.render(text, True, outline_color)
+    surf = pygame.Surface((img.get_width() + width * 2, img.get_height() + width * 2), pygame.SRCALPHA)
+    for dx, dy in (dirs[0] if dirs else _OUTLINE_DIRS):
+        surf.blit(edge, (width + dx * width, width + dy * width))
+    surf.blit(img, (width, width))
+    return surf
+
+
+def draw_text(screen, text, x, y, font, color=WHITE, center=False, outline=None):
+    img = render_text(font, text, color, outline)
+    if outline is not None:
+        # Keep the glyphs where an un-outlined render would put them
+        y -= outline[1]
+        if not center:
+            x -= outline[1]
     if center:
         x -= img.get_width() // 2
     screen.blit(img, (x, y))
 
 def wrap_text(text, font, max_width):
+    key = ("wrap", text, font, font.get_bold(), max_width)
+    return _layout_cache.get(key, lambda: _wrap_text(text, font, max_width))
+
+def _wrap_text(text, font, max_width):
     words = text.split(' ')
     lines = []
     current_line = []
@@ -31,8 +96,49 @@ class Button:
         self.disabled = disabled
         self.rect = pygame.Rect(x, y, w, h)  
         self.min_height = h
+
+        # Rendered looks per visual state, valid for _layout_key only
+        self._surfaces = {}
+        self._layout_key = None
+        self._lines = None
+
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self._layout_key = None
+
+    def set_hover_color(self, color):
+        if color != self.hover_color:
+            self.hover_color = color
+            self._surfaces.pop("hover", None)
+
+    def move_to(self, x, y=None):
+        self.rect.x = int(x)
+        if y is not None and y != self.base_y:
+            self.base_y = y
+            self.rect.y = self.base_y - (self.rect.h // 2)
+
+    def layout(self, font):
+        key = (self.text, self.w, self.min_height, font, font.get_bold())
+        if key == self._layout_key:
+            return
+        self._lines = self.wrap_text(self.text, font, self.w)
+        line_height = font.get_height()
+        padding = 10
+        calculated_height = max(self.min_height, len(self._lines) * line_height + padding * 2)
+
+        y = self.base_y - (calculated_height // 2)
+
+        self.rect = pygame.Rect(self.rect.x, y, self.w, calculated_height)
+        self._surfaces = {}
+        self._layout_key = key
         
     def wrap_text(self, text, font, max_width):
+        key = ("button", text, font, font.get_bold(), max_width)
+        return _layout_cache.get(key, lambda: self._wrap_text(text, font, max_width))
+
+    @staticmethod
+    def _wrap_text(text, font, max_width):
         words = text.split(' ')
         lines = []
         current_line = []
@@ -51,23 +157,31 @@ class Button:
         
         return lines if lines else [text]
     
-    def draw(self, screen, font):
-        lines = self.wrap_text(self.text, font, self.w)
-        line_height = font.get_height()
-        padding = 10
-        calculated_height = max(self.min_height, len(lines) * line_height + padding * 2)
+    def draw(self, screen, font, mouse_pos=None):
+        self.layout(font)
 
-        y = self.base_y - (calculated_height // 2)
+        if mouse_pos is None:
+            mouse_pos = pygame.mouse.get_pos()
 
-        self.rect = pygame.Rect(self.rect.x, y, self.w, calculated_height)
+        if self.disabled:
+            look = "disabled"
+        elif self.rect.collidepoint(mouse_pos):
+            look = "hover"
+        else:
+            look = "normal"
 
-        mouse_pos = pygame.mouse.get_pos()
+        surf = self._surfaces.get(look)
+        if surf is None:
+            surf = self._render(look, font)
+            self._surfaces[look] = surf
+        screen.blit(surf, self.rect.topleft)
 
-        if self.disabled:
+    def _render(self, look, font):
+        if look == "disabled":
             bg_color = (40, 40, 40) # darker gray
             border_color = (90, 90, 90) # muted border
             txt_color = (160, 160, 160) # muted text
-        elif self.rect.collidepoint(mouse_pos):
+        elif look == "hover":
             bg_color = self.hover_color
             border_color = BLACK
             txt_color = BLACK
@@ -76,32 +190,25 @@ class Button:
             border_color = BLACK
             txt_color = BLACK
 
+        surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
+        local = surf.get_rect()
+
         if isinstance(bg_color, (list, tuple)) and len(bg_color) == 4 and bg_color[3] == 0:
             pass
-        elif isinstance(bg_color, (list, tuple)) and len(bg_color) == 4:
-            bg_surface = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
-            
-            pygame.draw.rect(
-                bg_surface,
-                bg_color,
-                (0, 0, self.rect.w, self.rect.h),
-                border_radius=5
-            )
-
-            screen.blit(bg_surface, (self.rect.x, self.rect.y))
-
         else:
-            pygame.draw.rect(screen, bg_color, self.rect, border_radius=5)
-        pygame.draw.rect(screen, border_color, self.rect, 2, border_radius=5)
+            pygame.draw.rect(surf, bg_color, local, border_radius=5)
+        pygame.draw.rect(surf, border_color, local, 2, border_radius=5)
 
-        total_text_height = len(lines) * line_height
-        start_y = self.rect.y + (self.rect.h - total_text_height) // 2
+        line_height = font.get_height()
+        total_text_height = len(self._lines) * line_height
+        start_y = (local.h - total_text_height) // 2
 
-        for i, line in enumerate(lines):
-            txt = font.render(line, True, txt_color)
-            txt_x = self.rect.x + (self.rect.w - txt.get_width()) // 2
+        for i, line in enumerate(self._lines):
+            txt = render_text(font, line, txt_color)
+            txt_x = (local.w - txt.get_width()) // 2
             txt_y = start_y + (i * line_height)
-            screen.blit(txt, (txt_x, txt_y))
+            surf.blit(txt, (txt_x, txt_y))
+        return surf
 
     
     def is_clicked(self, pos):
@@ -110,6 +217,70 @@ class Button:
         return self.rect.collidepoint(pos)
 
 
+class UILayer:
+    """Retained set of widgets for one screen, hit-tested through a uniform grid."""
+
+    def __init__(self, cell_size=128):
+        self.cell_size = cell_size
+        self.widgets = []
+        self._cells = {}
+        self._indexed = {}  # widget -> (rect it was bucketed with, cells)
+
+    def add(self, widget):
+        self.widgets.append(widget)
+        self._index(widget)
+        return widget
+
+    def clear(self):
+        self.widgets = []
+        self._cells = {}
+        self._indexed = {}
+
+    def layout(self, font):
+        for widget in self.widgets:
+            widget.layout(font)
+            self._index(widget)
+
+    def draw(self, screen, font, mouse_pos):
+        for widget in self.widgets:
+            widget.draw(screen, font, mouse_pos)
+            self._index(widget)
+
+    def reindex(self):
+        """Rebuckets widgets moved since they were last indexed, e.g. by Button.move_to."""
+        for widget in self.widgets:
+            self._index(widget)
+
+    def hit_test(self, pos):
+        """Topmost enabled widget under pos, or None."""
+        cell = (pos[0] // self.cell_size, pos[1] // self.cell_size)
+        hit = None
+        for widget in self._cells.get(cell, ()):
+            if widget.is_clicked(pos):
+                if hit is None or self.widgets.index(widget) > self.widgets.index(hit):
+                    hit = widget
+        return hit
+
+    def _index(self, widget):
+        rect = widget.rect
+        indexed = self._indexed.get(widget)
+        if indexed is not None and indexed[0] == rect:
+            return
+        if indexed is not None:
+            for cell in indexed[1]:
+                self._cells[cell].remove(widget)
+
+        size = self.cell_size
+        cells = [
+            (cx, cy)
+            for cx in range(rect.left // size, (rect.right - 1) // size + 1)
+            for cy in range(rect.top // size, (rect.bottom - 1) // size + 1)
+        ]
+        for cell in cells:
+            self._cells.setdefault(cell, []).append(widget)
+        self._indexed[widget] = (rect.copy(), cells)
+
+
 def draw_speech_bubble(screen, text, x, y, font, width=350, type = "boss"):
     lines = wrap_text(text, font, width - 40)
     line_height = font.get_linesize()
@@ -130,5 +301,5 @@ def draw_speech_bubble(screen, text, x, y, font, width=350, type = "boss"):
     pygame.draw.rect(screen, BLACK, bubble_rect, 3, border_radius=15)
     
     for i, line in enumerate(lines):
-        txt_img = font.render(line, True, BLACK)
+        txt_img = render_text(font, line, BLACK)
         screen.blit(txt_img, (bubble_rect.x + 20, bubble_rect.y + 20 + (i * line_height)))
\ No newline at end of file
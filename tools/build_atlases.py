@@ -0,0 +1,137 @@
+"""Packs each character's sprite frames into one sheet plus a JSON manifest.
+
+    python tools/build_atlases.py          # frames the game loads (see data_setup.sprite_clips)
+    python tools/build_atlases.py --all    # every frame under assets/characters
+
+Writes assets/atlases/<character>.png and <character>.json, which ClipCache
+slices at runtime through src/atlas.AtlasSet. Rerun after editing sprites;
+clips missing from a manifest fall back to the per-frame PNGs.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from src.atlas import ATLAS_PADDING, ATLAS_VERSION
+from src.data_setup import sprite_clips
+
+SPRITE_DIR = os.path.join(ROOT, "assets", "characters")
+ATLAS_DIR = os.path.join(ROOT, "assets", "atlases")
+
+
+def referenced_folders(sprite_dir):
+    """character -> {clip folder: (frame files, complete)} for the frames the game loads."""
+    wanted = {}
+    for character, folder, _scale, frame_count in sprite_clips(sprite_dir):
+        if not os.path.isdir(folder):
+            continue
+        rel = os.path.relpath(folder, os.path.join(sprite_dir, character)).replace(os.sep, "/")
+        if frame_count is None:
+            files = sorted(f for f in os.listdir(folder) if f.endswith(".png"))
+        else:
+            files = [f"{i}.png" for i in range(1, frame_count + 1)]
+        wanted.setdefault(character, {})[rel] = (files, frame_count is None)
+    return wanted
+
+
+def all_folders(sprite_dir):
+    wanted = {}
+    for character in sorted(os.listdir(sprite_dir)):
+        char_dir = os.path.join(sprite_dir, character)
+        for dirpath, _dirs, filenames in os.walk(char_dir):
+            files = sorted(f for f in filenames if f.endswith(".png"))
+            if files:
+                rel = os.path.relpath(dirpath, char_dir).replace(os.sep, "/")
+                wanted.setdefault(character, {})[rel] = (files, True)
+    return wanted
+
+
+def shelf_pack(sizes, order, width, padding):
+    positions = [None] * len(sizes)
+    x = y = shelf_h = 0
+    for i in order:
+        w, h = sizes[i]
+        if x and x + w + padding > width:
+            x, y = 0, y + shelf_h
+            shelf_h = 0
+        positions[i] = (x, y)
+        x += w + padding
+        shelf_h = max(shelf_h, h + padding)
+    used_w = max(px + sizes[i][0] + padding for i, (px, _) in enumerate(positions))
+    return (used_w, y + shelf_h), positions
+
+
+def pack(sizes, padding):
+    """Shelf-packs (w, h) boxes, tallest first, trying each row width; returns (sheet size, positions)."""
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    best = None
+    row_w = 0
+    for i in order:
+        row_w += sizes[i][0] + padding
+        (w, h), positions = shelf_pack(sizes, order, row_w, padding)
+        # Smallest sheet wins; keep it roughly square so no side gets huge once scaled
+        if max(w, h) <= 4 * min(w, h) and (best is None or w * h < best[0][0] * best[0][1]):
+            best = ((w, h), positions)
+    return best or shelf_pack(sizes, order, row_w, padding)
+
+
+def build_character(sprite_dir, character, folders, out_dir):
+    char_dir = os.path.join(sprite_dir, character)
+    images = []
+    by_hash = {}  # identical frames share one rect
+    refs = {}
+    for rel, (files, _complete) in folders.items():
+        for f in files:
+            img = pygame.image.load(os.path.join(char_dir, rel, f))
+            digest = hashlib.sha1(pygame.image.tobytes(img, "RGBA") + repr(img.get_size()).encode()).digest()
+            if digest not in by_hash:
+                by_hash[digest] = len(images)
+                images.append(img)
+            refs[(rel, f)] = by_hash[digest]
+
+    (width, height), positions = pack([img.get_size() for img in images], ATLAS_PADDING)
+    sheet = pygame.Surface((width, height), pygame.SRCALPHA)
+    sheet.fill((0, 0, 0, 0))
+    for img, pos in zip(images, positions):
+        sheet.blit(img, pos)
+
+    manifest = {"version": ATLAS_VERSION, "size": [width, height], "folders": {}}
+    for rel, (files, complete) in folders.items():
+        frames = {}
+        for f in files:
+            i = refs[(rel, f)]
+            frames[f] = [*positions[i], *images[i].get_size()]
+        manifest["folders"][rel] = {"complete": complete, "frames": frames}
+
+    pygame.image.save(sheet, os.path.join(out_dir, f"{character}.png"))
+    with open(os.path.join(out_dir, f"{character}.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    return len(refs), len(images), (width, height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pack character sprite frames into atlases")
+    parser.add_argument("--all", action="store_true", help="pack every frame, not just the ones the game loads")
+    parser.add_argument("--sprites", default=SPRITE_DIR)
+    parser.add_argument("--out", default=ATLAS_DIR)
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    os.makedirs(args.out, exist_ok=True)
+    wanted = all_folders(args.sprites) if args.all else referenced_folders(args.sprites)
+    for character, folders in sorted(wanted.items()):
+        frames, unique, (w, h) = build_character(args.sprites, character, folders, args.out)
+        print(f"{character}: {frames} frames ({unique} unique) in {len(folders)} clips -> {w}x{h}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
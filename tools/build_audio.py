@@ -0,0 +1,164 @@
+"""Transcodes the sounds the game plays into one compact format, plus a manifest.
+
+    python tools/build_audio.py               # OGG Vorbis through ffmpeg
+    python tools/build_audio.py --format wav  # 16-bit WAV, no ffmpeg needed
+    python tools/build_audio.py --report      # list duplicates and unused files only
+
+Takes exactly the files in soundGen.audio_sources, content-hashes them so
+byte-identical copies (the " 2"/" 3" voicelines) are transcoded and loaded
+once, and resamples everything to the mixer's rate and channel count so
+nothing is converted at load time. Writes assets/audio/build/<hash>.<ext>
+and manifest.json, which SoundManager reads to play sounds by logical name.
+Without ffmpeg on PATH the WAV format is used. Rerun after changing audio.
+"""
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import wave
+
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from src.soundGen import AUDIO_MANIFEST_VERSION, audio_sources
+
+AUDIO_DIR = os.path.join(ROOT, "assets", "audio")
+BUILD_DIR = os.path.join(AUDIO_DIR, "build")
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".flac")
+
+
+def file_hash(path):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def transcode_ogg(src, dst, rate, channels, quality):
+    subprocess.run(
+        ["ffmpeg", "-v", "error", "-y", "-i", src, "-ar", str(rate), "-ac", str(channels),
+         "-c:a", "libvorbis", "-q:a", str(quality), "-f", "ogg", dst],
+        check=True,
+    )
+
+
+def transcode_wav(src, dst, rate, sample_bits, channels):
+    # The mixer decodes and resamples on load; its raw buffer is the converted audio
+    raw = pygame.mixer.Sound(src).get_raw()
+    with wave.open(dst, "wb") as out:
+        out.setnchannels(channels)
+        out.setsampwidth(abs(sample_bits) // 8)
+        out.setframerate(rate)
+        out.writeframes(raw)
+
+
+def unused_files(audio_dir, used):
+    found = []
+    for dirpath, dirs, files in os.walk(audio_dir):
+        dirs[:] = [d for d in dirs if os.path.join(dirpath, d) != BUILD_DIR]
+        for f in files:
+            path = os.path.join(dirpath, f)
+            if f.lower().endswith(AUDIO_EXTENSIONS) and path not in used:
+                found.append(os.path.relpath(path, audio_dir))
+    return sorted(found)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the game's transcoded audio and manifest")
+    parser.add_argument("--format", choices=("ogg", "wav"), default=None,
+                        help="default: ogg when ffmpeg is on PATH, wav otherwise")
+    parser.add_argument("--quality", type=int, default=4, help="Vorbis quality, 0-10")
+    parser.add_argument("--report", action="store_true", help="only report, write nothing")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("ogg" if shutil.which("ffmpeg") else "wav")
+    if fmt == "ogg" and not shutil.which("ffmpeg"):
+        parser.error("--format ogg needs ffmpeg on PATH")
+    if fmt == "wav" and not args.format:
+        print("ffmpeg not found; writing WAV (pass --format wav to silence this)", file=sys.stderr)
+
+    # Same defaults as the game, so the build matches the rate it plays at
+    pygame.mixer.init()
+    rate, sample_bits, channels = pygame.mixer.get_init()
+    if fmt == "wav" and abs(sample_bits) != 16:
+        parser.error(f"mixer runs {sample_bits}-bit samples; WAV output supports 16-bit only")
+
+    sources, voicelines = audio_sources(AUDIO_DIR)
+    by_hash, sounds, missing = {}, {}, []
+    for name, path in sorted(sources.items()):
+        if not os.path.exists(path):
+            missing.append(name)
+            continue
+        digest = file_hash(path)
+        by_hash.setdefault(digest, []).append(path)
+        sounds[name] = f"{digest[:16]}.{fmt}"
+
+    source_bytes = sum(os.path.getsize(paths[0]) for paths in by_hash.values())
+    report = {
+        "format": fmt,
+        "rate": rate,
+        "channels": channels,
+        "sounds": len(sounds),
+        "unique": len(by_hash),
+        "missing": missing,
+        "duplicates": [sorted(os.path.relpath(p, AUDIO_DIR) for p in paths)
+                       for paths in by_hash.values() if len(paths) > 1],
+        "unused": unused_files(AUDIO_DIR, set(sources.values())),
+        "source_bytes": source_bytes,
+    }
+
+    if not args.report:
+        os.makedirs(BUILD_DIR, exist_ok=True)
+        outputs = set()
+        for digest, paths in by_hash.items():
+            out = os.path.join(BUILD_DIR, f"{digest[:16]}.{fmt}")
+            outputs.add(os.path.basename(out))
+            if os.path.exists(out):
+                continue  # content-addressed, so an existing file is up to date
+            tmp = out + ".tmp"
+            if fmt == "ogg":
+                transcode_ogg(paths[0], tmp, rate, channels, args.quality)
+            else:
+                transcode_wav(paths[0], tmp, rate, sample_bits, channels)
+            os.replace(tmp, out)
+
+        for f in os.listdir(BUILD_DIR):
+            if f != "manifest.json" and f not in outputs:
+                os.remove(os.path.join(BUILD_DIR, f))
+
+        # Copies of a voiceline would only skew the random pick towards it;
+        # keep one name per file, the original over its " 2"/" 3" copies
+        unique_lines = {}
+        for boss_id, names in voicelines.items():
+            keep = {}
+            for name in sorted((n for n in names if n in sounds), key=lambda n: (len(n), n)):
+                keep.setdefault(sounds[name], name)
+            unique_lines[str(boss_id)] = sorted(keep.values())
+
+        manifest = {
+            "version": AUDIO_MANIFEST_VERSION,
+            "rate": rate,
+            "channels": channels,
+            "format": fmt,
+            "sounds": sounds,
+            "voicelines": unique_lines,
+        }
+        with open(os.path.join(BUILD_DIR, "manifest.json"), "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+        report["build_bytes"] = sum(os.path.getsize(os.path.join(BUILD_DIR, f)) for f in outputs)
+
+    print(json.dumps(report, indent=2))
+    pygame.mixer.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
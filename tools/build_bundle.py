@@ -0,0 +1,202 @@
+"""Builds a trimmed copy of the game in dist/ with images sized and encoded for the screen.
+
+    python tools/build_bundle.py                       # for displays up to 3840x2160
+    python tools/build_bundle.py --max-size 1920x1080  # smaller bundle, 1080p at most
+    python tools/build_bundle.py --report              # list unused and duplicate files only
+
+Ships only the assets the code reads: the images in asset_loader.IMAGES,
+the sprite frames in data_setup.sprite_clips plus the roster's hover
+frames, the sounds in soundGen.audio_sources (the built ones when
+tools/build_audio.py has run) and any packed atlases. Each image is
+downscaled to the largest size it is drawn at on a --max-size screen.
+Opaque images are re-encoded as JPEG, which is a fraction of a PNG's size
+and quicker to decode; images with alpha stay PNG. Byte-identical sources
+are stored once. AssetLoader finds the new files through assets/images.json.
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import pygame
+
+from src.asset_loader import IMAGE_MANIFEST_VERSION, IMAGES
+from src.data_setup import sprite_clips
+from src.rules import STUDENTS
+from src.soundGen import audio_sources
+
+ASSET_DIR = os.path.join(ROOT, "assets")
+SPRITE_DIR = os.path.join(ASSET_DIR, "characters")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+CODE = ["main.py", "README.md", "src", os.path.join("data", "questions.qbank")]
+
+
+def file_hash(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def sprite_files():
+    """Every sprite frame the entities load, relative to assets/."""
+    files = set()
+    for _character, folder, _scale, frame_count in sprite_clips(SPRITE_DIR):
+        if not os.path.isdir(folder):
+            continue
+        if frame_count is None:
+            names = [f for f in os.listdir(folder) if f.endswith(".png")]
+        else:
+            names = [f"{i}.png" for i in range(1, frame_count + 1)]
+        files.update(os.path.join(folder, f) for f in names)
+    for stats in STUDENTS:
+        files.add(os.path.join(SPRITE_DIR, stats["sprite"], "standard", "thrust", "left", "3.png"))
+    return sorted(os.path.relpath(f, ASSET_DIR) for f in files if os.path.exists(f))
+
+
+def target_size(size, largest):
+    """Source size scaled down, keeping its aspect, until a side reaches its largest drawn size."""
+    scales = [want / have for want, have in zip(largest, size) if want is not None]
+    scale = max(scales) if scales else 1.0
+    if scale >= 1:
+        return size
+    return tuple(max(1, math.ceil(side * scale)) for side in size)
+
+
+def encode_image(src, dst_dir, rel, largest, alpha):
+    """Writes the downscaled, re-encoded image; returns its path relative to assets/."""
+    img = pygame.image.load(src)
+    size = target_size(img.get_size(), largest)
+    img = img.convert_alpha() if alpha else img.convert()
+    if size != img.get_size():
+        img = pygame.transform.smoothscale(img, size)
+    stem = os.path.splitext(rel)[0]
+    out = f"{stem}.png" if alpha or not pygame.image.get_extended() else f"{stem}.jpg"
+    os.makedirs(os.path.dirname(os.path.join(dst_dir, out)), exist_ok=True)
+    pygame.image.save(img, os.path.join(dst_dir, out))
+    return out
+
+
+def decode_ms(paths):
+    start = time.perf_counter()
+    for path in paths:
+        pygame.image.load(path)
+    return (time.perf_counter() - start) * 1000
+
+
+def unused_images(used):
+    found = []
+    for dirpath, dirs, files in os.walk(ASSET_DIR):
+        dirs[:] = [d for d in dirs if d not in ("audio", "atlases")]
+        for f in files:
+            rel = os.path.relpath(os.path.join(dirpath, f), ASSET_DIR).replace(os.sep, "/")
+            if f.lower().endswith(IMAGE_EXTENSIONS) and rel not in used:
+                found.append(rel)
+    return sorted(found)
+
+
+def copy(src, dst):
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    shutil.copy2(src, dst)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a trimmed, optimized Ctrl-Alt-Defeat bundle")
+    parser.add_argument("--out", default=os.path.join(ROOT, "dist"))
+    parser.add_argument("--max-size", default="3840x2160", help="largest display it should look right on")
+    parser.add_argument("--report", action="store_true", help="only report, write nothing")
+    args = parser.parse_args(argv)
+    try:
+        max_w, max_h = (int(v) for v in args.max_size.lower().split("x"))
+    except ValueError:
+        parser.error(f"--max-size expects WxH, got {args.max_size!r}")
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # convert() needs a display
+
+    images = {rel: spec for rel, spec in IMAGES.items() if os.path.exists(os.path.join(ASSET_DIR, rel))}
+    by_hash = {}
+    for rel in images:
+        by_hash.setdefault(file_hash(os.path.join(ASSET_DIR, rel)), []).append(rel)
+    sprites = sprite_files()
+    used = set(images) | {rel.replace(os.sep, "/") for rel in sprites}
+
+    unused = unused_images(used)
+    sources = [os.path.join(ASSET_DIR, rel) for rel in images]
+    report = {
+        "max_size": [max_w, max_h],
+        "images": len(images),
+        "missing": sorted(set(IMAGES) - set(images)),
+        "sprites": len(sprites),
+        "duplicates": [rels for rels in by_hash.values() if len(rels) > 1],
+        "unused": [rel for rel in unused if not rel.startswith("characters/")],
+        "unused_sprite_frames": sum(rel.startswith("characters/") for rel in unused),
+        "image_bytes": sum(os.path.getsize(p) for p in sources),
+        "image_decode_ms": round(decode_ms(sources), 1),
+    }
+
+    if not args.report:
+        if os.path.exists(args.out):
+            shutil.rmtree(args.out)
+        out_assets = os.path.join(args.out, "assets")
+
+        manifest = {}
+        for rels in by_hash.values():
+            rel = rels[0]
+            largest_at, alpha = images[rel]
+            largest = largest_at(max_w, max_h)
+            # Copies share a file; it has to suit the largest and most demanding use
+            for other in rels[1:]:
+                other_largest, other_alpha = images[other]
+                largest = tuple(None if a is None or b is None else max(a, b)
+                                for a, b in zip(largest, other_largest(max_w, max_h)))
+                alpha = alpha or other_alpha
+            out = encode_image(os.path.join(ASSET_DIR, rel), out_assets, rel, largest, alpha)
+            manifest.update({r: out for r in rels})
+        with open(os.path.join(out_assets, "images.json"), "w") as f:
+            json.dump({"version": IMAGE_MANIFEST_VERSION, "max_size": [max_w, max_h], "images": manifest},
+                      f, indent=1, sort_keys=True)
+
+        for rel in sprites:
+            copy(os.path.join(ASSET_DIR, rel), os.path.join(out_assets, rel))
+        atlas_dir = os.path.join(ASSET_DIR, "atlases")
+        if os.path.isdir(atlas_dir):
+            shutil.copytree(atlas_dir, os.path.join(out_assets, "atlases"))
+
+        audio_dir = os.path.join(ASSET_DIR, "audio")
+        if os.path.exists(os.path.join(audio_dir, "build", "manifest.json")):
+            shutil.copytree(os.path.join(audio_dir, "build"), os.path.join(out_assets, "audio", "build"))
+        else:
+            sounds, _voicelines = audio_sources(audio_dir)
+            for path in sounds.values():
+                if os.path.exists(path):
+                    copy(path, os.path.join(out_assets, os.path.relpath(path, ASSET_DIR)))
+
+        for rel in CODE:
+            src = os.path.join(ROOT, rel)
+            if os.path.isdir(src):
+                shutil.copytree(src, os.path.join(args.out, rel), ignore=shutil.ignore_patterns("__pycache__"))
+            else:
+                copy(src, os.path.join(args.out, rel))
+
+        bundled = [os.path.join(out_assets, rel) for rel in sorted(set(manifest.values()))]
+        report["bundle_image_bytes"] = sum(os.path.getsize(p) for p in bundled)
+        report["bundle_image_decode_ms"] = round(decode_ms(bundled), 1)
+        report["bundle_bytes"] = sum(os.path.getsize(os.path.join(d, f))
+                                     for d, _dirs, files in os.walk(args.out) for f in files)
+
+    print(json.dumps(report, indent=2))
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
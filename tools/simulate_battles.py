@@ -0,0 +1,98 @@
+"""Plays every (student, professor) battle headless and reports win rates and turn counts.
+
+    python tools/simulate_battles.py --battles 1000000 --accuracy 0.6 --heal lethal
+    python tools/simulate_battles.py --accuracy 0.4 0.6 0.8 --heal never always --out balance.json
+    python tools/simulate_battles.py --engine numpy --battles 5000000 --set "Prof Maiti.hp=240"
+
+Uses the stats and rules in src/rules.py, so balance changes there show up
+here without clicking through the game; --set tries out an hp or attack
+value without editing the table. The default engine plays battles one by
+one across a process pool (--workers, default one per core); --engine numpy
+plays them in batched array steps instead and needs numpy installed. Prints
+JSON: one entry per accuracy, heal policy and pairing, each with win and
+loss rates and turn-count distributions.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from src import battle_mc, battle_sim, rules
+
+
+def apply_overrides(overrides):
+    """Copies of the student and professor tables with NAME.FIELD=VALUE overrides applied."""
+    students = [dict(stats) for stats in rules.STUDENTS]
+    profs = [dict(stats) for stats in rules.PROFESSORS]
+    for override in overrides:
+        target, _, value = override.partition("=")
+        name, _, field = target.rpartition(".")
+        matches = [stats for stats in students + profs if stats["name"] == name]
+        if not matches or field not in ("hp", "attack"):
+            raise ValueError(f"Bad override {override!r}; expected e.g. \"Prof Maiti.hp=240\"")
+        matches[0][field] = int(value)
+    return students, profs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Ctrl-Alt-Defeat battle simulator")
+    parser.add_argument("--battles", type=int, default=100_000, help="battles per pairing")
+    parser.add_argument("--accuracy", type=float, nargs="+", default=[0.5],
+                        help="chance of answering each question correctly")
+    parser.add_argument("--heal", nargs="+", default=["lethal"],
+                        help="heal policies: never, always, lethal, below:<fraction>")
+    parser.add_argument("--engine", choices=("pool", "numpy"), default="pool")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME.FIELD=VALUE",
+                        help="override a character's hp or attack, e.g. \"TA God.attack=20\"")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="pool engine only")
+    parser.add_argument("--out", help="also write the JSON report here")
+    args = parser.parse_args(argv)
+
+    try:
+        for heal in args.heal:
+            battle_sim.heal_policy(heal)
+        students, profs = apply_overrides(args.set)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.engine == "numpy" and battle_mc.np is None:
+        parser.error("--engine numpy needs numpy (pip install numpy)")
+
+    start = time.perf_counter()
+    runs = []
+    for accuracy in args.accuracy:
+        for heal in args.heal:
+            if args.engine == "numpy":
+                pairings = battle_mc.run(args.battles, accuracy, heal, args.seed, students, profs)
+            else:
+                pairings = battle_sim.run(args.battles, accuracy, heal, args.seed, args.workers, students, profs)
+            runs.append({"accuracy": accuracy, "heal": heal, "pairings": pairings})
+    elapsed = time.perf_counter() - start
+
+    total = args.battles * sum(len(run["pairings"]) for run in runs)
+    report = {
+        "config": {
+            "engine": args.engine,
+            "battles": args.battles,
+            "seed": args.seed,
+            "workers": args.workers or os.cpu_count(),
+            "overrides": args.set,
+        },
+        "elapsed_s": elapsed,
+        "battles_per_minute": total / elapsed * 60 if elapsed else None,
+        "runs": runs,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())